@@ -0,0 +1,225 @@
+# benchmark.py
+"""
+Ingestion + preview benchmark.
+
+Generates synthetic cohort files and times each step of an upload:
+read_dataset as the app calls it (reader defaults from config) with a
+cold and then a warm dataset cache, the dtype conversion inside the cold
+read, observable matrix, column statistics, table population and first
+paint (offscreen Qt). The dataset cache lives in the run's temporary
+directory, so the user's cached datasets are never touched. Writes a JSON report; with
+--baseline it also fails when a step got slower than the tolerance.
+
+    python benchmark.py --quick
+    python benchmark.py --out bench.json --baseline bench_main.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+import pandas as pd
+
+import data_io
+from data_io import read_dataset
+from dataset_cache import drop_cached
+from observables import ObservableMatrix
+from column_stats import ColumnStats
+
+DEFAULT_ROWS = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_COLS = [10, 100, 1_000, 5_000]
+DEFAULT_FORMATS = ["csv", "tsv", "xlsx"]
+QUICK = dict(rows=[1_000, 10_000], cols=[10, 100], formats=["csv", "tsv", "xlsx"])
+
+STEPS = ("read_cold_s", "dtype_conversion_s", "read_warm_s", "observables_s", "column_stats_s",
+         "table_population_s", "first_paint_s")
+
+
+# -------------------- Synthetic data --------------------
+def make_cohort(n_rows, n_obs, seed=0):
+    """ID column + Likert items, a few continuous scores with gaps and a sex flag."""
+    rng = np.random.default_rng(seed)
+    data = {"id": np.char.add("P", np.arange(n_rows).astype(str))}
+    n_cont = max(1, n_obs // 10)
+    n_likert = max(0, n_obs - n_cont - 1)
+    likert = rng.integers(1, 6, size=(n_rows, n_likert), dtype=np.int8)
+    for j in range(n_likert):
+        data[f"ques_item_{j:04d}"] = likert[:, j]
+    for j in range(n_cont):
+        col = rng.normal(size=n_rows)
+        col[rng.random(n_rows) < 0.05] = np.nan
+        data[f"score_{j:03d}"] = col
+    data["sex"] = rng.choice(np.array(["F", "M"]), size=n_rows)
+    return pd.DataFrame(data)
+
+
+def write_cohort(df, directory, fmt):
+    path = os.path.join(directory, f"cohort_{len(df)}x{df.shape[1]}.{fmt}")
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "tsv":
+        df.to_csv(path, sep="\t", index=False)
+    else:
+        df.to_excel(path, index=False)
+    return path
+
+
+# -------------------- Timed run --------------------
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+@contextlib.contextmanager
+def _time_calls(module, name, totals):
+    """Add the time spent in module.name() to totals[name] while active."""
+    original = getattr(module, name)
+
+    def timed(*args, **kwargs):
+        out, seconds = _timed(lambda: original(*args, **kwargs))
+        totals[name] = totals.get(name, 0.0) + seconds
+        return out
+    setattr(module, name, timed)
+    try:
+        yield totals
+    finally:
+        setattr(module, name, original)
+
+
+def bench_file(path, app, data_table, cache_dir):
+    result = {"file_mb": round(os.path.getsize(path) / 2 ** 20, 3)}
+
+    # a file's cache key covers its path and mtime, so a new file starts cold;
+    # the lean reader downcasts each chunk as it is parsed (CSV/TSV only)
+    with _time_calls(data_io, "downcast_frame", {}) as spent:
+        df, result["read_cold_s"] = _timed(lambda: read_dataset(path, cache_dir=cache_dir))
+    result["dtype_conversion_s"] = spent.get("downcast_frame", 0.0)
+    key = df.attrs.get("dataset_key")
+    _, result["read_warm_s"] = _timed(lambda: read_dataset(path, cache_dir=cache_dir))
+    if key is not None:
+        drop_cached(key, cache_dir)     # the next repeat starts cold too
+    result["memory_mb"] = round(df.memory_usage(deep=True).sum() / 2 ** 20, 3)
+
+    obs, result["observables_s"] = _timed(lambda: ObservableMatrix.from_dataframe(df))
+    _, result["column_stats_s"] = _timed(lambda: ColumnStats.from_observables(obs))
+
+    def populate():
+        data_table.display_dataframe(df, obs)
+        app.processEvents()
+    _, result["table_population_s"] = _timed(populate)
+    _, result["first_paint_s"] = _timed(lambda: data_table.table.grab())
+    return result
+
+
+def run(rows, cols, formats, repeat, max_cells, xlsx_max_cells, log=print):
+    from PyQt5.QtWidgets import QApplication
+    from tabs import DataTable
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    data_table = DataTable()
+    data_table.resize(1200, 800)
+    data_table.show()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bp_bench_") as tmp:
+        cache_dir = os.path.join(tmp, "cache")
+        for n_rows in rows:
+            for n_obs in cols:
+                cells = n_rows * n_obs
+                if cells > max_cells:
+                    continue
+                df = make_cohort(n_rows, n_obs)
+                for fmt in formats:
+                    if fmt == "xlsx" and cells > xlsx_max_cells:
+                        continue
+                    path = write_cohort(df, tmp, fmt)
+                    runs = [bench_file(path, app, data_table, cache_dir) for _ in range(repeat)]
+                    best = {k: min(r[k] for r in runs) for k in runs[0]}
+                    best.update(format=fmt, rows=n_rows, observables=n_obs)
+                    results.append(best)
+                    log(f"{fmt:4s} {n_rows:>9,} x {n_obs:>5,}  "
+                        + "  ".join(f"{k[:-2]}={best[k]:.3f}" for k in STEPS))
+                    os.remove(path)
+    data_table.close()
+    return results
+
+
+# -------------------- Report / regression check --------------------
+def make_report(results):
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "steps": list(STEPS),
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance, min_seconds=0.01):
+    """Return human-readable lines for every step slower than tolerance x baseline."""
+    def key(r):
+        return (r["format"], r["rows"], r["observables"])
+    base = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for r in report["results"]:
+        b = base.get(key(r))
+        if b is None:
+            continue
+        for step in STEPS:
+            if step in b and r[step] > max(b[step] * tolerance, min_seconds):
+                regressions.append(
+                    f"{r['format']} {r['rows']}x{r['observables']} {step}: "
+                    f"{b[step]:.3f}s -> {r[step]:.3f}s"
+                )
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    ap.add_argument("--cols", type=int, nargs="+", default=DEFAULT_COLS)
+    ap.add_argument("--formats", nargs="+", default=DEFAULT_FORMATS, choices=DEFAULT_FORMATS)
+    ap.add_argument("--repeat", type=int, default=1, help="runs per file; best time is kept")
+    ap.add_argument("--max-cells", type=int, default=500_000_000)
+    ap.add_argument("--xlsx-max-cells", type=int, default=5_000_000,
+                    help="skip workbooks larger than this (writing them takes ages)")
+    ap.add_argument("--quick", action="store_true", help="small smoke grid")
+    ap.add_argument("--out", default="benchmark_report.json")
+    ap.add_argument("--baseline", help="previous report to compare against")
+    ap.add_argument("--tolerance", type=float, default=1.25)
+    args = ap.parse_args(argv)
+
+    if args.quick:
+        args.rows, args.cols, args.formats = QUICK["rows"], QUICK["cols"], QUICK["formats"]
+
+    results = run(args.rows, args.cols, args.formats, args.repeat,
+                  args.max_cells, args.xlsx_max_cells)
+    report = make_report(results)
+    with open(args.out, "w") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Report written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(report, json.load(fh), args.tolerance)
+        for line in regressions:
+            print(f"[REGRESSION] {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
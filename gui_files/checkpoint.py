@@ -0,0 +1,151 @@
+# checkpoint.py
+"""
+Checkpoints of running trait fits, so hours of training survive Cancel,
+a crash or closing the app.
+
+Every fit (one restart seed of one parameter set) has its own .ckpt.npz
+under CHECKPOINT_DIR, named after the fit's stage-cache key. The trainer
+hands over a snapshot after each epoch; it is written at most every
+CHECKPOINT_INTERVAL_S, on a background thread while the next epoch runs,
+through a temporary file and os.replace, so a reader never sees a torn
+file. When training stops with an exception (Cancel), the latest
+snapshot is written before the exception propagates.
+
+last_run.json records the last run started from the GUI; "Resume"
+restarts it from its checkpoints.
+"""
+
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from config import CHECKPOINT_ENABLED, CHECKPOINT_DIR, CHECKPOINT_INTERVAL_S, CHECKPOINT_MAX_BYTES
+from dataset_cache import evict, _remove
+
+_SUFFIX = ".ckpt.npz"
+_LAST_RUN = "last_run.json"
+
+
+class Checkpoint:
+    """
+    Checkpoint file of one fit. `tag` identifies the computation (data,
+    selection, parameters, seed); a file with another tag is ignored.
+    With resume=False, load() finds nothing and training starts over.
+    Picklable, so it can travel to a pool worker with its job.
+    """
+    def __init__(self, path, tag, resume=False, interval_s=CHECKPOINT_INTERVAL_S):
+        self.path = path
+        self.tag = tag
+        self.resume = resume
+        self.interval_s = interval_s
+        self._pending = None
+        self._last_write = time.monotonic()
+        self._thread = None
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.update(_pending=None, _thread=None)
+        return state
+
+    def load(self):
+        """The saved state ({name: array or JSON value}), or None."""
+        self._last_write = time.monotonic()     # the first interval starts with training
+        if not self.resume:
+            return None
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                state = {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[WARN] Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+        meta = json.loads(str(state.pop("_meta")))
+        if meta.pop("_tag", None) != self.tag:
+            print(f"[WARN] Ignoring checkpoint {self.path}: it belongs to another run")
+            return None
+        state.update(meta)
+        return state
+
+    def save(self, state):
+        """Hand over a snapshot (not modified afterwards); it is written once the interval has passed."""
+        self._pending = state
+        now = time.monotonic()
+        if now - self._last_write >= self.interval_s:
+            self._last_write = now
+            self._start_write()
+
+    def flush(self):
+        """Write the latest snapshot now and wait for it."""
+        self._start_write()
+        self._join()
+
+    def discard(self):
+        """Training finished: drop the checkpoint."""
+        self._pending = None
+        self._join()
+        _remove(self.path)
+
+    def _start_write(self):
+        self._join()      # one write at a time; a slow disk delays the next snapshot, not training
+        state, self._pending = self._pending, None
+        if state is not None:
+            self._thread = threading.Thread(target=self._write, args=(state,), name="checkpoint")
+            self._thread.start()
+
+    def _join(self):
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _write(self, state):
+        arrays = {name: v for name, v in state.items() if isinstance(v, np.ndarray)}
+        meta = {name: v for name, v in state.items() if not isinstance(v, np.ndarray)}
+        meta["_tag"] = self.tag
+        tmp = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp, "wb") as fh:
+                np.savez(fh, _meta=np.array(json.dumps(meta)), **arrays)
+            os.replace(tmp, self.path)
+            evict(CHECKPOINT_MAX_BYTES, keep=self.path, directory=os.path.dirname(self.path),
+                  suffixes=(_SUFFIX,))
+        except OSError as e:
+            print(f"[WARN] Could not write checkpoint {self.path}: {e}")
+
+
+def fit_checkpoint(key, seed, resume=False):
+    """Checkpoint of the fit with stage-cache key `key` and `seed`; None when it cannot be checkpointed."""
+    if key is None or not CHECKPOINT_ENABLED:
+        return None
+    return Checkpoint(os.path.join(CHECKPOINT_DIR, f"{key}-{seed}{_SUFFIX}"), f"{key}:{seed}", resume)
+
+
+# -------------------- Last run (for "Resume") --------------------
+def record_last_run(run, source=None):
+    """Remember a run's inputs; only cache-backed datasets can be resumed."""
+    if run.observables.key is None or not CHECKPOINT_ENABLED:
+        return
+    entry = {"dataset": run.observables.key, "source": source, **run.inputs()}
+    entry.pop("output_dir", None)
+    entry.pop("resume", None)
+    path = os.path.join(CHECKPOINT_DIR, _LAST_RUN)
+    try:
+        os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as fh:
+            json.dump(entry, fh)
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        print(f"[WARN] Could not record the run for Resume: {e}")
+
+
+def last_run():
+    """record_last_run()'s entry: dataset, source, columns, individuals, params, reports; or None."""
+    try:
+        with open(os.path.join(CHECKPOINT_DIR, _LAST_RUN), encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
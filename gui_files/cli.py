@@ -0,0 +1,205 @@
+# cli.py
+"""
+Headless batch runs: the analysis behind the "Go" and "Sweep" buttons,
+without Qt (nothing here imports PyQt5).
+
+    python cli.py cohort.csv --out run1
+    python cli.py cohort.xlsx --sheet Baseline --select "ques_item_* & missing < 5%" \
+        --individuals P001 P042 --cutoff-traits 12 --no-prune --reports clinician
+    python cli.py cohort.csv --sweep --optimizer-lr 0.01,0.05 --noise-ratio 0:0.4:0.2 --out sweep1
+    python cli.py cohort.csv --cutoff-traits 12 --resume     # after Ctrl-C / a crash
+
+Outputs land in --out (default: a new folder under OUTPUT_DIR, as for the
+GUI) laid out as the GUI writes them: results/ (figures), output_data.zip
+and report.pdf, or sweep_results.csv for a sweep.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from config import PIPELINE_DEFAULTS, PIPELINE_MAX_PROFILES, DATA_CACHE_ENABLED, CHECKPOINT_ENABLED
+
+_REPORTS = ("clinician", "researcher", "developer")
+
+
+# -------------------- Arguments --------------------
+def _option(name):
+    return "--" + name.replace("_", "-")
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    ap.add_argument("data", help="CSV / TSV / XLSX file; first column is the individual ID")
+    ap.add_argument("--sheet", help="workbook sheet (default: the first one)")
+    ap.add_argument("--out", help="output directory (default: a new folder under OUTPUT_DIR in config.py)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="do not read or write the dataset, preprocessing and stage caches")
+    ap.add_argument("--resume", action="store_true",
+                    help="continue an interrupted run with the same inputs from its checkpoints "
+                         "(needs the dataset cache)")
+    ap.add_argument("-q", "--quiet", action="store_true", help="no progress lines")
+
+    sel = ap.add_argument_group("selection (default: every numeric observable)")
+    sel.add_argument("--observables", nargs="+", default=[], metavar="NAME",
+                     help="observables to analyse, by column name")
+    sel.add_argument("--select", metavar="EXPR",
+                     help='bulk selection as in the Data tab, e.g. "ques_item_* & missing < 5%%"')
+    sel.add_argument("--individuals", nargs="+", default=[], metavar="ID",
+                     help=f"individuals to profile (default: the first {PIPELINE_MAX_PROFILES})")
+    sel.add_argument("--individuals-file", metavar="PATH", help="one individual ID per line")
+
+    params = ap.add_argument_group("parameters (defaults as on the Parameters tab)")
+    for name, default in PIPELINE_DEFAULTS.items():
+        if isinstance(default, bool):
+            params.add_argument(_option(name), dest=name, action=argparse.BooleanOptionalAction,
+                                default=None, help=f"default: {'yes' if default else 'no'}")
+        else:
+            params.add_argument(_option(name), dest=name, metavar="VALUE",
+                                help=f"default: {default}")
+    params.add_argument("--reports", nargs="+", choices=_REPORTS, default=[],
+                        help="report sections (default: all)")
+
+    sweep = ap.add_argument_group("sweep")
+    sweep.add_argument("--sweep", action="store_true",
+                       help="parameters may hold lists (0.01,0.05) or ranges (0.01:0.1:0.03); "
+                            "run every combination")
+    sweep.add_argument("--sweep-samples", type=int, default=0, metavar="N",
+                       help="run N random combinations instead of all of them")
+    return ap
+
+
+def parameter_values(args):
+    """{name: [values]} from the parameter options; raises ValueError (user-facing message)."""
+    from sweep import parse_values
+
+    values = {}
+    for name, default in PIPELINE_DEFAULTS.items():
+        given = getattr(args, name)
+        if given is None:
+            values[name] = [default]
+        elif isinstance(default, bool):
+            values[name] = [given]
+        elif args.sweep:
+            try:
+                values[name] = parse_values(given, type(default))
+            except ValueError as e:
+                raise ValueError(f"{_option(name)}: {e}.") from None
+        else:
+            try:
+                values[name] = [type(default)(given)]
+            except ValueError:
+                kind = "a whole number" if isinstance(default, int) else "a number"
+                raise ValueError(f"{_option(name)} must be {kind} (lists and ranges need --sweep).") from None
+    return values
+
+
+# -------------------- Selection --------------------
+def select_columns(obs, names, expression):
+    """Requested observables: explicit names plus the bulk-selection matches, in file order."""
+    unknown = [n for n in names if n not in obs.column_index]
+    if unknown:
+        raise ValueError("Unknown or non-numeric observable(s): " + ", ".join(unknown[:10]))
+    if not expression:
+        return list(names)
+
+    from column_select import column_mask
+    from column_stats import ColumnStats
+
+    mask = column_mask(expression, obs.columns, ColumnStats.from_observables(obs))
+    wanted = set(names) | {c for c, hit in zip(obs.columns, mask) if hit}
+    if not wanted:
+        raise ValueError(f"No observable matches {expression!r}.")
+    return [c for c in obs.columns if c in wanted]
+
+
+def select_individuals(obs, ids, path):
+    if path:
+        with open(path, encoding="utf-8") as fh:
+            ids = [*ids, *(line.strip() for line in fh if line.strip())]
+    unknown = [i for i in ids if i not in obs.id_index]
+    if unknown:
+        print(f"[WARN] {len(unknown)} unknown individual(s) ignored: " + ", ".join(unknown[:10]))
+    return [i for i in ids if i in obs.id_index]
+
+
+# -------------------- Run --------------------
+def _progress_printer(quiet):
+    """progress(fraction, label) printing one line per stage and every 10%."""
+    last = {"label": None, "step": -1, "t0": time.perf_counter()}
+
+    def progress(fraction, label):
+        step = int(fraction * 10)
+        if quiet or (label == last["label"] and step == last["step"]):
+            return
+        last.update(label=label, step=step)
+        print(f"[{fraction:4.0%}] {time.perf_counter() - last['t0']:7.1f}s  {label}", flush=True)
+    return progress
+
+
+def main(argv=None):
+    ap = build_parser()
+    args = ap.parse_args(argv)
+
+    from pipeline import check_parameters
+    from sweep import configurations
+
+    try:
+        values = parameter_values(args)
+        for name, options in values.items():
+            for value in options:
+                check_parameters({**PIPELINE_DEFAULTS, name: value})
+        configs = configurations(values, args.sweep_samples) if args.sweep else None
+    except ValueError as e:
+        ap.error(str(e))
+    if not os.path.isfile(args.data):
+        ap.error(f"no such file: {args.data}")
+    # checkpoints are keyed by the cached dataset; without it nothing would be saved or found
+    if args.resume and args.no_cache:
+        ap.error("--resume needs the dataset cache; drop --no-cache")
+    if args.resume and not (DATA_CACHE_ENABLED and CHECKPOINT_ENABLED):
+        ap.error("--resume needs DATA_CACHE_ENABLED and CHECKPOINT_ENABLED in config.py")
+    if args.resume and args.sweep:
+        ap.error("--resume continues a single run, not a --sweep")
+
+    from data_io import read_dataset
+    from observables import ObservableMatrix
+    from pipeline import AnalysisRun, run_pipeline
+    from sweep import SweepRun, run_sweep
+
+    progress = _progress_printer(args.quiet)
+    try:
+        progress(0.0, f"Loading {os.path.basename(args.data)}")
+        df = read_dataset(args.data, sheet=args.sheet, use_cache=DATA_CACHE_ENABLED and not args.no_cache)
+        obs = ObservableMatrix.from_dataframe(df, key=df.attrs.get("dataset_key"))
+        del df
+        columns = select_columns(obs, args.observables, args.select)
+        individuals = select_individuals(obs, args.individuals, args.individuals_file)
+
+        if args.out:
+            os.makedirs(args.out, exist_ok=True)
+        if configs is not None:
+            run = SweepRun(obs, columns, individuals, configs, args.reports, args.out)
+            run_sweep(run, progress)
+            print(run.table.to_string(index=False))
+        else:
+            params = {name: options[0] for name, options in values.items()}
+            run = AnalysisRun(obs, columns, individuals, params, args.reports, args.out, args.resume)
+            run_pipeline(run, progress)
+    except KeyboardInterrupt:
+        print("[ERROR] Interrupted.")
+        return 130
+    except Exception as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    for note in run.notes:
+        print(note)
+    for kind, path in run.outputs.items():
+        print(f"{kind}: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+# column_select.py
+
+import fnmatch
+import re
+import numpy as np
+
+from row_filter import _OPS
+
+_PREDICATE = re.compile(r"^\s*([a-z_]+)\s*(==|!=|>=|<=|>|<)\s*(.+?)\s*$", re.IGNORECASE)
+
+# stat fields usable in predicates -> ColumnStats array (or derived)
+_FIELDS = {
+    "missing": lambda s: s.missing_frac,
+    "n": lambda s: s.count,
+    "count": lambda s: s.count,
+    "mean": lambda s: s.mean,
+    "std": lambda s: s.std,
+    "sd": lambda s: s.std,
+    "var": lambda s: s.std ** 2,
+    "min": lambda s: s.min,
+    "max": lambda s: s.max,
+    "range": lambda s: s.max - s.min,
+    "median": lambda s: s.quantiles[:, list(s.quantile_levels).index(0.5)],
+}
+_CLASSES = ("binary", "integer", "continuous", "empty")
+
+
+def column_mask(expression, names, stats=None):
+    """
+    Boolean mask over `names` for a bulk-selection expression.
+
+        ques_item_* & numeric & missing < 5% & var > 0.5
+        re:^bp_(sys|dia) | cortisol*
+
+    Clauses, combined with `&` (binds tighter) and `|`, prefix `!` negates:
+      glob        -> contains * ? or [ ; case-insensitive, whole name
+      re:<regex>  -> case-insensitive regex search
+      numeric / text / binary / integer / continuous / empty -> column type
+      <field> <op> <number> with fields missing (fraction, or "5%"), n,
+                  mean, std/sd, var, min, max, range, median
+      anything else -> case-insensitive substring of the name
+    `&` / `|` inside brackets belong to the clause (regex groups).
+    Type and stat clauses read `stats` (ColumnStats); columns without
+    stats are non-numeric, and while `stats` is None (still being
+    computed) such clauses raise. Raises ValueError with a user-facing message.
+    """
+    expression = expression.strip()
+    if not expression:
+        return np.zeros(len(names), dtype=bool)
+    names = np.array([str(n) for n in names], dtype=str)
+    pos = _stats_positions(names, stats)
+    result = np.zeros(len(names), dtype=bool)
+    for alternative in _split(expression, "|"):
+        part = np.ones(len(names), dtype=bool)
+        for clause in _split(alternative, "&"):
+            part &= _clause_mask(clause.strip(), names, stats, pos)
+        result |= part
+    return result
+
+
+def _split(text, sep):
+    """Split on `sep` outside (), [] and {} so regex groups keep their |."""
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(text):
+        if ch in "([{":
+            depth += 1
+        elif ch in ")]}":
+            depth = max(0, depth - 1)
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _stats_positions(names, stats):
+    """Row of each name in `stats` (-1 when it has none)."""
+    if stats is None:
+        return np.full(len(names), -1, dtype=np.int64)
+    index = stats.column_index
+    return np.fromiter((index.get(n, -1) for n in names), dtype=np.int64, count=len(names))
+
+
+def _clause_mask(clause, names, stats, pos):
+    if not clause:
+        raise ValueError("Empty clause in selection")
+    if clause.startswith("!"):
+        return ~_clause_mask(clause[1:].strip(), names, stats, pos)
+    low = clause.lower()
+
+    if low.startswith("re:"):
+        try:
+            rx = re.compile(clause[3:].strip(), re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Bad regex '{clause[3:].strip()}': {e}") from None
+        return _matches(rx.search, names)
+    if any(ch in clause for ch in "*?["):
+        return _matches(re.compile(fnmatch.translate(clause), re.IGNORECASE).match, names)
+
+    has_stats = pos >= 0
+    if low in ("numeric", "text", *_CLASSES):
+        _require(stats)
+        if low == "numeric":
+            return has_stats
+        if low == "text":
+            return ~has_stats
+        return _gather(np.asarray(stats.dtype_class) == low, pos)
+
+    m = _PREDICATE.match(clause)
+    if m is not None:
+        field, op, value = m.groups()
+        if field.lower() not in _FIELDS:
+            raise ValueError(f"Unknown statistic '{field}' (use {', '.join(_FIELDS)})")
+        target = _number(value, field)
+        _require(stats)
+        values = _gather(np.asarray(_FIELDS[field.lower()](stats), dtype=float), pos, fill=np.nan)
+        with np.errstate(invalid="ignore"):
+            return _OPS[op](values, target)
+
+    return np.char.find(np.char.lower(names), low) >= 0
+
+
+def _require(stats):
+    if stats is None:
+        raise ValueError("column statistics are still being computed")
+
+
+def _matches(fn, names):
+    return np.fromiter((fn(n) is not None for n in names), dtype=bool, count=len(names))
+
+
+def _gather(values, pos, fill=False):
+    """Stats-aligned array re-indexed onto the names (fill where no stats)."""
+    out = np.full(len(pos), fill, dtype=values.dtype)
+    ok = pos >= 0
+    out[ok] = values[pos[ok]]
+    return out
+
+
+def _number(value, field):
+    value = value.strip()
+    try:
+        if value.endswith("%"):
+            return float(value[:-1]) / 100.0
+        return float(value)
+    except ValueError:
+        raise ValueError(f"'{value}' is not a number (in '{field}' clause)") from None
+
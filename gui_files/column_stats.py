@@ -0,0 +1,169 @@
+# column_stats.py
+
+import numpy as np
+
+from config import COLUMN_STATS_BINS, COLUMN_STATS_QUANTILES, COLUMN_STATS_BLOCK_CELLS
+
+
+class ColumnStats:
+    """
+    Per-observable summary of an ObservableMatrix, computed once after load.
+    Every field is an array aligned with `columns`, so lookups are O(1):
+
+    count, missing_frac, min, max, mean, std (population, like np.std)
+    quantiles   -> (n_cols, len(COLUMN_STATS_QUANTILES)), from the histogram
+    hist_counts -> (n_cols, COLUMN_STATS_BINS) histogram sketch over [min, max]
+    dtype_class -> "binary" | "integer" | "continuous" | "empty"
+    """
+    def __init__(self, columns, n_rows, **fields):
+        self.columns = list(columns)
+        self.column_index = {c: j for j, c in enumerate(self.columns)}
+        self.n_rows = n_rows
+        self.quantile_levels = tuple(COLUMN_STATS_QUANTILES)
+        for name, arr in fields.items():
+            setattr(self, name, arr)
+
+    def __contains__(self, name):
+        return name in self.column_index
+
+    def hist_edges(self, j):
+        return np.linspace(self.min[j], self.max[j], self.hist_counts.shape[1] + 1)
+
+    def summary(self, name):
+        """Plain dict for one observable, or None if it is not numeric."""
+        j = self.column_index.get(name)
+        if j is None:
+            return None
+        return {
+            "count": int(self.count[j]),
+            "missing_frac": float(self.missing_frac[j]),
+            "min": float(self.min[j]),
+            "max": float(self.max[j]),
+            "mean": float(self.mean[j]),
+            "std": float(self.std[j]),
+            "quantiles": dict(zip(self.quantile_levels, self.quantiles[j].tolist())),
+            "hist_counts": self.hist_counts[j],
+            "hist_edges": self.hist_edges(j),
+            "dtype_class": str(self.dtype_class[j]),
+        }
+
+    def tooltip(self, name):
+        j = self.column_index.get(name)
+        if j is None:
+            return f"{name}\nnon-numeric"
+        lines = [
+            name,
+            f"{self.dtype_class[j]} · n = {int(self.count[j]):,} · "
+            f"missing {self.missing_frac[j]:.1%}",
+        ]
+        if self.count[j]:
+            q = dict(zip(self.quantile_levels, self.quantiles[j]))
+            median = q.get(0.5, np.nan)
+            lines.append(f"mean {self.mean[j]:.3g} · sd {self.std[j]:.3g}")
+            lines.append(f"min {self.min[j]:.3g} · median {median:.3g} · max {self.max[j]:.3g}")
+        return "\n".join(lines)
+
+    # -------------------- building --------------------
+    @classmethod
+    def from_observables(cls, observables, is_cancelled=None):
+        """
+        Two streaming passes over row blocks (bounded memory on memmaps):
+        1) counts, min/max and mean/M2 merged per block (Chan et al.)
+        2) histogram sketch + integer/binary checks against the final range
+        Returns None when cancelled.
+        """
+        X = observables.values
+        n, p = X.shape
+        bins = COLUMN_STATS_BINS
+        step = max(1, COLUMN_STATS_BLOCK_CELLS // max(1, p))
+        cancelled = is_cancelled or (lambda: False)
+
+        count = np.zeros(p, dtype=np.int64)
+        mean = np.zeros(p, dtype=np.float64)
+        m2 = np.zeros(p, dtype=np.float64)
+        lo = np.full(p, np.inf)
+        hi = np.full(p, -np.inf)
+
+        for start in range(0, n, step):
+            if cancelled():
+                return None
+            B = np.asarray(X[start:start + step], dtype=np.float64)
+            valid = ~np.isnan(B)
+            nb = valid.sum(axis=0)
+            Bz = np.where(valid, B, 0.0)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mb = np.where(nb > 0, Bz.sum(axis=0) / nb, 0.0)
+            m2b = (np.where(valid, B - mb, 0.0) ** 2).sum(axis=0)
+            tot = count + nb
+            delta = mb - mean
+            with np.errstate(invalid="ignore", divide="ignore"):
+                frac = np.where(tot > 0, nb / tot, 0.0)
+            mean += delta * frac
+            m2 += m2b + delta ** 2 * count * frac
+            count = tot
+            lo = np.minimum(lo, np.where(valid, B, np.inf).min(axis=0))
+            hi = np.maximum(hi, np.where(valid, B, -np.inf).max(axis=0))
+
+        empty = count == 0
+        lo[empty] = np.nan
+        hi[empty] = np.nan
+        mean[empty] = np.nan
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(m2 / count)
+
+        width = np.where(hi > lo, (hi - lo) / bins, 1.0)
+        width[empty] = 1.0
+        base = np.where(empty, 0.0, lo)
+        offsets = np.arange(p) * bins
+        hist = np.zeros(p * bins, dtype=np.int64)
+        integral = np.ones(p, dtype=bool)
+        n_extreme = np.zeros(p, dtype=np.int64)
+
+        for start in range(0, n, step):
+            if cancelled():
+                return None
+            B = np.asarray(X[start:start + step], dtype=np.float64)
+            valid = ~np.isnan(B)
+            idx = np.clip(((np.where(valid, B, base) - base) / width).astype(np.int64), 0, bins - 1)
+            hist += np.bincount((idx + offsets)[valid], minlength=p * bins)
+            integral &= np.all(~valid | (B == np.round(B)), axis=0)
+            n_extreme += (valid & ((B == lo) | (B == hi))).sum(axis=0)
+
+        hist = hist.reshape(p, bins)
+        quantiles = _hist_quantiles(hist, base, width, COLUMN_STATS_QUANTILES)
+        quantiles[integral] = np.round(quantiles[integral])
+        quantiles = np.clip(quantiles, lo[:, None], hi[:, None])
+        quantiles[empty] = np.nan
+
+        dtype_class = np.where(
+            empty, "empty",
+            np.where(integral & (n_extreme == count) & (hi - lo == 1), "binary",
+                     np.where(integral, "integer", "continuous")),
+        )
+        return cls(
+            observables.columns, n,
+            count=count,
+            missing_frac=1.0 - count / max(1, n),
+            min=lo, max=hi, mean=mean, std=std,
+            quantiles=quantiles,
+            hist_counts=hist,
+            dtype_class=dtype_class,
+        )
+
+
+def _hist_quantiles(hist, base, width, levels):
+    """Linear interpolation of each quantile inside the histogram bin that crosses it."""
+    p, bins = hist.shape
+    total = hist.sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cdf = np.cumsum(hist, axis=1) / np.where(total > 0, total, 1)
+    out = np.empty((p, len(levels)))
+    rows = np.arange(p)
+    for i, q in enumerate(levels):
+        k = np.argmax(cdf >= q, axis=1)
+        prev = np.where(k > 0, cdf[rows, np.maximum(k - 1, 0)], 0.0)
+        cur = cdf[rows, k]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frac = np.where(cur > prev, (q - prev) / (cur - prev), 0.0)
+        out[:, i] = base + (k + frac) * width
+    return out
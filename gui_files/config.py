@@ -1,5 +1,7 @@
 # config.py
 
+import os
+
 # =========================== FONT CONFIG (GLOBAL) ===========================
 APP_FONT_FAMILY      = "Calibri"  # "Segoe UI Variable"
 APP_FONT_SIZE_PT     = 15
@@ -64,12 +66,19 @@ INFO_BG      = "#F2F2F2"
 RESULTS_BG   = "#F2F2F2"
 
 # Data table sizing (fractions of page)
-DATA_TABLE_MAX_ROWS        = 5000
 DATA_TABLE_MIN_HEIGHT_FRAC = 0.85
 DATA_TABLE_MAX_HEIGHT_FRAC = 0.85
 DATA_TABLE_MIN_WIDTH_FRAC  = 0.00
 DATA_TABLE_MAX_WIDTH_FRAC  = 0.55
 
+# Data table cell formatting (rendered per column block, cached)
+DATA_TABLE_FLOAT_DECIMALS       = 4
+DATA_TABLE_FORMAT_BLOCK_ROWS    = 256
+DATA_TABLE_FORMAT_CACHE_BLOCKS  = 4096
+FILTER_DEBOUNCE_MS              = 250    # idle time before a typed filter is applied
+SELECTOR_SEARCH_DEBOUNCE_MS     = 150    # idle time before selector search runs
+SEARCH_FUZZY_MIN_SHARED         = 0.5    # share of a typo'd term's trigrams a fuzzy match must hold
+
 # Page paddings/spacings
 DATA_TITLE_STRETCH         = 0
 DATA_TABLE_STRETCH         = 1
@@ -85,7 +94,6 @@ BUTTONS_GROUP_VOFFSET_PX   = +100
 # --------- GIF LOADER --------------
 GIF_PATH        = "lotus_running.gif"
 GIF_WIDTH_PX    = 96
-GIF_DURATION_MS = 12000 #time to show the gif
 # -----------------------------------
 
 # ---- Status caption styles ----
@@ -120,4 +128,76 @@ RESULT_BOX_BORDER       = "1px solid #E6EBF2"
 RESULT_BOX_MIN_WIDTH    = 900
 RESULT_BOX_HEIGHTS      = [220, 260, 260]
 TEAL = "#3E9A92"
-# ---------------------------------
\ No newline at end of file
+# ---------------------------------
+
+# --------- DATA LOADING --------------
+CSV_CHUNK_ROWS  = 50000   # rows parsed per chunk by the background loader
+EXCEL_FIRST_BATCH_ROWS = 200     # small first batch -> rows on screen quickly
+EXCEL_BATCH_ROWS       = 20000   # later streamed workbook batches
+LEAN_READER     = True    # downcast numerics / categorize repetitive strings on load
+LEAN_SAMPLE_ROWS = 10000  # rows sampled to infer column dtypes
+LEAN_CATEGORY_MAX_UNIQUE_FRAC = 0.5  # text columns below this unique ratio -> category
+
+# Parsed datasets are cached here (Feather if pyarrow is installed, pickle otherwise)
+DATA_CACHE_ENABLED   = True
+DATA_CACHE_DIR       = os.path.join(os.path.expanduser("~"), ".cache", "biopsych_profiles", "datasets")
+DATA_CACHE_MAX_BYTES = 2 * 1024 ** 3   # LRU-evicted beyond this size
+
+# Pipeline stage outputs, keyed by a hash of their inputs (see stage_cache.py)
+STAGE_CACHE_ENABLED      = True
+STAGE_CACHE_DIR          = os.path.join(os.path.expanduser("~"), ".cache", "biopsych_profiles", "stages")
+STAGE_CACHE_MAX_BYTES    = 1024 ** 3          # on disk, LRU-evicted beyond this size
+
+# Trait-fit checkpoints (model + optimizer state), for "Resume" after a crash or Cancel
+CHECKPOINT_ENABLED       = True
+CHECKPOINT_DIR           = os.path.join(os.path.expanduser("~"), ".cache", "biopsych_profiles", "checkpoints")
+CHECKPOINT_INTERVAL_S    = 60.0               # at most one write per this many seconds (between epochs)
+CHECKPOINT_MAX_BYTES     = 2 * 1024 ** 3      # stale checkpoints are LRU-evicted beyond this size
+
+# Column statistics index (built on a worker after each load)
+COLUMN_STATS_BINS        = 32
+COLUMN_STATS_QUANTILES   = (0.05, 0.25, 0.5, 0.75, 0.95)
+COLUMN_STATS_BLOCK_CELLS = 4_000_000   # matrix cells processed per block
+# -----------------------------------
+
+# --------- ANALYSIS PIPELINE --------------
+# Defaults used when a Parameters field is left empty / a toggle unset
+PIPELINE_DEFAULTS = {
+    "cutoff_traits": 1000,
+    "traits_activation": 1.0,
+    "prune": True,
+    "traits_assignment_weights": True,
+    "zscore_standardization": True,
+    "regularization": True,
+    "optimizer_lr": 0.05,
+    "noise_ratio": 0.4,
+    "restarts": 1,                 # seeded fits run in parallel; the lowest loss wins
+}
+PIPELINE_MAX_PROFILES = 3          # individuals rendered on the B-P profiles page
+# Each run writes its files to a new folder here (figures in RESULTS_DIR below it);
+# gui_files/results only holds the sample figures shown before the first run
+OUTPUT_DIR          = os.path.join(os.path.expanduser("~"), "biopsych_profiles", "runs")
+RESULTS_DIR         = "results"    # figures read by the Results pages
+OUTPUT_ZIP_PATH     = "output_data.zip"
+REPORT_PDF_PATH     = "report.pdf"
+FIGURE_DPI          = 110
+FIGURE_MAX_TRAITS   = 20           # traits shown per figure
+FIGURE_MAX_OBSERVABLES = 40        # rows of the traits-vs-observables heatmap
+TRAIT_EPOCHS        = 20           # passes over the records when fitting the trait model
+TRAIT_BATCH_SIZE    = 512          # records per optimizer step
+TRAIT_L2            = 1e-4         # weight decay when "Regularization" is on
+TRAIT_SEED          = 0
+# With "Prune" on: start from up to this many candidate traits per observable
+# (never above the cutoff) and drop dead / negligible / duplicate ones each epoch
+TRAIT_CANDIDATES_PER_OBSERVABLE = 4
+TRAIT_PRUNE_WARMUP  = 2            # epochs before the first pruning pass
+TRAIT_PRUNE_MIN_ACTIVITY = 0.005   # share of records a trait must be active for
+TRAIT_PRUNE_MIN_ENERGY = 0.005     # share of the reconstructed variance it must carry
+TRAIT_PRUNE_MAX_SIMILARITY = 0.95  # decoder cosine above which the weaker trait goes
+TRAIT_PATIENCE      = 2            # stop after this many epochs without pruning or
+TRAIT_TOLERANCE     = 1e-3         # relative loss improvement above this
+SWEEP_MAX_CONFIGS   = 200          # full grids above this need "Sweep samples"
+SWEEP_RESULTS_PATH  = "sweep_results.csv"
+ENGINE_POLL_S       = 0.1          # how often the GUI-side bridge checks the worker process
+ENGINE_CANCEL_GRACE_S = 3.0        # then Cancel terminates the worker process
+# -----------------------------------
@@ -0,0 +1,290 @@
+# data_io.py
+
+import csv
+import os
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from config import (
+    CSV_CHUNK_ROWS, EXCEL_FIRST_BATCH_ROWS, EXCEL_BATCH_ROWS, LEAN_READER, LEAN_SAMPLE_ROWS,
+    LEAN_CATEGORY_MAX_UNIQUE_FRAC, DATA_CACHE_ENABLED, DATA_CACHE_DIR,
+)
+from dataset_cache import file_fingerprint, load_cached, store_cached
+
+try:
+    import openpyxl
+except ImportError:       # streaming Excel falls back to pandas
+    openpyxl = None
+
+
+class LoadCancelled(Exception):
+    """Raised inside a reader when the user cancels the load."""
+
+
+def _mb(n_bytes):
+    return n_bytes / (1024 * 1024)
+
+
+def read_dataset(file_path, progress=None, is_cancelled=None, lean=LEAN_READER,
+                 use_cache=DATA_CACHE_ENABLED, sheet=None, on_batch=None, cache_dir=DATA_CACHE_DIR):
+    """
+    Read a CSV/TSV/XLSX file into a DataFrame.
+
+    progress(text)  -> called with a short human-readable status line
+    is_cancelled()  -> polled between chunks; raises LoadCancelled when True
+    lean            -> CSV/TSV only: sampled dtype inference + downcasting;
+                       the memory report lands in df.attrs["load_report"]
+    use_cache       -> reuse/store the parsed frame in the on-disk cache
+    cache_dir       -> that cache's directory
+    sheet           -> workbook sheet name (None = first sheet)
+    on_batch(df)    -> called with each parsed batch as it arrives
+    The file's content key is stored in df.attrs["dataset_key"]. Column
+    names are unique strings (a repeated "a" becomes a.1, a.2 …, as
+    pandas does); renaming is noted in df.attrs["load_report"].
+    """
+    progress = progress or (lambda _text: None)
+    is_cancelled = is_cancelled or (lambda: False)
+    on_batch = on_batch or (lambda _df: None)
+
+    key = None
+    if use_cache:
+        progress("Checking cache…")
+        key = file_fingerprint(file_path, salt=f"lean={lean}|sheet={sheet}",
+                               is_cancelled=is_cancelled)
+        if key is None:
+            raise LoadCancelled()
+        df = load_cached(key, cache_dir)
+        if df is not None:
+            df.attrs["load_report"] = "from cache"
+            df.attrs["dataset_key"] = key
+            return df
+
+    df = _parse(file_path, progress, is_cancelled, lean, sheet, on_batch)
+    repeated = _make_headers_unique(df)
+    if repeated:
+        note = f"{repeated} repeated column name(s) renamed (name.1, name.2 …)"
+        report = df.attrs.get("load_report")
+        df.attrs["load_report"] = f"{report}\n{note}" if report else note
+
+    if key is not None:
+        progress("Caching parsed data…")
+        try:
+            store_cached(key, df, cache_dir)
+        except Exception as e:
+            print(f"[WARN] Could not cache {file_path}: {e}")
+        df.attrs["dataset_key"] = key
+    return df
+
+
+def _parse(file_path, progress, is_cancelled, lean, sheet, on_batch):
+    if file_path.endswith(".csv") or file_path.endswith(".tsv"):
+        sep = "," if file_path.endswith(".csv") else "\t"
+        return _read_delimited(file_path, sep, progress, is_cancelled, lean, on_batch)
+
+    if openpyxl is not None:
+        return _read_excel_streaming(file_path, sheet, progress, is_cancelled, on_batch)
+
+    progress("Reading workbook…")
+    df = pd.read_excel(file_path, sheet_name=sheet if sheet is not None else 0)
+    if is_cancelled():
+        raise LoadCancelled()
+    return df
+
+
+# -------------------- Column names --------------------
+def unique_names(names):
+    """Names as strings, later repeats renamed a.1, a.2 … (skipping names already in use), like pandas."""
+    names = [str(n) for n in names]
+    taken, seen, counts, out = set(names), set(), {}, []
+    for name in names:
+        if name in seen:
+            k = counts.get(name, 0)
+            while f"{name}.{k + 1}" in taken:
+                k += 1
+            counts[name] = k + 1
+            name = f"{name}.{k + 1}"
+            taken.add(name)
+        seen.add(name)
+        out.append(name)
+    return out
+
+
+def _repeats(names):
+    """How many non-empty names repeat an earlier one."""
+    names = [n for n in names if n]
+    return len(names) - len(set(names))
+
+
+def _make_headers_unique(df):
+    """Rename repeated columns in place; returns how many names the file repeated."""
+    repeated = df.attrs.pop("repeated_headers", 0)
+    names = unique_names(df.columns)
+    renamed = sum(str(old) != new for old, new in zip(df.columns, names))
+    if renamed or any(not isinstance(c, str) for c in df.columns):
+        df.columns = names
+    return repeated + renamed
+
+
+def _delimited_header(file_path, sep):
+    with open(file_path, newline="", encoding="utf-8-sig", errors="replace") as fh:
+        return next(csv.reader(fh, delimiter=sep), [])
+
+
+# -------------------- Excel (streaming) --------------------
+def list_excel_sheets(file_path):
+    """Sheet names of a workbook, without parsing any cell data."""
+    if openpyxl is None:
+        return pd.ExcelFile(file_path).sheet_names
+    wb = openpyxl.load_workbook(file_path, read_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def _excel_header(row):
+    return unique_names(f"Unnamed: {j}" if val is None else val for j, val in enumerate(row))
+
+
+def _read_excel_streaming(file_path, sheet, progress, is_cancelled, on_batch):
+    """Row-stream one sheet in read-only mode, handing over batches as they fill."""
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet is not None else wb.worksheets[0]
+        rows_iter = ws.iter_rows(values_only=True)
+        header = next(rows_iter, None)
+        if header is None:
+            return pd.DataFrame()
+        columns = _excel_header(header)
+        repeated = _repeats([str(v) for v in header if v is not None])
+        width = len(columns)
+
+        batches = []
+        n_rows = 0
+
+        def flush(buf):
+            # empty rows are dropped per batch, so the preview matches the final frame
+            nonlocal n_rows
+            batch = pd.DataFrame.from_records(buf, columns=columns).infer_objects().dropna(how="all")
+            batches.append(batch)
+            n_rows += len(batch)
+            on_batch(batch)
+            progress(f"Loading sheet…\n{n_rows:,} rows")
+
+        buf = []
+        limit = EXCEL_FIRST_BATCH_ROWS
+        for row in rows_iter:
+            buf.append(row[:width])
+            if len(buf) >= limit:
+                if is_cancelled():
+                    raise LoadCancelled()
+                flush(buf)
+                buf = []
+                limit = EXCEL_BATCH_ROWS
+        if buf:
+            flush(buf)
+    finally:
+        wb.close()
+
+    if not batches:
+        return pd.DataFrame(columns=columns)
+    df = pd.concat(batches, ignore_index=True) if len(batches) > 1 else batches[0]
+    df = df.reset_index(drop=True)
+    df.attrs["repeated_headers"] = repeated
+    return df
+
+
+# -------------------- Lean dtype handling --------------------
+def infer_lean_dtypes(sample):
+    """
+    Parser dtype hints from a sample: repetitive text columns are read
+    straight into categoricals. Numerics are left to downcast_frame.
+    """
+    hints = {}
+    n = max(1, len(sample))
+    for col in sample.columns:
+        s = sample[col]
+        if s.dtype.kind == "O" and s.nunique(dropna=True) / n <= LEAN_CATEGORY_MAX_UNIQUE_FRAC:
+            hints[col] = "category"
+    return hints
+
+
+def downcast_frame(df):
+    """
+    Downcast numeric columns in place: ints -> int8/16/32, floats -> float32
+    only where every value survives the round trip. The first (ID) column
+    is never touched, so float IDs with gaps cannot merge.
+    """
+    for col in df.columns[1:]:
+        kind = df[col].dtype.kind
+        if kind == "i":
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        elif kind == "f" and df[col].dtype != np.float32:
+            x = df[col].to_numpy()
+            small = x.astype(np.float32)
+            if np.array_equal(x, small.astype(x.dtype), equal_nan=True):
+                df[col] = small
+    return df
+
+
+def _concat_lean(chunks):
+    """Concatenate chunks, merging per-chunk categoricals without going through object."""
+    columns = chunks[0].columns
+    cat_cols = [c for c in columns if isinstance(chunks[0][c].dtype, pd.CategoricalDtype)]
+    cats = {}
+    for c in cat_cols:
+        parts = [ch[c] for ch in chunks]
+        if all(isinstance(p.dtype, pd.CategoricalDtype) for p in parts):
+            cats[c] = pd.Categorical(union_categoricals(parts, ignore_order=True))
+    rest = pd.concat([ch.drop(columns=list(cats)) for ch in chunks], ignore_index=True)
+    if not cats:
+        return rest
+    return pd.DataFrame({c: (cats[c] if c in cats else rest[c]) for c in columns})
+
+
+# -------------------- Delimited reader --------------------
+def _read_delimited(file_path, sep, progress, is_cancelled, lean, on_batch):
+    total = os.path.getsize(file_path)
+    hints = None
+    baseline_per_row = None
+    if lean:
+        sample = pd.read_csv(file_path, sep=sep, nrows=LEAN_SAMPLE_ROWS)
+        hints = infer_lean_dtypes(sample)
+        if len(sample):
+            baseline_per_row = sample.memory_usage(index=False, deep=True).sum() / len(sample)
+        del sample
+
+    chunks = []
+    rows = 0
+    # Open the handle ourselves so tell() reports how far the parser got.
+    with open(file_path, "rb") as fh:
+        for chunk in pd.read_csv(fh, sep=sep, chunksize=CSV_CHUNK_ROWS, dtype=hints):
+            if is_cancelled():
+                raise LoadCancelled()
+            if lean:
+                downcast_frame(chunk)
+            chunks.append(chunk)
+            on_batch(chunk)
+            rows += len(chunk)
+            progress(
+                f"Loading data…\n{_mb(fh.tell()):.1f} / {_mb(total):.1f} MB · {rows:,} rows"
+            )
+
+    if not chunks:
+        return pd.read_csv(file_path, sep=sep)
+    if len(chunks) == 1:
+        df = chunks[0]
+    elif lean:
+        df = _concat_lean(chunks)
+    else:
+        df = pd.concat(chunks, ignore_index=True)
+
+    df.attrs["repeated_headers"] = _repeats(_delimited_header(file_path, sep))     # pandas renamed them
+    if lean and baseline_per_row is not None:
+        before = baseline_per_row * len(df)
+        after = df.memory_usage(index=False, deep=True).sum()
+        df.attrs["load_report"] = (
+            f"{_mb(after):.1f} MB in memory (saved ≈{_mb(max(0, before - after)):.1f} MB)"
+        )
+    return df
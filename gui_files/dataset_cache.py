@@ -0,0 +1,117 @@
+# dataset_cache.py
+
+import hashlib
+import os
+import pandas as pd
+
+from config import DATA_CACHE_DIR, DATA_CACHE_MAX_BYTES
+
+try:
+    import pyarrow  # noqa: F401  (only needed for Feather)
+    _HAS_ARROW = True
+except ImportError:
+    _HAS_ARROW = False
+
+_CACHE_VERSION = "3"          # bump when the on-disk layout or the parsed result changes
+_HASH_BLOCK = 4 * 1024 * 1024
+_SUFFIXES = (".feather", ".pkl")
+# observable matrices and preprocessed copies share the budget
+_EVICTABLE = _SUFFIXES + (".obs.npy", ".pre.npy", ".prestats.npy")
+
+
+def file_fingerprint(file_path, salt="", is_cancelled=None):
+    """
+    Cache key for a data file: path, size, mtime and a hash of its bytes.
+    `salt` carries reader options that change the parsed result.
+    """
+    st = os.stat(file_path)
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{_CACHE_VERSION}|{os.path.abspath(file_path)}|{st.st_size}|"
+             f"{st.st_mtime_ns}|{salt}|".encode())
+    with open(file_path, "rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK), b""):
+            if is_cancelled is not None and is_cancelled():
+                return None
+            h.update(block)
+    return h.hexdigest()
+
+
+def _entry_paths(key, directory=DATA_CACHE_DIR):
+    return [os.path.join(directory, key + sfx) for sfx in _SUFFIXES]
+
+
+def load_cached(key, directory=DATA_CACHE_DIR):
+    """Return the cached DataFrame for `key`, or None on a miss."""
+    for path in _entry_paths(key, directory):
+        if not os.path.exists(path):
+            continue
+        try:
+            if path.endswith(".feather"):
+                df = pd.read_feather(path)
+            else:
+                df = pd.read_pickle(path)
+        except Exception as e:
+            print(f"[WARN] Dropping unreadable cache entry {path}: {e}")
+            _remove(path)
+            return None
+        os.utime(path)   # mtime doubles as the LRU timestamp
+        return df
+    return None
+
+
+def store_cached(key, df, directory=DATA_CACHE_DIR):
+    """Write `df` under `key` atomically, then trim the cache to its size cap."""
+    os.makedirs(directory, exist_ok=True)
+    feather, pickle = _entry_paths(key, directory)
+    written = None
+    if _HAS_ARROW:
+        try:
+            tmp = feather + ".tmp"
+            df.reset_index(drop=True).to_feather(tmp)
+            os.replace(tmp, feather)
+            written = feather
+        except Exception:
+            _remove(feather + ".tmp")   # e.g. non-string column names
+    if written is None:
+        tmp = pickle + ".tmp"
+        df.to_pickle(tmp)
+        os.replace(tmp, pickle)
+        written = pickle
+    evict(keep=written, directory=directory)
+
+
+def drop_cached(key, directory=DATA_CACHE_DIR):
+    """Remove the cached DataFrame for `key`, if there is one."""
+    for path in _entry_paths(key, directory):
+        _remove(path)
+
+
+def evict(max_bytes=DATA_CACHE_MAX_BYTES, keep=None, directory=DATA_CACHE_DIR, suffixes=_EVICTABLE):
+    """Remove least-recently-used entries until the cache fits in max_bytes."""
+    if not os.path.isdir(directory):
+        return
+    entries = []
+    for name in os.listdir(directory):
+        if not name.endswith(suffixes):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue      # removed concurrently
+        entries.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        _remove(path)
+        total -= size
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,325 @@
+# engine.py
+"""
+Execution engine: runs the analysis pipeline in a dedicated process.
+
+The observable matrix is never pickled. A cache-backed matrix is re-opened
+by path (memory-mapped, shared through the page cache); an in-memory one
+is copied once into multiprocessing.shared_memory. Progress comes back
+over a queue; cancellation is cooperative first (the process stops its
+restart pool and returns), then a hard terminate() of the process and of
+any pool workers it left once ENGINE_CANCEL_GRACE_S has passed.
+
+fit_parallel() fans trait-model fits (restarts, sweep points) out over a
+process pool the same way, from inside that process or any other caller.
+"""
+
+import contextlib
+import multiprocessing as mp
+import os
+import queue as queue_mod
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from config import ENGINE_CANCEL_GRACE_S, ENGINE_POLL_S
+
+_CTX = mp.get_context("spawn")   # never fork a process that has Qt threads
+
+
+# -------------------- Shared arrays --------------------
+class SharedArrays:
+    """
+    Named NumPy arrays exported to child processes without pickling them.
+    spec() is small and picklable; attach(spec) rebuilds zero-copy views.
+    The exporting side owns the segments and must close() them.
+    """
+    def __init__(self):
+        self._spec = {}
+        self._segments = []
+
+    def add(self, name, array, npy_path=None):
+        """npy_path: the .npy file `array` is memory-mapped from, if any."""
+        if npy_path is not None:
+            # already a file mapping: the child maps the same file
+            self._spec[name] = ("npy", npy_path, array.shape, array.dtype.str)
+            return
+        array = np.asarray(array)
+        if array.dtype.kind == "O":
+            array = array.astype(str)    # fixed width, so it fits a flat buffer
+        seg = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=seg.buf)[...] = array
+        self._segments.append(seg)
+        self._spec[name] = ("shm", seg.name, array.shape, array.dtype.str)
+
+    def spec(self):
+        return dict(self._spec)
+
+    def close(self):
+        for seg in self._segments:
+            seg.close()
+            seg.unlink()
+        self._segments = []
+
+
+def attach(spec):
+    """({name: array}, handles) for a SharedArrays spec; keep `handles` open while the arrays are used."""
+    arrays, handles = {}, []
+    for name, (kind, where, shape, dtype) in spec.items():
+        if kind == "npy":
+            arrays[name] = np.load(where, mmap_mode="r")
+        else:
+            seg = shared_memory.SharedMemory(name=where)    # the parent owns and unlinks it
+            handles.append(seg)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=seg.buf)
+    return arrays, handles
+
+
+def share_observables(obs):
+    """Export an ObservableMatrix: (SharedArrays, picklable description)."""
+    shared = SharedArrays()
+    shared.add("values", obs.values, npy_path=obs.path)
+    shared.add("ids", obs.ids)
+    shared.add("index_ids", obs.id_index.ids)
+    shared.add("index_order", obs.id_index.order)
+    shared.add("index_starts", obs.id_index.starts)
+    meta = {"columns": obs.columns, "path": obs.path, "id_name": obs.id_name}
+    return shared, meta
+
+
+def attach_observables(spec, meta):
+    """Rebuild an ObservableMatrix in the child from share_observables()."""
+    from observables import ObservableMatrix, IdIndex
+
+    arrays, handles = attach(spec)
+    id_index = IdIndex(arrays["index_ids"], arrays["index_order"], arrays["index_starts"])
+    obs = ObservableMatrix(arrays["values"], arrays["ids"], meta["columns"],
+                           meta["path"], id_index, meta["id_name"])
+    return obs, handles
+
+
+# -------------------- Child process --------------------
+_child = {}      # in a PipelineJob's process: the queue of events for the parent
+
+
+def _child_main(spec, meta, job, events, cancel_event):
+    from pipeline import AnalysisRun, run_pipeline, PipelineCancelled
+    from sweep import SweepRun, run_sweep
+
+    _child["events"] = events
+    handles = []
+    try:
+        obs, handles = attach_observables(spec, meta)
+        if "configs" in job:
+            run, target = SweepRun(obs, **job), run_sweep
+        else:
+            run, target = AnalysisRun(obs, **job), run_pipeline
+        target(
+            run,
+            progress=lambda fraction, label: events.put(("progress", fraction, label)),
+            is_cancelled=cancel_event.is_set,
+        )
+        events.put(("done", run.detach()))
+    except PipelineCancelled:
+        events.put(("cancelled",))
+    except Exception as e:
+        events.put(("failed", str(e) or type(e).__name__))
+    finally:
+        # put() pickles on a feeder thread, and results may still view the
+        # shared buffers: flush the queue before unmapping them
+        events.close()
+        events.join_thread()
+        obs = run = None
+        for seg in handles:
+            seg.close()
+
+
+# -------------------- Parent side --------------------
+class PipelineJob:
+    """
+    One pipeline run (or sweep, when the job has `configs`) in its own process.
+
+        job = PipelineJob(observables, **run.inputs())
+        job.start()
+        for event in job.events():   # ("progress", fraction, label) ..., then one terminal event
+            ...
+
+    Terminal events: ("done", AnalysisRun | SweepRun), ("failed", message), ("cancelled",).
+    The child also reports the PIDs of its restart-pool workers (kept
+    here, not yielded), so a hard cancel can end them with the child.
+    """
+    def __init__(self, observables, **job):
+        self.observables = observables
+        self.job = job
+        self._events = _CTX.Queue()
+        self._cancel = _CTX.Event()
+        self._cancel_at = None
+        self._process = None
+        self._shared = None
+        self._pool_workers = set()
+
+    def start(self):
+        self._shared, meta = share_observables(self.observables)
+        self._process = _CTX.Process(
+            target=_child_main,
+            args=(self._shared.spec(), meta, self.job, self._events, self._cancel),
+            daemon=False,     # restarts start a pool of their own; close() reaps it
+        )
+        self._process.start()
+
+    def cancel(self):
+        """Ask the child to stop; events() terminates it if it has not within the grace period."""
+        if self._cancel_at is None:
+            self._cancel_at = time.monotonic()
+            self._cancel.set()
+
+    def events(self):
+        try:
+            while True:
+                if self._cancel_at is not None and time.monotonic() - self._cancel_at > ENGINE_CANCEL_GRACE_S:
+                    self._terminate()
+                    yield ("cancelled",)
+                    return
+                try:
+                    event = self._events.get(timeout=ENGINE_POLL_S)
+                except queue_mod.Empty:
+                    if not self._process.is_alive():
+                        self._terminate()     # reap its orphaned pool workers
+                        yield ("failed", f"Analysis process exited unexpectedly (code {self._process.exitcode}).")
+                        return
+                    continue
+                if event[0] == "pool_worker":
+                    self._pool_workers.add(event[1])
+                    continue
+                if event[0] == "pool_closed":
+                    self._pool_workers.clear()
+                    continue
+                yield event
+                if event[0] != "progress":
+                    return
+        finally:
+            self.close()
+
+    def close(self):
+        if self._process is not None:
+            self._process.join(timeout=ENGINE_CANCEL_GRACE_S)
+            if self._process.is_alive():
+                self._terminate()
+            self._process = None
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def _terminate(self):
+        """Kill the child and the pool workers it reported; a killed child cannot reap them."""
+        self._process.terminate()
+        self._process.join()
+        for pid in self._pool_workers:
+            with contextlib.suppress(OSError):
+                os.kill(pid, signal.SIGTERM)
+        self._pool_workers.clear()
+
+
+# -------------------- Parallel restarts --------------------
+_worker = {}     # per pool process: X, shm handles, progress queue, cancel event
+
+
+def _init_fit_worker(spec, events, cancel_event, owner_events):
+    if owner_events is not None:
+        owner_events.put(("pool_worker", os.getpid()))
+    arrays, handles = attach(spec)
+    _worker.update(X=arrays["X"], handles=handles, events=events, cancel=cancel_event)
+
+
+def _fit_worker(job_index, params, seed, checkpoint):
+    from pipeline import PipelineCancelled
+    from trait_model import fit_model
+
+    def check():
+        if _worker["cancel"].is_set():
+            raise PipelineCancelled()
+
+    return fit_model(_worker["X"], params, seed,
+                     report=lambda fraction: _worker["events"].put((job_index, fraction)), check=check,
+                     checkpoint=checkpoint)
+
+
+@contextlib.contextmanager
+def _blas_threads(n):
+    """Children spawned inside inherit a BLAS thread cap, so parallel fits do not oversubscribe."""
+    names = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+    saved = {name: os.environ.get(name) for name in names}
+    os.environ.update({name: str(n) for name in names})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def fit_parallel(X, X_path, jobs, report, check):
+    """
+    trait_model.fit_model() for every (params, seed, checkpoint or None)
+    in `jobs`, in parallel over the CPU cores; returns the TraitFits in
+    job order. X is shared, not copied per worker: mapped from X_path
+    when given, else through shared memory.
+    report(fraction) gets the mean progress; check() raising (cancel)
+    stops every fit. When a fit fails, the others are cancelled and its
+    error (not a sibling's PipelineCancelled) is raised.
+    """
+    from pipeline import PipelineCancelled
+    from trait_model import fit_model
+
+    cores = os.cpu_count() or 1
+    workers = min(len(jobs), cores)
+    if workers <= 1:
+        fits = []
+        for i, (params, seed, checkpoint) in enumerate(jobs):
+            fits.append(fit_model(X, params, seed,
+                                  lambda fraction, i=i: report((i + fraction) / len(jobs)), check, checkpoint))
+        return fits
+
+    shared = SharedArrays()
+    shared.add("X", X, npy_path=X_path)
+    events, cancel_event = _CTX.Queue(), _CTX.Event()
+    owner_events = _child.get("events")     # inside a PipelineJob: report the workers to its parent
+    progress = [0.0] * len(jobs)
+    pool = None
+    try:
+        with _blas_threads(max(1, cores // workers)):
+            pool = ProcessPoolExecutor(workers, mp_context=_CTX, initializer=_init_fit_worker,
+                                       initargs=(shared.spec(), events, cancel_event, owner_events))
+            futures = [pool.submit(_fit_worker, i, *job) for i, job in enumerate(jobs)]
+        while True:
+            try:
+                check()
+            except BaseException:
+                cancel_event.set()
+                raise
+            done, pending = wait(futures, timeout=ENGINE_POLL_S)
+            with contextlib.suppress(queue_mod.Empty):
+                while True:
+                    i, fraction = events.get_nowait()
+                    progress[i] = fraction
+            report(sum(progress) / len(jobs))
+            if not pending:
+                break
+            if any(f.exception() is not None for f in done):
+                cancel_event.set()
+                break
+        errors = [f.exception() for f in as_completed(futures) if f.exception() is not None]
+        if errors:
+            raise next((e for e in errors if not isinstance(e, PipelineCancelled)), errors[0])
+        return [f.result() for f in futures]
+    finally:
+        if pool is not None:
+            cancel_event.set()      # fits still running (cancel, a failed sibling) stop at their next batch
+            pool.shutdown(wait=True, cancel_futures=True)
+            if owner_events is not None:
+                owner_events.put(("pool_closed",))
+        shared.close()
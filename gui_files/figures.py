@@ -0,0 +1,327 @@
+# figures.py
+"""
+Matplotlib figures for the Results pages and the PDF report.
+
+Only the object-oriented API is used (Figure + Agg/PDF canvases, never
+pyplot), so figures can be built on worker threads and in processes
+without a display.
+"""
+
+import textwrap
+
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_pdf import PdfPages
+
+from config import TEAL, FIGURE_DPI, FIGURE_MAX_TRAITS, FIGURE_MAX_OBSERVABLES
+
+_ACCENT = "#D97B29"
+
+
+def figure_jobs(run):
+    """[(file stem, callable -> Figure)] for everything the Results pages show."""
+    from pipeline import safe_name
+
+    jobs = [
+        ("traits_vs_features", lambda: traits_vs_features(run)),
+        ("traits_radar", lambda: traits_radar(run)),
+        ("traits_bars", lambda: traits_bars(run)),
+        ("trait_informativeness", lambda: trait_informativeness(run)),
+        ("traits_orthogonality", lambda: traits_orthogonality(run)),
+        ("trait_popularity", lambda: trait_popularity(run)),
+        ("profiles_distribution", lambda: profiles_distribution(run)),
+        ("profile_heterogeneity", lambda: profile_heterogeneity(run)),
+        ("trait_coactivation", lambda: trait_coactivation(run)),
+        ("trait_network", lambda: trait_network(run)),
+    ]
+    for pid in run.individuals:
+        stem = safe_name(pid)
+        jobs.append((stem, lambda pid=pid: individual_profile(run, pid)))
+        jobs.append((f"{stem}_piramide", lambda pid=pid: individual_pyramid(run, pid)))
+    return jobs
+
+
+def _figure(w, h):
+    return Figure(figsize=(w, h), dpi=FIGURE_DPI, layout="constrained")
+
+
+def _shown_traits(run):
+    return min(len(run.traits), FIGURE_MAX_TRAITS)
+
+
+# -------------------- Latent traits --------------------
+def traits_vs_features(run):
+    """Observable x trait correlations for the most strongly loading observables."""
+    t = _shown_traits(run)
+    S = run.structure[:, :t]
+    top = np.argsort(-np.abs(S).max(axis=1))[:FIGURE_MAX_OBSERVABLES]
+    fig = _figure(10, max(4, 0.28 * len(top) + 1.5))
+    ax = fig.add_subplot()
+    im = ax.imshow(S[top], cmap="RdBu_r", vmin=-1, vmax=1, aspect="auto")
+    ax.set_xticks(range(t), run.traits[:t])
+    ax.set_yticks(range(len(top)), [run.columns[j] for j in top], fontsize=8)
+    ax.set_title("Traits vs observables (correlation)")
+    fig.colorbar(im, ax=ax, shrink=0.6)
+    return fig
+
+
+def traits_radar(run):
+    """Trait profile of each rendered individual on one polar chart."""
+    t = max(3, _shown_traits(run))
+    angles = np.linspace(0, 2 * np.pi, t, endpoint=False)
+    fig = _figure(8, 8)
+    ax = fig.add_subplot(projection="polar")
+    for pid in run.individuals:
+        values = _padded(_individual_row(run.weights, run, pid), t)
+        ax.plot(np.r_[angles, angles[:1]], np.r_[values, values[:1]], label=str(pid))
+        ax.fill(np.r_[angles, angles[:1]], np.r_[values, values[:1]], alpha=0.12)
+    ax.set_xticks(angles, _padded_labels(run.traits, t))
+    ax.set_title("Trait weights of selected individuals")
+    if run.individuals:
+        ax.legend(loc="upper right", bbox_to_anchor=(1.15, 1.1))
+    return fig
+
+
+def traits_bars(run):
+    t = _shown_traits(run)
+    explained = np.asarray(run.explained[:t]) * 100
+    fig = _figure(10, 5)
+    ax = fig.add_subplot()
+    ax.bar(run.traits[:t], explained, color=TEAL)
+    ax.plot(run.traits[:t], np.cumsum(explained), color=_ACCENT, marker="o", label="cumulative")
+    ax.set_ylabel("Variance explained (%)")
+    ax.set_title("Variance explained per trait")
+    ax.legend()
+    return fig
+
+
+def trait_informativeness(run):
+    """How many observables each trait strongly accounts for (|r| >= 0.3 / 0.5)."""
+    t = _shown_traits(run)
+    S = np.abs(run.structure[:, :t])
+    fig = _figure(10, 5)
+    ax = fig.add_subplot()
+    x = np.arange(t)
+    ax.bar(x - 0.2, (S >= 0.3).sum(axis=0), width=0.4, color=TEAL, label="|r| ≥ 0.3")
+    ax.bar(x + 0.2, (S >= 0.5).sum(axis=0), width=0.4, color=_ACCENT, label="|r| ≥ 0.5")
+    ax.set_xticks(x, run.traits[:t])
+    ax.set_ylabel("Observables")
+    ax.set_title("Trait informativeness")
+    ax.legend()
+    return fig
+
+
+def traits_orthogonality(run):
+    return _matrix_figure(_corr(run.individual_scores[:, :_shown_traits(run)]),
+                          run.traits, "Trait score correlation across individuals")
+
+
+# -------------------- Group analysis --------------------
+def _dominant(run):
+    t = _shown_traits(run)
+    if not len(run.weights):
+        return np.zeros(0, dtype=int), t
+    return run.weights.argmax(axis=1), t
+
+
+def trait_popularity(run):
+    dominant, t = _dominant(run)
+    counts = np.bincount(np.minimum(dominant, t), minlength=t + 1)
+    labels = list(run.traits[:t]) + (["other"] if len(run.traits) > t else [])
+    fig = _figure(10, 5)
+    ax = fig.add_subplot()
+    ax.bar(labels, counts[:len(labels)] / max(1, len(dominant)) * 100, color=TEAL)
+    ax.set_ylabel("Individuals (%)")
+    ax.set_title("Dominant trait per individual")
+    return fig
+
+
+def profiles_distribution(run):
+    """Weight carried by each individual's dominant trait."""
+    top = run.weights.max(axis=1) if len(run.weights) else np.zeros(0)
+    fig = _figure(6, 4.8)
+    ax = fig.add_subplot()
+    ax.hist(top, bins=30, range=(0, 1), color=TEAL)
+    ax.set_xlabel("Dominant trait weight")
+    ax.set_ylabel("Individuals")
+    ax.set_title("Profile concentration")
+    return fig
+
+
+def profile_heterogeneity(run):
+    """Normalised entropy of each individual's trait weights (0 = one trait)."""
+    w = run.weights
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = -np.nansum(np.where(w > 0, w * np.log(w), 0.0), axis=1)
+    h = h / np.log(w.shape[1]) if w.shape[1] > 1 else np.zeros(len(w))
+    fig = _figure(6, 4.8)
+    ax = fig.add_subplot()
+    ax.hist(h, bins=30, range=(0, 1), color=_ACCENT)
+    ax.set_xlabel("Normalised entropy")
+    ax.set_ylabel("Individuals")
+    ax.set_title("Profile heterogeneity")
+    return fig
+
+
+def _active(run):
+    t = _shown_traits(run)
+    w = run.weights[:, :t]
+    return w >= (1.0 / max(1, len(run.traits))), t
+
+
+def trait_coactivation(run):
+    """Share of individuals in whom both traits are above an even share."""
+    active, t = _active(run)
+    a = active.astype(np.float32)
+    co = (a.T @ a) / max(1, len(a))
+    return _matrix_figure(co, run.traits, "Trait co-activation", vmin=0, vmax=1, cmap="Greens")
+
+
+def trait_network(run):
+    """Traits on a circle; edges where co-activation departs from independence."""
+    active, t = _active(run)
+    a = active.astype(np.float32)
+    n = max(1, len(a))
+    p = a.mean(axis=0) if len(a) else np.zeros(t)
+    lift = (a.T @ a) / n - np.outer(p, p)
+    np.fill_diagonal(lift, 0.0)
+    angles = np.linspace(0, 2 * np.pi, t, endpoint=False)
+    xy = np.c_[np.cos(angles), np.sin(angles)]
+    fig = _figure(7, 6)
+    ax = fig.add_subplot()
+    scale = np.abs(lift).max() or 1.0
+    for i in range(t):
+        for j in range(i + 1, t):
+            strength = lift[i, j] / scale
+            if abs(strength) >= 0.2:
+                ax.plot(*xy[[i, j]].T, color=TEAL if strength > 0 else _ACCENT,
+                        linewidth=0.5 + 3 * abs(strength), alpha=0.7, zorder=1)
+    ax.scatter(*xy.T, s=300 + 3000 * p, color="white", edgecolors=TEAL, linewidths=2, zorder=2)
+    for (x, y), name in zip(xy, run.traits[:t]):
+        ax.text(x, y, name, ha="center", va="center", fontsize=9, zorder=3)
+    ax.set_xlim(-1.35, 1.35)
+    ax.set_ylim(-1.35, 1.35)
+    ax.set_aspect("equal")
+    ax.axis("off")
+    ax.set_title("Trait network (co-activation above chance)")
+    return fig
+
+
+# -------------------- Individuals --------------------
+def _individual_row(values, run, pid):
+    c = run.observables.id_index.codes.get(pid)
+    return values[c] if c is not None else np.zeros(values.shape[1])
+
+
+def individual_profile(run, pid):
+    t = _shown_traits(run)
+    s = _individual_row(run.individual_scores, run, pid)[:t]
+    fig = _figure(7, 5.6)
+    ax = fig.add_subplot()
+    ax.bar(run.traits[:t], s, color=np.where(s >= 0, TEAL, _ACCENT))
+    ax.axhline(0, color="#444", linewidth=0.8)
+    ax.set_ylabel("Trait score")
+    ax.set_title(f"{pid}: trait profile")
+    return fig
+
+
+def individual_pyramid(run, pid):
+    """The individual's most extreme observables (standardized), as a diverging pyramid."""
+    rows = run.observables.id_index.rows(pid)
+    z = run.X[rows].mean(axis=0) if len(rows) else np.zeros(len(run.columns))
+    top = np.argsort(-np.abs(z))[:min(15, len(z))][::-1]
+    fig = _figure(7, 5.6)
+    ax = fig.add_subplot()
+    ax.barh(range(len(top)), z[top], color=np.where(z[top] >= 0, TEAL, _ACCENT))
+    ax.set_yticks(range(len(top)), [_short(run.columns[j]) for j in top], fontsize=8)
+    ax.axvline(0, color="#444", linewidth=0.8)
+    ax.set_xlabel("Standardized value" if run.params["zscore_standardization"] else "Centered value")
+    ax.set_title(f"{pid}: most distinctive observables")
+    return fig
+
+
+# -------------------- Report --------------------
+def write_report(run, path):
+    """
+    Multi-page PDF. Sections follow the report checkboxes:
+    clinician -> individual profiles, researcher -> trait and group figures,
+    developer -> run details. None checked means all of them.
+    """
+    from pipeline import summary, safe_name
+
+    audiences = set(run.reports) or {"clinician", "researcher", "developer"}
+    with PdfPages(path) as pdf:
+        pdf.savefig(_text_page("Biopsychological profiles — analysis report", _overview(run)))
+        if "researcher" in audiences:
+            for name in ("traits_bars", "traits_vs_features", "trait_informativeness",
+                         "traits_orthogonality", "trait_popularity", "profiles_distribution",
+                         "profile_heterogeneity", "trait_coactivation", "trait_network"):
+                if name in run.figures:
+                    pdf.savefig(run.figures[name])
+        if "clinician" in audiences:
+            for pid in run.individuals:
+                for stem in (safe_name(pid), f"{safe_name(pid)}_piramide"):
+                    if stem in run.figures:
+                        pdf.savefig(run.figures[stem])
+        if "developer" in audiences:
+            details = summary(run)
+            lines = [f"{k}: {v}" for k, v in run.params.items()]
+            lines += ["", "Stage timings (s):"]
+            lines += [f"  {k}: {v}" for k, v in details["timings_s"].items()]
+            lines += ["", *details["notes"]]
+            pdf.savefig(_text_page("Run details", lines))
+
+
+def _overview(run):
+    lines = [
+        f"Records: {run.X.shape[0]:,}    Individuals: {len(run.individual_ids):,}",
+        f"Observables analysed: {len(run.columns):,}",
+        f"Latent traits: {len(run.traits)}    "
+        f"variance explained: {float(np.sum(run.explained)) * 100:.1f}%",
+        f"Profiles rendered: {', '.join(map(str, run.individuals)) or '—'}",
+    ]
+    return lines + list(run.notes)
+
+
+def _text_page(title, lines):
+    fig = Figure(figsize=(8.27, 11.69), dpi=FIGURE_DPI)
+    fig.text(0.08, 0.94, title, fontsize=16, weight="bold", color=TEAL)
+    wrapped = []
+    for line in lines:
+        wrapped.extend(textwrap.wrap(str(line), 90) or [""])
+    fig.text(0.08, 0.90, "\n".join(wrapped), fontsize=10, va="top", family="monospace")
+    return fig
+
+
+# -------------------- Helpers --------------------
+def _matrix_figure(M, labels, title, vmin=-1, vmax=1, cmap="RdBu_r"):
+    t = M.shape[0]
+    fig = _figure(7, 6)
+    ax = fig.add_subplot()
+    im = ax.imshow(M, cmap=cmap, vmin=vmin, vmax=vmax)
+    ax.set_xticks(range(t), labels[:t], rotation=90)
+    ax.set_yticks(range(t), labels[:t])
+    ax.set_title(title)
+    fig.colorbar(im, ax=ax, shrink=0.7)
+    return fig
+
+
+def _corr(A):
+    if A.shape[0] < 2 or A.shape[1] == 0:
+        return np.eye(A.shape[1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.nan_to_num(np.corrcoef(A, rowvar=False).reshape(A.shape[1], A.shape[1]))
+
+
+def _padded(values, t):
+    out = np.zeros(t)
+    out[:min(t, len(values))] = values[:t]
+    return out
+
+
+def _padded_labels(labels, t):
+    return list(labels[:t]) + [""] * max(0, t - len(labels))
+
+
+def _short(name, width=28):
+    return name if len(name) <= width else name[:width - 1] + "…"
@@ -0,0 +1,42 @@
+# formatting.py
+
+import numpy as np
+import pandas as pd
+
+from config import DATA_TABLE_FLOAT_DECIMALS
+
+
+def column_format_rule(values):
+    """
+    Decide once per column how its cells are rendered:
+    "int"   -> floats that only hold whole numbers (codes, Likert items)
+    "float" -> rounded to DATA_TABLE_FLOAT_DECIMALS, shortest repr
+    "plain" -> ints, bools and everything non-numeric
+    """
+    if not isinstance(values, np.ndarray) or values.dtype.kind != "f":
+        return "plain"
+    finite = values[np.isfinite(values)]
+    if finite.size and np.all(finite == np.round(finite)):
+        return "int"
+    return "float"
+
+
+def format_block(values, rule):
+    """Vectorized display strings for a slice (or fancy-indexed gather) of one column."""
+    if rule == "int":
+        out = np.full(len(values), "", dtype=object)
+        ok = np.isfinite(values)
+        out[ok] = values[ok].astype(np.int64).astype(str)
+        return out
+    if rule == "float":
+        out = np.full(len(values), "", dtype=object)
+        ok = np.isfinite(values)
+        # round first so float noise (0.30000000000000004) never reaches repr
+        out[ok] = np.round(values[ok], DATA_TABLE_FLOAT_DECIMALS).astype(str)
+        return out
+    if isinstance(values, np.ndarray) and values.dtype.kind in "biu":
+        return values.astype(str).astype(object)
+    missing = np.asarray(pd.isna(values))
+    out = np.asarray(values, dtype=object).astype(str).astype(object)
+    out[missing] = ""
+    return out
@@ -9,7 +9,7 @@ from PyQt5.QtGui import QColor, QPalette, QPixmap, QMovie
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
     QFrame, QLabel, QSizePolicy, QSpacerItem, QPushButton,
-    QFileDialog, QTabWidget
+    QFileDialog, QTabWidget, QInputDialog, QMessageBox
 )
 
 from config import (
@@ -17,12 +17,18 @@ from config import (
     LOGO_PATH, LOGO_MAX_WIDTH_PX, HEADER_TEXT, HEADER_STYLE_CSS,
     HEADER_BOTTOM_SPACING, TEAL_SIDEBAR_WIDTH, TEAL,
     BUTTONS_GROUP_SPACING, BUTTONS_GROUP_VOFFSET_PX,
-    GIF_PATH, GIF_WIDTH_PX, GIF_DURATION_MS,
+    GIF_PATH, GIF_WIDTH_PX, PIPELINE_DEFAULTS,
     PROCESS_STYLE_CSS, DONE_STYLE_CSS,
     DATA_TABLE_MIN_HEIGHT_FRAC, DATA_TABLE_MAX_HEIGHT_FRAC,
     DATA_TABLE_MIN_WIDTH_FRAC, DATA_TABLE_MAX_WIDTH_FRAC,
 )
 from tabs import create_tabs
+from workers import LoadWorker, StatsWorker, PipelineWorker
+from pipeline import AnalysisRun, check_parameters
+from sweep import SweepRun, parse_values, configurations
+from checkpoint import record_last_run, last_run
+from tab_utils import SweepResultsDialog
+from data_io import list_excel_sheets
 
 
 # -------------------- Fractional sizing for the data table --------------------
@@ -43,43 +49,240 @@ def apply_data_table_fractional_sizes(win: QMainWindow):
 
 # -------------------- Upload logic --------------------
 
-def upload_file_and_display(tabs: QTabWidget):
+def show_loaded_dataframe(tabs: QTabWidget, df, observables=None):
+    """Push a freshly parsed DataFrame into the Data tab (GUI thread only)."""
+    # --- RESET previous selections/fields for this Data tab ---
+    if hasattr(tabs.data_page, "data_selector"):
+        tabs.data_page.data_selector.reset()
+    if hasattr(tabs.data_page, "data_individuals"):
+        tabs.data_page.data_individuals.reset()
+
+    # --- Show table ---
+    tabs.data_page.set_dataframe(df, observables)
+
+    # --- Populate selectors with fresh data ---
+    if hasattr(tabs.data_page, "data_selector"):
+        tabs.data_page.data_selector.load_columns(df.columns.astype(str).tolist())
+    if hasattr(tabs.data_page, "data_individuals"):
+        if observables is not None:
+            ids = observables.id_index.ids.tolist()
+        else:
+            ids = df.iloc[:, 0].dropna().astype(str).unique().tolist()
+        tabs.data_page.data_individuals.load_items(ids)
+
+    if tabs.data_page.title:
+        tabs.data_page.title.setText(
+            f"Data Preview — {len(df)} individuals, {len(df.columns)} observables"
+        )
+    tabs.setCurrentWidget(tabs.data_page)
+
+
+def restore_preview(tabs: QTabWidget):
+    """Put the last fully loaded frame back after a streamed load was cancelled or failed."""
+    page = tabs.data_page
+    tabs.data_table.display_dataframe(page.dataframe, page.observables)
+    if page.column_stats is not None:
+        tabs.data_table.set_column_stats(page.column_stats)
+    if page.title:
+        df = page.dataframe
+        page.title.setText("Data Preview" if df is None else
+                           f"Data Preview — {len(df)} individuals, {len(df.columns)} observables")
+
+
+def start_column_stats(tabs: QTabWidget, observables):
+    """Build the column-statistics index off the GUI thread, then attach it."""
+    previous = getattr(tabs, "_stats_worker", None)
+    if previous is not None and previous.isRunning():
+        previous.cancel()
+    if observables is None:
+        return
+
+    worker = StatsWorker(observables, parent=tabs)
+    tabs._stats_worker = worker
+
+    def _on_ready(stats):
+        if tabs.data_page.observables is observables:
+            tabs.data_page.set_column_stats(stats)
+
+    def _done():
+        if getattr(tabs, "_stats_worker", None) is worker:
+            tabs._stats_worker = None
+        worker.deleteLater()
+
+    worker.ready.connect(_on_ready)
+    worker.failed.connect(lambda msg: print(f"[ERROR] Column statistics failed: {msg}"))
+    worker.finished.connect(_done)
+    worker.start()
+
+
+def upload_file_and_display(tabs: QTabWidget, status_label: QLabel = None,
+                            btn_cancel: QPushButton = None):
     file_path, _ = QFileDialog.getOpenFileName(
         None, "Open File", "", "Data Files (*.csv *.xlsx *.tsv)"
     )
     if not file_path:
         return
-    try:
-        if file_path.endswith(".csv") or file_path.endswith(".tsv"):
-            sep = "," if file_path.endswith(".csv") else "\t"
-            df = pd.read_csv(file_path, sep=sep)
-        else:
-            df = pd.read_excel(file_path)
-
-        # --- RESET previous selections/fields for this Data tab ---
-        if hasattr(tabs.data_page, "data_selector"):
-            tabs.data_page.data_selector.reset()
-        if hasattr(tabs.data_page, "data_individuals"):
-            tabs.data_page.data_individuals.reset()
 
-        # --- Show table ---
-        tabs.data_page.set_dataframe(df)
-
-        # --- Populate selectors with fresh data ---
-        if hasattr(tabs.data_page, "data_selector"):
-            tabs.data_page.data_selector.load_columns(df.columns.astype(str).tolist())
-        if hasattr(tabs.data_page, "data_individuals"):
-            ids = df.iloc[:, 0].dropna().astype(str).unique().tolist()
-            tabs.data_page.data_individuals.load_items(ids)
+    # A new upload supersedes one still in flight
+    previous = getattr(tabs, "_load_worker", None)
+    if previous is not None and previous.isRunning():
+        previous.cancel()
 
+    def _status(text, css=PROCESS_STYLE_CSS):
+        if status_label is None:
+            return
+        status_label.setText(text)
+        status_label.setStyleSheet(css)
+        status_label.setAlignment(Qt.AlignCenter)
+        status_label.setVisible(bool(text))
+
+    sheet = None
+    if file_path.endswith(".xlsx"):
+        try:
+            sheets = list_excel_sheets(file_path)
+        except Exception as e:
+            print(f"[ERROR] Failed to load file: {e}")
+            return
+        if len(sheets) > 1:
+            sheet, ok = QInputDialog.getItem(
+                tabs, "Select sheet", "Sheet to load:", sheets, 0, False
+            )
+            if not ok:
+                return
+
+    worker = LoadWorker(file_path, sheet=sheet, parent=tabs)
+    tabs._load_worker = worker
+
+    def _done():
+        if btn_cancel is not None:
+            btn_cancel.setVisible(False)
+        if getattr(tabs, "_load_worker", None) is worker:
+            tabs._load_worker = None
+        worker.deleteLater()
+
+    def _on_loaded(df, observables):
+        if getattr(tabs, "_load_worker", None) is not worker:
+            return  # superseded by a newer upload
+        try:
+            show_loaded_dataframe(tabs, df, observables)
+            tabs.data_page.source_name = os.path.basename(file_path)
+            start_column_stats(tabs, observables)
+            report = df.attrs.get("load_report")
+            _status(f"Loaded {len(df):,} rows" + (f"\n{report}" if report else ""))
+        except Exception as e:
+            print(f"[ERROR] Failed to load file: {e}")
+            _status("Load failed")
+
+    def _on_batch(batch):
+        if getattr(tabs, "_load_worker", None) is not worker:
+            return
+        tabs.data_table.append_batch(batch)
         if tabs.data_page.title:
             tabs.data_page.title.setText(
-                f"Data Preview — {len(df)} individuals, {len(df.columns)} observables"
+                f"Data Preview — loading… {tabs.data_table.model.rowCount():,} rows"
             )
         tabs.setCurrentWidget(tabs.data_page)
 
-    except Exception as e:
-        print(f"[ERROR] Failed to load file: {e}")
+    def _on_failed(msg):
+        print(f"[ERROR] Failed to load file: {msg}")
+        if getattr(tabs, "_load_worker", None) is worker:
+            restore_preview(tabs)
+            _status("Load failed")
+
+    def _on_cancelled():
+        if getattr(tabs, "_load_worker", None) is worker:
+            restore_preview(tabs)
+            _status("Load cancelled")
+
+    worker.progress.connect(_status)
+    worker.batch.connect(_on_batch)
+    worker.loaded.connect(_on_loaded)
+    worker.failed.connect(_on_failed)
+    worker.cancelled.connect(_on_cancelled)
+    worker.finished.connect(_done)
+
+    if btn_cancel is not None:
+        try:
+            btn_cancel.clicked.disconnect()
+        except TypeError:
+            pass  # nothing connected yet
+        btn_cancel.clicked.connect(worker.cancel)
+        btn_cancel.setVisible(True)
+
+    _status("Loading data…")
+    tabs.data_table.begin_stream()
+    worker.start()
+
+
+# -------------------- Parameters --------------------
+_PARAMETER_LABELS = {
+    "cutoff_traits": "Cutoff number of traits",
+    "traits_activation": "Traits activation rate",
+    "optimizer_lr": "Optimizer learn rate",
+    "noise_ratio": "Noise ratio",
+    "restarts": "Restarts",
+}
+
+
+def _parameter_values(widgets, many):
+    """
+    {name: [values]} from the Parameters tab widgets. Empty fields and
+    unset toggles fall back to PIPELINE_DEFAULTS. With `many`, numeric
+    fields may hold lists / ranges (sweep.parse_values).
+    """
+    values = {}
+    for name, default in PIPELINE_DEFAULTS.items():
+        widget = widgets.get(name)
+        if widget is None:
+            values[name] = [default]
+        elif isinstance(default, bool):
+            value = widget.value()
+            values[name] = [default if value is None else value]
+        else:
+            text = widget.text().strip()
+            label = _PARAMETER_LABELS.get(name, name)
+            if not text:
+                values[name] = [default]
+            elif many:
+                try:
+                    values[name] = parse_values(text, type(default))
+                except ValueError as e:
+                    raise ValueError(f"{label}: {e}.") from None
+            elif "," in text or ":" in text:
+                raise ValueError(f"{label}: lists and ranges need Sweep.")
+            else:
+                try:
+                    values[name] = [type(default)(text)]
+                except ValueError:
+                    kind = "a whole number" if isinstance(default, int) else "a number"
+                    raise ValueError(f"{label} must be {kind}.") from None
+    return values
+
+
+def collect_parameters(widgets):
+    """
+    Plain values from the Parameters tab widgets. Empty fields and unset
+    toggles fall back to PIPELINE_DEFAULTS; bad input raises ValueError.
+    """
+    params = {name: values[0] for name, values in _parameter_values(widgets, many=False).items()}
+    check_parameters(params)
+    return params
+
+
+def collect_sweep(widgets):
+    """Parameter dicts of the sweep described by the Parameters tab; bad input raises ValueError."""
+    values = _parameter_values(widgets, many=True)
+    for name, options in values.items():
+        for value in options:
+            check_parameters({**PIPELINE_DEFAULTS, name: value})
+    samples = widgets["sweep_samples"].text().strip() if "sweep_samples" in widgets else ""
+    try:
+        samples = int(samples) if samples else 0
+    except ValueError:
+        raise ValueError("Sweep samples must be a whole number.") from None
+    if samples < 0:
+        raise ValueError("Sweep samples cannot be negative.")
+    return configurations(values, samples)
 
 
 # -------------------- Results tab creator helper --------------------
@@ -189,6 +392,11 @@ def create_main_window() -> QMainWindow:
     status_label.setVisible(False)
     left_layout.addWidget(status_label, 0, Qt.AlignHCenter)
 
+    btn_cancel = QPushButton("Cancel")
+    btn_cancel.setStyleSheet(pill_btn_css)
+    btn_cancel.setVisible(False)
+    left_layout.addWidget(btn_cancel, 0, Qt.AlignHCenter)
+
     # Bottom "Go"
     left_layout.addStretch(1)
     go_css = """
@@ -206,9 +414,21 @@ def create_main_window() -> QMainWindow:
     btn_go.setStyleSheet(go_css)
     btn_go.setMinimumWidth(120)
 
+    # Sweep: one run per combination of list / range parameters
+    btn_sweep = QPushButton("Sweep")
+    btn_sweep.setStyleSheet(pill_btn_css)
+    btn_sweep.setToolTip("Run every combination of the list / range values on the Parameters tab")
+
+    # Resume: the last Go run, continued from its training checkpoints
+    btn_resume = QPushButton("Resume")
+    btn_resume.setStyleSheet(pill_btn_css)
+    btn_resume.setToolTip("Continue the last run from where it stopped (Cancel, crash or closing the app)")
+
     go_row = QHBoxLayout()
     go_row.addStretch(1)
     go_row.addWidget(btn_go)
+    go_row.addWidget(btn_sweep)
+    go_row.addWidget(btn_resume)
     go_row.addStretch(1)
     left_layout.addLayout(go_row)
 
@@ -221,7 +441,9 @@ def create_main_window() -> QMainWindow:
     rlay.addWidget(win.tabs)
 
     # Wire actions
-    btn_upload.clicked.connect(lambda: upload_file_and_display(win.tabs))
+    btn_upload.clicked.connect(
+        lambda: upload_file_and_display(win.tabs, status_label, btn_cancel)
+    )
     btn_params.clicked.connect(lambda: win.tabs.setCurrentWidget(win.tabs.param_page))
     btn_info.clicked.connect(lambda: win.tabs.setCurrentWidget(win.tabs.info))
 
@@ -230,36 +452,103 @@ def create_main_window() -> QMainWindow:
     if movie and movie.isValid() and GIF_WIDTH_PX > 0:
         movie.setScaledSize(QSize(GIF_WIDTH_PX, GIF_WIDTH_PX))
 
-    def run_gif_then_results():
-        gif_label.setVisible(True)
-        status_label.setText("Processing…")
-        status_label.setStyleSheet(PROCESS_STYLE_CSS)
+    def _status(text, css=PROCESS_STYLE_CSS):
+        status_label.setText(text)
+        status_label.setStyleSheet(css)
         status_label.setAlignment(Qt.AlignCenter)
-        status_label.setVisible(True)
+        status_label.setVisible(bool(text))
+
+    def run_analysis(sweep=False, resume=False):
+        tabs = win.tabs
+        observables = tabs.data_page.observables
+        last = last_run() if resume else None
+        if resume and last is None:
+            _status("Nothing to resume")
+            return
+        if resume and (observables is None or observables.key != last["dataset"]):
+            _status(f"Load {last['source'] or 'the dataset of the last run'} to resume it")
+            return
+        if observables is None:
+            _status("Upload data first")
+            return
+        widgets = tabs.param_page.parameters
+        try:
+            if sweep:
+                configs = collect_sweep(widgets)
+            elif not resume:
+                params = collect_parameters(widgets)
+        except ValueError as e:
+            _status("Check parameters")
+            QMessageBox.warning(win, "Invalid parameter", str(e))
+            return
+
+        reports = [name for name, cb in widgets["report_checkboxes"].items() if cb.isChecked()]
+        columns = tabs.data_page.data_selector.get_selected()
+        individuals = tabs.data_page.data_individuals.get_selected()
+        if sweep:
+            run = SweepRun(observables, columns, individuals, configs, reports)
+        elif resume:
+            run = AnalysisRun(observables, last["columns"], last["individuals"], last["params"],
+                              last["reports"], resume=True)
+        else:
+            run = AnalysisRun(observables, columns, individuals, params, reports)
+            record_last_run(run, getattr(tabs.data_page, "source_name", None))
+        worker = PipelineWorker(run, parent=tabs)
+        tabs._pipeline_worker = worker
 
+        gif_label.setVisible(True)
         if movie and movie.isValid():
             gif_label.setMovie(movie)
             movie.start()
         else:
             gif_label.setText("")
-
-        for b in (btn_upload, btn_params, btn_info, btn_go):
+        for b in (btn_upload, btn_params, btn_info, btn_go, btn_sweep, btn_resume):
             b.setEnabled(False)
 
-        def _finish():
+        def _done():
             if movie and movie.isValid():
                 movie.stop()
             gif_label.setVisible(False)
-            status_label.setText("Done!")
-            status_label.setStyleSheet(DONE_STYLE_CSS)
-            status_label.setAlignment(Qt.AlignCenter)
-            for b in (btn_upload, btn_params, btn_info, btn_go):
+            btn_cancel.setVisible(False)
+            for b in (btn_upload, btn_params, btn_info, btn_go, btn_sweep, btn_resume):
                 b.setEnabled(True)
-            ensure_results_tab_and_open(win.tabs)
-
-        QTimer.singleShot(GIF_DURATION_MS, _finish)
-
-    btn_go.clicked.connect(run_gif_then_results)
+            if getattr(tabs, "_pipeline_worker", None) is worker:
+                tabs._pipeline_worker = None
+            worker.deleteLater()
+
+        def _on_completed(finished):
+            _status("Done!", DONE_STYLE_CSS)
+            if sweep:
+                tabs._sweep_dialog = SweepResultsDialog(finished, win)
+                tabs._sweep_dialog.show()
+                return
+            tabs.results_page.last_run = finished
+            ensure_results_tab_and_open(tabs)
+
+        def _on_failed(msg):
+            print(f"[ERROR] Analysis failed: {msg}")
+            _status("Analysis failed")
+            QMessageBox.critical(win, "Analysis failed", msg)
+
+        worker.progress.connect(_status)
+        worker.completed.connect(_on_completed)
+        worker.failed.connect(_on_failed)
+        worker.cancelled.connect(lambda: _status("Analysis cancelled"))
+        worker.finished.connect(_done)
+
+        try:
+            btn_cancel.clicked.disconnect()
+        except TypeError:
+            pass  # nothing connected yet
+        btn_cancel.clicked.connect(worker.cancel)
+        btn_cancel.setVisible(True)
+
+        _status("Processing…")
+        worker.start()
+
+    btn_go.clicked.connect(lambda: run_analysis())
+    btn_sweep.clicked.connect(lambda: run_analysis(sweep=True))
+    btn_resume.clicked.connect(lambda: run_analysis(resume=True))
 
     root.addWidget(left)
     root.addWidget(right)
@@ -1,5 +1,6 @@
 # main.py
 
+import multiprocessing
 import sys
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication
@@ -24,4 +25,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()    # the analysis runs in a child process
     main()
\ No newline at end of file
@@ -0,0 +1,150 @@
+# observables.py
+
+import os
+import numpy as np
+import pandas as pd
+
+from config import DATA_CACHE_DIR
+
+
+class ObservableMatrix:
+    """
+    Numeric observables of a dataset as one contiguous float32 matrix
+    (rows = records, columns = observables), memory-mapped from the
+    dataset cache when the file has a content key.
+
+    ids          -> str array, one ID per row (first column of the file)
+    id_name      -> header of that ID column
+    id_index     -> IdIndex over `ids` (ID -> row positions)
+    columns      -> observable names, in matrix column order
+    column_index -> {name: matrix column}
+    """
+    def __init__(self, values, ids, columns, path=None, id_index=None, id_name=None):
+        self.values = values
+        self.ids = ids
+        self.id_name = id_name
+        self.id_index = id_index if id_index is not None else IdIndex.from_values(ids)
+        self.columns = list(columns)
+        self.column_index = {c: j for j, c in enumerate(self.columns)}
+        self.path = path
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def key(self):
+        """Dataset content key of a cache-backed matrix (None when in memory)."""
+        if self.path is None:
+            return None
+        return os.path.basename(self.path)[:-len(".obs.npy")]
+
+    def column(self, name):
+        """Zero-copy (strided) view of one observable, or None if not numeric."""
+        j = self.column_index.get(name)
+        return None if j is None else self.values[:, j]
+
+    def individual(self, individual_id):
+        """Observable rows (records x observables) of one individual."""
+        return self.values[self.id_index.rows(individual_id)]
+
+    @classmethod
+    def from_dataframe(cls, df, key=None, is_cancelled=None):
+        """
+        Build from a parsed frame. The first column is the individual ID and
+        is never treated as an observable; other bool/int/float columns are.
+        With a `key`, the matrix lives in DATA_CACHE_DIR and is reused by
+        later loads of the same file.
+        """
+        ids = df.iloc[:, 0].astype(str).to_numpy() if df.shape[1] else np.empty(0, dtype=str)
+        id_index = IdIndex.from_values(df.iloc[:, 0] if df.shape[1] else ids)
+        names = df.columns.astype(str).tolist()
+        id_name = names[0] if names else None
+        picked = [j for j in range(1, df.shape[1]) if df.iloc[:, j].dtype.kind in "biuf"]
+        columns = [names[j] for j in picked]
+        shape = (len(df), len(picked))
+
+        path = None
+        if key is not None:
+            path = os.path.join(DATA_CACHE_DIR, f"{key}.obs.npy")
+            if os.path.exists(path):
+                values = np.load(path, mmap_mode="r")
+                if values.shape == shape and values.dtype == np.float32:
+                    os.utime(path)
+                    return cls(values, ids, columns, path, id_index, id_name)
+
+        if path is None:
+            values = np.empty(shape, dtype=np.float32)
+        else:
+            os.makedirs(DATA_CACHE_DIR, exist_ok=True)
+            tmp = path + ".tmp"
+            values = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=shape)
+
+        for out_j, j in enumerate(picked):
+            if is_cancelled is not None and is_cancelled():
+                del values
+                if path is not None:
+                    os.remove(tmp)
+                return None
+            values[:, out_j] = df.iloc[:, j].to_numpy(dtype=np.float32, na_value=np.nan)
+
+        if path is not None:
+            values.flush()
+            del values
+            os.replace(tmp, path)
+            values = np.load(path, mmap_mode="r")
+        return cls(values, ids, columns, path, id_index, id_name)
+
+
+class IdIndex:
+    """
+    Individual ID -> row positions, built once per load.
+
+    Rows are grouped by ID in one array (`order`), so an individual's rows
+    are the slice order[starts[c]:starts[c + 1]] for its code c; `codes`
+    maps ID -> c. Repeated-measures files (many rows per ID) cost no more
+    than one row each. Rows with a missing ID belong to no individual.
+
+    ids    -> unique IDs as str, in order of first appearance
+    order  -> row positions grouped by ID (ascending within an ID)
+    starts -> len(ids) + 1 offsets into `order`
+    """
+    def __init__(self, ids, order, starts):
+        self.ids = ids
+        self.order = order
+        self.starts = starts
+        self.codes = {v: c for c, v in enumerate(ids.tolist())}
+
+    @classmethod
+    def from_values(cls, values):
+        """From the ID column (Series or array); missing values are skipped."""
+        codes, uniques = pd.factorize(pd.Series(values), sort=False)
+        codes = np.asarray(codes, dtype=np.int64)
+        order = np.argsort(codes, kind="stable")
+        order = order[np.count_nonzero(codes < 0):]    # missing IDs sort first (code -1)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        starts = np.zeros(len(uniques) + 1, dtype=np.int64)
+        np.cumsum(counts, out=starts[1:])
+        return cls(np.asarray(uniques).astype(str), order, starts)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, individual_id):
+        return individual_id in self.codes
+
+    def rows(self, individual_id):
+        """Row positions of one individual (empty if unknown)."""
+        c = self.codes.get(individual_id)
+        if c is None:
+            return self.order[:0]
+        return self.order[self.starts[c]:self.starts[c + 1]]
+
+    def rows_for(self, individual_ids):
+        """Row positions of several individuals, concatenated in the given order."""
+        parts = [self.rows(i) for i in individual_ids]
+        return np.concatenate(parts) if parts else self.order[:0]
+
+    def n_rows(self, individual_id):
+        c = self.codes.get(individual_id)
+        return 0 if c is None else int(self.starts[c + 1] - self.starts[c])
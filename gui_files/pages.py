@@ -1,5 +1,6 @@
 # pages.py (v0 - reference preserved)
 
+import os
 from PyQt5.QtWidgets import QFrame, QLabel, QVBoxLayout, QWidget, QHBoxLayout
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt
@@ -49,7 +50,7 @@ def create_image_frame(image_path, image_width, image_height,
 
     return frame
 
-def trait_latent_page():
+def trait_latent_page(results_dir="results"):
     container = QWidget()
     layout = QVBoxLayout(container)
     layout.setContentsMargins(0, 0, 0, 0)
@@ -58,7 +59,7 @@ def trait_latent_page():
 
     # === Frame 1 ===
     frame0 = create_image_frame(
-        image_path="results/traits_vs_features.png",
+        image_path=os.path.join(results_dir, "traits_vs_features.png"),
         image_width=1200,
         image_height=1500
     )
@@ -66,7 +67,7 @@ def trait_latent_page():
 
     # === Frame 1 ===
     frame1 = create_image_frame(
-        image_path="results/traits_radar.png",
+        image_path=os.path.join(results_dir, "traits_radar.png"),
         image_width=1200,
         image_height=1500
     )
@@ -74,7 +75,7 @@ def trait_latent_page():
 
     # === Frame 2  ===
     frame2 = create_image_frame(
-        image_path="results/traits_bars.png",  # replace with actual path
+        image_path=os.path.join(results_dir, "traits_bars.png"),  # replace with actual path
         image_width=1200,
         image_height=800
     )
@@ -82,7 +83,7 @@ def trait_latent_page():
 
         # === Frame 3 ===
     frame3 = create_image_frame(
-        image_path="results/trait_informativeness.png",  # replace with actual path
+        image_path=os.path.join(results_dir, "trait_informativeness.png"),  # replace with actual path
         image_width=1200,
         image_height=800
     )
@@ -90,7 +91,7 @@ def trait_latent_page():
 
             # === Frame 4 ===
     frame4 = create_image_frame(
-        image_path="results/traits_orthogonality.png",  # replace with actual path
+        image_path=os.path.join(results_dir, "traits_orthogonality.png"),  # replace with actual path
         image_width=1200,
         image_height=800
     )
@@ -101,7 +102,8 @@ def trait_latent_page():
 
 
 
-def bp_profile_page():
+def bp_profile_page(patient_blocks=None):
+    """patient_blocks: [(id, profile image, pyramid image)] from the last analysis run."""
     def create_image_frame(image_path, width, height, margins=(10, 10, 10, 10), border_radius=20, border_color="#B0B0B0", border_thickness=1):
         pixmap = QPixmap(image_path)
         if pixmap.isNull():
@@ -139,11 +141,12 @@ def bp_profile_page():
     layout.setContentsMargins(10, 20, 10, 20)
 
     # === Patient Blocks ===
-    patient_blocks = [
-        ("A04545", "results/a04545.png", "results/A04545_piramide.png"),
-        ("A05694", "results/a05694.png", "results/A05694_piramide.png"),
-        ("A05889", "results/a05889.png", "results/A05889_piramide.png"),
-    ]
+    if patient_blocks is None:
+        patient_blocks = [
+            ("A04545", "results/a04545.png", "results/A04545_piramide.png"),
+            ("A05694", "results/a05694.png", "results/A05694_piramide.png"),
+            ("A05889", "results/a05889.png", "results/A05889_piramide.png"),
+        ]
 
     for name, path_left, path_right in patient_blocks:
         wrapper = QWidget()
@@ -176,7 +179,7 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame
 from PyQt5.QtCore import Qt
 
-def traits_ecosystem_analysis_page():
+def traits_ecosystem_analysis_page(results_dir="results"):
     container = QWidget()
     layout = QVBoxLayout(container)
     layout.setContentsMargins(0, 0, 0, 0)
@@ -184,7 +187,7 @@ def traits_ecosystem_analysis_page():
 
     # === Frame 1 ===
     frame1 = create_image_frame(
-        "results/trait_network.png",
+        os.path.join(results_dir, "trait_network.png"),
         1000,
         600
     )
@@ -230,7 +233,7 @@ def traits_ecosystem_analysis_page():
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel
 from PyQt5.QtCore import Qt
 
-def group_analysis_page():
+def group_analysis_page(results_dir="results"):
     container = QWidget()
     layout = QVBoxLayout(container)
     layout.setContentsMargins(0, 0, 0, 0)
@@ -241,7 +244,7 @@ def group_analysis_page():
     title1.setStyleSheet("font-weight: bold; font-size: 14px;")
     layout.addWidget(title1, alignment=Qt.AlignCenter)
 
-    frame1 = create_image_frame("results/trait_popularity.png", 1000, 600)
+    frame1 = create_image_frame(os.path.join(results_dir, "trait_popularity.png"), 1000, 600)
     layout.addWidget(frame1, alignment=Qt.AlignCenter)
 
     # === Row 1: Profile Distribution + Heterogeneity ===
@@ -252,8 +255,8 @@ def group_analysis_page():
     row1 = QHBoxLayout()
     row1.setSpacing(40)
 
-    frame2 = create_image_frame("results/profiles_distribution.png", 500, 400)
-    frame3 = create_image_frame("results/profile_heterogeneity.png", 500, 400)
+    frame2 = create_image_frame(os.path.join(results_dir, "profiles_distribution.png"), 500, 400)
+    frame3 = create_image_frame(os.path.join(results_dir, "profile_heterogeneity.png"), 500, 400)
 
     row1.addWidget(frame2)
     row1.addWidget(frame3)
@@ -267,8 +270,8 @@ def group_analysis_page():
     row2 = QHBoxLayout()
     row2.setSpacing(40)
 
-    frame4 = create_image_frame("results/trait_coactivation.png", 500, 400)
-    frame5 = create_image_frame("results/trait_network.png", 500, 400)
+    frame4 = create_image_frame(os.path.join(results_dir, "trait_coactivation.png"), 500, 400)
+    frame5 = create_image_frame(os.path.join(results_dir, "trait_network.png"), 500, 400)
 
     row2.addWidget(frame4)
     row2.addWidget(frame5)
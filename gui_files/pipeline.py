@@ -0,0 +1,582 @@
+# pipeline.py
+"""
+Analysis pipeline behind the "Go" button.
+
+Qt-free: stages only read an AnalysisRun, fill in their results and
+report progress through plain callables, so the same code runs on a
+QThread, in a worker process or from a script.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import re
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    PIPELINE_DEFAULTS, PIPELINE_MAX_PROFILES, OUTPUT_DIR, RESULTS_DIR,
+    OUTPUT_ZIP_PATH, REPORT_PDF_PATH, COLUMN_STATS_BLOCK_CELLS, DATA_CACHE_DIR,
+    TRAIT_EPOCHS, TRAIT_BATCH_SIZE, TRAIT_L2, TRAIT_SEED,
+    TRAIT_CANDIDATES_PER_OBSERVABLE, TRAIT_PRUNE_WARMUP, TRAIT_PRUNE_MIN_ACTIVITY,
+    TRAIT_PRUNE_MIN_ENERGY, TRAIT_PRUNE_MAX_SIMILARITY, TRAIT_PATIENCE, TRAIT_TOLERANCE,
+    STAGE_CACHE_ENABLED,
+)
+from checkpoint import fit_checkpoint
+from engine import fit_parallel
+from dataset_cache import evict
+from stage_cache import StageCache, stage_key
+from trait_model import fit_model
+
+_PREPROCESS_VERSION = "1"     # bump when standardize() output changes
+
+
+class PipelineCancelled(Exception):
+    """Raised inside a stage when the run was cancelled."""
+
+
+class AnalysisRun:
+    """
+    Inputs and results of one pipeline run. Stages add attributes:
+
+    prepare      -> columns, individuals
+    standardize  -> X (rows x observables, float32, standardized), center, scale,
+                    X_path (the cache file X is mapped from, or None)
+    fit_traits   -> model (trait_model.TraitModel), loss_history, trait_history,
+                    restart_losses (full-data reconstruction error of every restart)
+    score        -> traits, loadings (observables x traits), structure, explained,
+                    individual_scores, weights; model reordered by explained variance
+    figures      -> figures {name: matplotlib Figure}, profiles
+    outputs      -> outputs {kind: path}
+
+    Files are written below output_dir (by default a new folder under
+    OUTPUT_DIR, see new_output_dir).
+    With resume, fit_traits continues from the fits' checkpoints.
+    """
+    def __init__(self, observables, columns=(), individuals=(), params=None, reports=(), output_dir=None,
+                 resume=False):
+        self.observables = observables
+        self.requested_columns = list(columns)
+        self.requested_individuals = list(individuals)
+        self.params = dict(PIPELINE_DEFAULTS)
+        self.params.update(params or {})
+        self.reports = list(reports)
+        self.output_dir = output_dir if output_dir is not None else new_output_dir()
+        self.resume = resume
+        self.notes = []
+        self.cached_stages = []     # memoized stages restored from the stage cache
+        self.timings = {}
+        self.figures = {}
+        self.outputs = {}
+
+    def inputs(self):
+        """Keyword arguments that rebuild this run around an ObservableMatrix."""
+        return {"columns": self.requested_columns, "individuals": self.requested_individuals,
+                "params": self.params, "reports": self.reports, "output_dir": self.output_dir,
+                "resume": self.resume}
+
+    def detach(self):
+        """Drop the bulky inputs/intermediates so the run can be pickled back to the GUI."""
+        for name in ("observables", "X"):
+            setattr(self, name, None)
+        self.figures = {}
+        return self
+
+
+def check_parameters(params):
+    """Raise ValueError (user-facing message) for out-of-range pipeline parameters."""
+    if params["cutoff_traits"] < 1:
+        raise ValueError("Cutoff number of traits must be at least 1.")
+    if not 0 < params["traits_activation"] <= 1:
+        raise ValueError("Traits activation rate must be in (0, 1].")
+    if params["optimizer_lr"] <= 0:
+        raise ValueError("Optimizer learn rate must be positive.")
+    if not 0 <= params["noise_ratio"] < 1:
+        raise ValueError("Noise ratio must be in [0, 1).")
+    if params["restarts"] < 1:
+        raise ValueError("Restarts must be at least 1.")
+
+
+# -------------------- Stages --------------------
+def prepare(run, report, check):
+    """Resolve the observable selection (numeric columns only) and the profiled individuals."""
+    obs = run.observables
+    requested = run.requested_columns or obs.columns
+    columns = [c for c in requested if c in obs.column_index]
+    skipped = [c for c in requested if c not in obs.column_index and c != obs.id_name]
+    if skipped:
+        run.notes.append(f"{len(skipped)} non-numeric observable(s) skipped: "
+                         + ", ".join(skipped[:10]) + ("…" if len(skipped) > 10 else ""))
+    if not columns:
+        raise ValueError("None of the selected observables are numeric.")
+    if obs.shape[0] < 2:
+        raise ValueError("At least two records are needed.")
+    run.columns = columns
+
+    known = [i for i in run.requested_individuals if i in obs.id_index]
+    run.individuals = known or obs.id_index.ids[:PIPELINE_MAX_PROFILES].tolist()
+    report(1.0)
+
+
+def standardize(run, report, check):
+    """
+    X = the selected observables as float32, centered on the column mean and,
+    with z-scoring, divided by the column SD; missing values end up at 0.
+    Statistics ignore missing values. The result is cached per dataset,
+    selection and toggle, so reruns with other model parameters map it
+    back instead of recomputing.
+    """
+    zscore = bool(run.params["zscore_standardization"])
+    key = _preprocess_key(run.observables, run.columns, zscore)
+    cached = _load_preprocessed(key)
+    if cached is not None:
+        run.X, run.center, run.scale = cached
+        run.X_path = _preprocess_path(key, ".pre.npy")
+        report(1.0)
+        return
+
+    obs = run.observables
+    idx = np.array([obs.column_index[c] for c in run.columns])
+    n, k = obs.shape[0], len(idx)
+    if key is None:
+        X = np.empty((n, k), dtype=np.float32)
+    else:
+        os.makedirs(DATA_CACHE_DIR, exist_ok=True)
+        tmp = _preprocess_path(key, ".pre.npy") + ".tmp"
+        X = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.float32, shape=(n, k))
+
+    try:
+        # pass 1: gather the columns, with per-block masked mean / M2 merged as we go
+        count = np.zeros(k)
+        mean = np.zeros(k)
+        m2 = np.zeros(k)
+        step = max(1, COLUMN_STATS_BLOCK_CELLS // max(1, k))
+        for lo in range(0, n, step):
+            check()
+            block = X[lo:lo + step]
+            np.take(obs.values[lo:lo + step], idx, axis=1, out=block)
+            valid = np.isfinite(block)
+            n_b = valid.sum(axis=0)
+            mean_b = np.where(valid, block, 0).sum(axis=0, dtype=np.float64) / np.maximum(n_b, 1)
+            m2_b = np.square(np.where(valid, block - mean_b, 0)).sum(axis=0)
+            total = count + n_b
+            delta = mean_b - mean
+            weight = np.divide(n_b, total, out=np.zeros(k), where=total > 0)
+            mean += delta * weight
+            m2 += m2_b + delta ** 2 * count * weight
+            count = total
+            report(0.5 * min(1.0, (lo + step) / n))
+
+        center = np.where(count > 0, mean, 0.0).astype(np.float32)
+        if zscore:
+            sd = np.sqrt(np.divide(m2, count, out=np.zeros(k), where=count > 0))
+            scale = np.where(sd > 0, sd, 1.0).astype(np.float32)
+        else:
+            scale = np.ones(k, dtype=np.float32)
+
+        # pass 2: in place
+        for lo in range(0, n, step):
+            check()
+            block = X[lo:lo + step]
+            block -= center
+            block /= scale
+            np.nan_to_num(block, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+            report(0.5 + 0.5 * min(1.0, (lo + step) / n))
+    except BaseException:
+        if key is not None:
+            X = block = None      # release the memmap before removing its file
+            _remove(tmp)
+        raise
+
+    run.X_path = None
+    if key is not None:
+        X = _store_preprocessed(key, X, tmp, center, scale)
+        run.X_path = _preprocess_path(key, ".pre.npy")
+    run.X, run.center, run.scale = X, center, scale
+
+
+def fit_traits(run, report, check):
+    """
+    Train the latent trait model (trait_model.fit_model) on the
+    standardized matrix. With restarts > 1, that many seeded fits run in
+    parallel worker processes (engine.fit_parallel) and the one with the
+    lowest final loss is kept. Every fit checkpoints its training state
+    (checkpoint.py); with run.resume it continues from there.
+    """
+    seeds = restart_seeds(run.params)
+    key = memo_key(run, fit_traits)
+    checkpoints = [fit_checkpoint(key, seed, run.resume) for seed in seeds]
+    if len(seeds) == 1:
+        fits = [fit_model(run.X, run.params, seeds[0], report, check, checkpoints[0])]
+    else:
+        fits = fit_parallel(run.X, run.X_path, list(zip([run.params] * len(seeds), seeds, checkpoints)),
+                            report, check)
+    keep_best_fit(run, fits)
+    report(1.0)
+
+
+def restart_seeds(params):
+    return [TRAIT_SEED + i for i in range(max(1, int(params["restarts"])))]
+
+
+def keep_best_fit(run, fits):
+    """
+    Adopt the restart with the lowest full-data reconstruction error (the
+    training losses end at different epochs, so they do not compare); note the spread.
+    """
+    restarts = len(fits)
+    best = min(fits, key=lambda fit: fit.loss)
+    run.model = best.model
+    run.loss_history = best.loss_history
+    run.trait_history = best.trait_history
+    run.restart_losses = [fit.loss for fit in fits]
+    run.notes.extend(best.notes)
+    if restarts > 1:
+        losses = np.array(run.restart_losses)
+        run.notes.append(
+            f"Best of {restarts} restarts (seed {best.seed}): reconstruction error {losses.min():.4g}; "
+            f"spread across restarts {losses.max() - losses.min():.3g} "
+            f"(median {np.median(losses):.4g}, max {losses.max():.4g})."
+        )
+
+
+def score(run, report, check):
+    """
+    Trait codes per individual (mean over their records' codes). The same
+    pass collects what is needed to order the traits by the
+    variance they reconstruct, and their observable correlations.
+    """
+    X, model = run.X, run.model
+    n, k = X.shape
+    m = model.n_traits
+    scores = np.empty((n, m), dtype=np.float32)
+    sx, sxx, sh, shh = np.zeros(k), np.zeros(k), np.zeros(m), np.zeros(m)
+    sxh = np.zeros((k, m))
+    residual = 0.0
+    step = max(1, COLUMN_STATS_BLOCK_CELLS // max(1, k, m))
+    for lo in range(0, n, step):
+        check()
+        x = np.asarray(X[lo:lo + step])
+        h = scores[lo:lo + step] = model.encode(x)
+        r = model.decode(h)
+        r -= x
+        residual += float(np.vdot(r, r))
+        x64, h64 = x.astype(np.float64), h.astype(np.float64)
+        sx += x64.sum(axis=0)
+        sxx += np.square(x64).sum(axis=0)
+        sh += h64.sum(axis=0)
+        shh += np.square(h64).sum(axis=0)
+        sxh += x64.T @ h64
+        report(0.8 * min(1.0, (lo + step) / n))
+
+    # variance reconstructed by each trait alone, scaled so they sum to R^2
+    h_var = np.maximum(shh - sh ** 2 / n, 0.0)
+    energy = h_var * np.square(model.Wd.astype(np.float64)).sum(axis=1)
+    total = max(float(sxx.sum() - (sx ** 2).sum() / n), 1e-12)
+    r2 = max(0.0, 1.0 - residual / total)
+    explained = r2 * energy / energy.sum() if energy.sum() > 0 else np.zeros(m)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = (sxh - np.outer(sx, sh) / n) / n
+        sd = np.outer(np.sqrt(np.maximum(sxx / n - (sx / n) ** 2, 0.0)), np.sqrt(h_var / n))
+        structure = np.where(sd > 0, cov / sd, 0.0)
+
+    index = run.observables.id_index
+    grouped = scores[index.order]
+    del scores
+    sums = np.add.reduceat(grouped, index.starts[:-1], axis=0) if len(index) else grouped[:0]
+    counts = np.diff(index.starts).astype(np.float32)
+
+    order = np.argsort(-explained, kind="stable")
+    model.reorder(order)
+    run.explained = explained[order]
+    run.structure = structure[:, order].astype(np.float32)
+    run.loadings = model.Wd.T.copy()
+    run.traits = [f"T{t + 1}" for t in range(m)]
+    run.individual_ids = index.ids
+    run.individual_scores = (sums / counts[:, None] if len(index) else sums)[:, order]
+
+    strength = np.abs(run.individual_scores)
+    if run.params["traits_assignment_weights"]:
+        total = strength.sum(axis=1, keepdims=True)
+        run.weights = np.divide(strength, total, out=np.zeros_like(strength), where=total > 0)
+    else:
+        run.weights = np.zeros_like(strength)
+        if len(strength):
+            run.weights[np.arange(len(strength)), strength.argmax(axis=1)] = 1.0
+    report(1.0)
+
+
+def render(run, report, check):
+    """Figures for the Results pages (PNG in RESULTS_DIR) and the PDF report."""
+    import figures    # matplotlib is only needed from here on
+
+    results_dir = os.path.join(run.output_dir, RESULTS_DIR)
+    os.makedirs(results_dir, exist_ok=True)
+    jobs = figures.figure_jobs(run)
+    for i, (name, make) in enumerate(jobs):
+        check()
+        fig = make()
+        fig.savefig(os.path.join(results_dir, f"{name}.png"))
+        run.figures[name] = fig
+        report((i + 1) / len(jobs))
+    run.profiles = [
+        (pid, os.path.join(results_dir, f"{safe_name(pid)}.png"),
+         os.path.join(results_dir, f"{safe_name(pid)}_piramide.png"))
+        for pid in run.individuals
+    ]
+
+
+def write_outputs(run, report, check):
+    """output_data.zip (tables + parameters) and report.pdf, written atomically."""
+    import figures
+
+    tables = {
+        "trait_loadings.csv": _csv(["observable", *run.traits], run.columns, run.loadings),
+        "trait_structure.csv": _csv(["observable", *run.traits], run.columns, run.structure),
+        "individual_traits.csv": _csv(["id", *run.traits], run.individual_ids, run.individual_scores),
+        "individual_weights.csv": _csv(["id", *run.traits], run.individual_ids, run.weights),
+        "trait_summary.csv": _csv(["trait", "explained_variance"], run.traits, run.explained[:, None]),
+        "parameters.json": json.dumps(run.params, indent=2),
+        "run_summary.json": json.dumps(summary(run), indent=2),
+    }
+    check()
+    os.makedirs(run.output_dir, exist_ok=True)
+    path = os.path.join(run.output_dir, OUTPUT_ZIP_PATH)
+    tmp = path + ".tmp"
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, text in tables.items():
+            zf.writestr(name, text)
+    os.replace(tmp, path)
+    run.outputs["data"] = os.path.abspath(path)
+    report(0.3)
+
+    check()
+    path = os.path.join(run.output_dir, REPORT_PDF_PATH)
+    tmp = path + ".tmp"
+    figures.write_report(run, tmp)
+    os.replace(tmp, path)
+    run.outputs["report"] = os.path.abspath(path)
+    report(1.0)
+
+
+# (label, relative cost, function)
+STAGES = [
+    ("Preparing data", 0.1, prepare),
+    ("Standardizing", 1.9, standardize),
+    ("Fitting traits", 6, fit_traits),
+    ("Scoring individuals", 1, score),
+    ("Rendering figures", 3, render),
+    ("Writing outputs", 1, write_outputs),
+]
+
+
+# Memoized stages: key inputs (besides the upstream key) and the attributes
+# they produce. prepare/standardize are cheap or cached by standardize()
+# itself; render/write_outputs write files and always run.
+_FIT_SETTINGS = (TRAIT_EPOCHS, TRAIT_BATCH_SIZE, TRAIT_L2, TRAIT_SEED, TRAIT_CANDIDATES_PER_OBSERVABLE,
+                 TRAIT_PRUNE_WARMUP, TRAIT_PRUNE_MIN_ACTIVITY, TRAIT_PRUNE_MIN_ENERGY,
+                 TRAIT_PRUNE_MAX_SIMILARITY, TRAIT_PATIENCE, TRAIT_TOLERANCE)
+_MEMOIZED = {
+    fit_traits: (
+        lambda run: (run.observables.key, run.columns, run.params["zscore_standardization"],
+                     *(run.params[p] for p in ("cutoff_traits", "traits_activation", "prune", "regularization",
+                                               "optimizer_lr", "noise_ratio", "restarts")),
+                     _FIT_SETTINGS),
+        ("model", "loss_history", "trait_history", "restart_losses"),
+    ),
+    score: (
+        lambda run: (run.params["traits_assignment_weights"],),
+        ("model", "traits", "loadings", "structure", "explained",
+         "individual_ids", "individual_scores", "weights"),
+    ),
+}
+_STAGE_CACHE_VERSION = "3"     # bump when a memoized stage's output changes
+_stage_cache = None
+
+
+def stage_cache():
+    """The process-wide StageCache (None when STAGE_CACHE_ENABLED is off)."""
+    global _stage_cache
+    if _stage_cache is None and STAGE_CACHE_ENABLED:
+        _stage_cache = StageCache()
+    return _stage_cache
+
+
+def memo_key(run, stage, upstream=None):
+    """Stage-cache key of a memoized stage for this run (None when it cannot be cached)."""
+    memo = _MEMOIZED.get(stage)
+    if memo is None or run.observables.key is None:
+        return None
+    return stage_key(_STAGE_CACHE_VERSION, stage.__name__, upstream, *memo[0](run))
+
+
+def restore_stage(run, stage, cache, key):
+    """Fill in a memoized stage's outputs from `cache`; False on a miss."""
+    cached = cache.get(key) if cache is not None and key is not None else None
+    if cached is None:
+        return False
+    for name in _MEMOIZED[stage][1]:
+        setattr(run, name, cached[name])
+    run.notes.extend(cached["notes"])
+    run.cached_stages.append(stage.__name__)
+    return True
+
+
+def store_stage(run, stage, cache, key, notes=()):
+    """Store a memoized stage's outputs (and the notes it added) under `key`."""
+    if cache is None or key is None:
+        return
+    entry = {name: getattr(run, name) for name in _MEMOIZED[stage][1]}
+    entry["notes"] = list(notes)
+    cache.put(key, entry)
+
+
+def _run_stage(run, stage, report, check, cache, upstream):
+    """
+    Run one stage, or restore it from `cache`. Returns the stage's key,
+    which chains into the next memoized stage.
+    """
+    key = memo_key(run, stage, upstream) if cache is not None else None
+    if key is None:
+        stage(run, report, check)
+        return upstream
+    if restore_stage(run, stage, cache, key):
+        report(1.0)
+        return key
+    n_notes = len(run.notes)
+    stage(run, report, check)
+    store_stage(run, stage, cache, key, run.notes[n_notes:])
+    return key
+
+
+def run_pipeline(run, progress=None, is_cancelled=None, cache=None):
+    """
+    Run every stage in order. progress(fraction, label) is called often;
+    raises PipelineCancelled when is_cancelled() turns true. Memoized
+    stages whose inputs are unchanged are restored from `cache`
+    (default: stage_cache()).
+    """
+    progress = progress or (lambda fraction, label: None)
+    cancelled = is_cancelled or (lambda: False)
+    cache = cache if cache is not None else stage_cache()
+    run.cached_stages = []
+    key = None
+
+    def check():
+        if cancelled():
+            raise PipelineCancelled()
+
+    total = float(sum(cost for _, cost, _ in STAGES))
+    done = 0.0
+    for label, cost, stage in STAGES:
+        check()
+        base = done
+        progress(base / total, label)
+        t0 = time.perf_counter()
+        key = _run_stage(run, stage, lambda frac, base=base, cost=cost, label=label:
+                         progress((base + cost * frac) / total, label), check, cache, key)
+        run.timings[label] = round(time.perf_counter() - t0, 3)
+        done += cost
+    progress(1.0, "Done")
+    return run
+
+
+# -------------------- Helpers --------------------
+def summary(run):
+    return {
+        "records": int(run.X.shape[0]),
+        "observables": len(run.columns),
+        "individuals": int(len(run.individual_ids)),
+        "traits": len(run.traits),
+        "explained_variance": float(np.sum(run.explained)),
+        "final_loss": run.loss_history[-1] if run.loss_history else None,
+        "epochs": len(run.loss_history),
+        "restart_losses": run.restart_losses,
+        "profiles": list(run.individuals),
+        "timings_s": run.timings,
+        "cached_stages": run.cached_stages,
+        "notes": run.notes,
+    }
+
+
+_issued_dirs = set()     # handed out by new_output_dir(), maybe not written yet
+
+
+def new_output_dir(kind="run"):
+    """Path of a new folder under OUTPUT_DIR, named after the time; the first write creates it."""
+    base = os.path.join(OUTPUT_DIR, f"{kind}-{time.strftime('%Y%m%d-%H%M%S')}")
+    for i in itertools.count():
+        path = base if i == 0 else f"{base}-{i}"
+        if path not in _issued_dirs and not os.path.exists(path):
+            _issued_dirs.add(path)
+            return path
+
+
+def safe_name(text):
+    """File-system safe version of an individual ID."""
+    return re.sub(r"[^\w.-]", "_", str(text)) or "_"
+
+
+def _preprocess_key(observables, columns, zscore):
+    """Cache key of a standardized selection; None for matrices without a dataset key."""
+    if observables.key is None:
+        return None
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{_PREPROCESS_VERSION}|{observables.key}|{int(zscore)}|".encode())
+    h.update("\x00".join(columns).encode())
+    return h.hexdigest()
+
+
+def _preprocess_path(key, suffix):
+    return os.path.join(DATA_CACHE_DIR, key + suffix)
+
+
+def _load_preprocessed(key):
+    """(X, center, scale) from the cache, memory-mapped read-only; None on a miss."""
+    if key is None:
+        return None
+    path, stats_path = _preprocess_path(key, ".pre.npy"), _preprocess_path(key, ".prestats.npy")
+    if not (os.path.exists(path) and os.path.exists(stats_path)):
+        return None
+    try:
+        X = np.load(path, mmap_mode="r")
+        center, scale = np.load(stats_path)
+    except Exception as e:
+        print(f"[WARN] Dropping unreadable preprocessing cache {path}: {e}")
+        _remove(path)
+        _remove(stats_path)
+        return None
+    os.utime(path)
+    os.utime(stats_path)
+    return X, center, scale
+
+
+def _store_preprocessed(key, X, tmp, center, scale):
+    """Publish a freshly written memmap under `key`; returns it re-opened read-only."""
+    path, stats_path = _preprocess_path(key, ".pre.npy"), _preprocess_path(key, ".prestats.npy")
+    with open(stats_path + ".tmp", "wb") as fh:
+        np.save(fh, np.stack([center, scale]))
+    os.replace(stats_path + ".tmp", stats_path)
+    X.flush()
+    del X
+    os.replace(tmp, path)       # the matrix last: it marks the entry complete
+    evict(keep=path)
+    return np.load(path, mmap_mode="r")
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _csv(header, labels, values):
+    frame = pd.DataFrame(np.asarray(values), columns=header[1:])
+    frame.insert(0, header[0], list(labels))
+    return frame.to_csv(index=False, float_format="%.6g")
@@ -0,0 +1,91 @@
+# row_filter.py
+
+import re
+import numpy as np
+import pandas as pd
+
+_CLAUSE = re.compile(r"^\s*(.+?)\s*(==|!=|>=|<=|>|<|~)\s*(.*?)\s*$")
+
+
+def row_mask(expression, columns, n_rows, default_column=None):
+    """
+    Boolean row mask for a preview filter expression.
+
+        age >= 30 & sex == F | site ~ lisbon
+
+    Clauses are `<column> <op> <value>` with ops == != > >= < <= and ~
+    (case-insensitive contains); `&` binds tighter than `|`. Text without
+    an operator is a contains-match on `default_column` (the ID column).
+    `columns` maps header -> array (NumPy or pandas array).
+    Raises ValueError with a user-facing message on a bad expression.
+    """
+    expression = expression.strip()
+    if not expression:
+        return None
+    result = np.zeros(n_rows, dtype=bool)
+    for alternative in expression.split("|"):
+        part = np.ones(n_rows, dtype=bool)
+        for clause in alternative.split("&"):
+            part &= _clause_mask(clause, columns, n_rows, default_column)
+        result |= part
+    return result
+
+
+def _clause_mask(clause, columns, n_rows, default_column):
+    m = _CLAUSE.match(clause)
+    if m is None or m.group(1) not in columns:
+        if default_column is None or not clause.strip():
+            raise ValueError(f"Cannot read filter clause '{clause.strip()}'")
+        return _compare(columns[default_column], "~", clause.strip())
+    name, op, value = m.groups()
+    return _compare(columns[name], op, value)
+
+
+def _compare(values, op, value):
+    if isinstance(values, np.ndarray) and values.dtype.kind in "biuf":
+        if op == "~":
+            raise ValueError("'~' only applies to text columns")
+        try:
+            target = float(value)
+        except ValueError:
+            raise ValueError(f"'{value}' is not a number") from None
+        with np.errstate(invalid="ignore"):
+            return _OPS[op](values, target)
+
+    value = value.strip("'\"")
+    if isinstance(values, pd.Categorical):
+        # evaluate on the (few) categories, then broadcast through the codes
+        cats = values.categories.astype(str)
+        hit = np.asarray(_text_op(np.asarray(cats, dtype=object), op, value), dtype=bool)
+        codes = values.codes
+        return np.where(codes >= 0, hit[codes], False)
+
+    text = np.asarray(values, dtype=object)
+    missing = np.asarray(pd.isna(values))
+    out = np.array(_text_op(text.astype(str), op, value), dtype=bool)
+    out[missing] = op == "!="
+    return out
+
+
+def _text_op(text, op, value):
+    if op == "~":
+        return pd.Series(text).str.contains(value, case=False, regex=False).to_numpy()
+    if op in ("==", "!="):
+        return _OPS[op](text, value)
+    try:
+        target = float(value)
+    except ValueError:
+        return _OPS[op](text, value)    # lexicographic
+    numeric = pd.to_numeric(pd.Series(text), errors="coerce").to_numpy()
+    with np.errstate(invalid="ignore"):
+        return _OPS[op](numeric, target)
+
+
+_OPS = {
+    "==": np.equal,
+    "!=": np.not_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+}
@@ -0,0 +1,165 @@
+# search_index.py
+
+import re
+import numpy as np
+
+from config import SEARCH_FUZZY_MIN_SHARED
+
+# letters / digits / camelCase humps: "QuesItem_017rev" -> ques, item, 017, rev
+_TOKEN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+|[^\W\d_]+")
+_TOP = "\U0010ffff"   # sorts after every character: [q, q + _TOP) is the prefix range
+
+# match tiers, best first
+EXACT, PREFIX, TOKEN, TOKEN_PREFIX, SUBSTRING, FUZZY = range(6)
+
+
+class NameIndex:
+    """
+    Ranked search over a fixed list of names (observables or individual IDs),
+    built once per load and queried on every keystroke.
+
+    - exact / prefix      -> binary search in the sorted lowercase names
+    - token / token prefix-> binary search in the sorted (token, owner) table
+    - substring           -> intersect trigram posting lists, then verify
+    - fuzzy               -> trigram overlap, only when nothing contains the term
+
+    Whitespace-separated terms must all match; results are ordered by
+    summed tier, then name length, then original position.
+    """
+    def __init__(self, names=()):
+        self.set_names(names)
+
+    def __len__(self):
+        return len(self._lower)
+
+    # ---- build ----
+    def set_names(self, names):
+        names = [str(n) for n in names]
+        lower = [n.lower() for n in names]
+        self._lower = np.array(lower, dtype=str)
+        self._lengths = np.fromiter((len(n) for n in lower), dtype=np.int64, count=len(lower))
+
+        self._sorted_ids = np.argsort(self._lower, kind="stable")
+        self._sorted = self._lower[self._sorted_ids]
+
+        owners, tokens = [], []
+        for i, name in enumerate(names):
+            for tok in _TOKEN.findall(name):
+                tokens.append(tok.lower())
+                owners.append(i)
+        tokens = np.array(tokens, dtype=str)
+        order = np.argsort(tokens, kind="stable")
+        self._tokens = tokens[order]
+        self._token_owner = np.asarray(owners, dtype=np.int64)[order]
+
+        self._build_trigrams(lower)
+
+    def _build_trigrams(self, lower):
+        """Posting lists as one sorted owner array sliced by gram code."""
+        empty = np.empty(0, dtype=np.int64)
+        self._gram_codes, self._gram_starts, self._gram_owner = empty, empty, empty
+        self._gram_count = np.zeros(len(lower), dtype=np.int64)
+        if not lower:
+            return
+        cps = _codepoints("\x00".join(lower) + "\x00")
+        owner = np.repeat(np.arange(len(lower)), self._lengths + 1)
+        codes = _trigram_codes(cps)
+        valid = (cps[:-2] != 0) & (cps[1:-1] != 0) & (cps[2:] != 0)
+        codes, owner = codes[valid], owner[:-2][valid]
+        if not len(codes):
+            return
+        order = np.lexsort((owner, codes))
+        codes, owner = codes[order], owner[order]
+        keep = np.ones(len(codes), dtype=bool)
+        keep[1:] = (codes[1:] != codes[:-1]) | (owner[1:] != owner[:-1])
+        codes, owner = codes[keep], owner[keep]
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        self._gram_codes = codes[starts]
+        self._gram_starts = np.r_[starts, len(codes)]
+        self._gram_owner = owner
+        self._gram_count = np.bincount(owner, minlength=len(lower))
+
+    # ---- query ----
+    def search(self, query):
+        """Name indexes matching `query`, best first (all names for an empty query)."""
+        terms = query.lower().split()
+        if not terms:
+            return np.arange(len(self._lower))
+        score = self._term(terms[0])
+        for term in terms[1:]:
+            score += self._term(term)      # inf (no match) stays inf
+        ids = np.flatnonzero(np.isfinite(score))
+        order = np.lexsort((ids, self._lengths[ids], score[ids]))
+        return ids[order]
+
+    def _term(self, q):
+        """Per-name score for one term: its best tier, inf where it does not match."""
+        score = np.full(len(self._lower), np.inf)
+        substring = self._substring(q)
+        if not len(substring):
+            # typo fallback; ranks below every real match, best overlap first
+            ids, shared = self._fuzzy(q)
+            score[ids] = FUZZY + (1.0 - shared)
+        score[substring] = SUBSTRING
+        # better tiers overwrite
+        score[self._token_owner[_range(self._tokens, q, prefix=True)]] = TOKEN_PREFIX
+        score[self._token_owner[_range(self._tokens, q, prefix=False)]] = TOKEN
+        score[self._sorted_ids[_range(self._sorted, q, prefix=True)]] = PREFIX
+        score[self._sorted_ids[_range(self._sorted, q, prefix=False)]] = EXACT
+        return score
+
+    def _postings(self, code):
+        i = np.searchsorted(self._gram_codes, code)
+        if i == len(self._gram_codes) or self._gram_codes[i] != code:
+            return self._gram_owner[:0]
+        return self._gram_owner[self._gram_starts[i]:self._gram_starts[i + 1]]
+
+    def _substring(self, q):
+        if len(q) < 3:
+            # too short for a trigram: one vectorized scan
+            return np.flatnonzero(np.char.find(self._lower, q) >= 0)
+        lists = sorted((self._postings(c) for c in np.unique(_trigram_codes(_codepoints(q)))), key=len)
+        cand = lists[0]
+        for other in lists[1:]:
+            if not len(cand):
+                break
+            # postings are sorted: probe the (small) candidates into the larger list
+            pos = np.minimum(np.searchsorted(other, cand), len(other) - 1)
+            cand = cand[other[pos] == cand]
+        if len(q) > 3 and len(cand):
+            cand = cand[np.char.find(self._lower[cand], q) >= 0]
+        return cand
+
+    def _fuzzy(self, q):
+        """Names holding enough of q's trigrams, with the fraction they hold."""
+        if len(q) < 3 or not len(self._gram_owner):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        grams = np.unique(_trigram_codes(_codepoints(q)))
+        shared = np.zeros(len(self._lower), dtype=np.int64)
+        for code in grams:
+            shared[self._postings(code)] += 1    # owners are unique per posting list
+        ids = np.flatnonzero(shared >= SEARCH_FUZZY_MIN_SHARED * len(grams))
+        return ids, shared[ids] / len(grams)
+
+
+def _range(sorted_values, q, prefix):
+    """Slice of a sorted array equal to q (or starting with q)."""
+    width = sorted_values.dtype.itemsize // 4
+    if len(q) > width:
+        # longer than every entry; also keeps searchsorted from upcasting the array
+        return slice(0, 0)
+    lo = np.searchsorted(sorted_values, q, side="left")
+    if prefix and len(q) < width:
+        return slice(lo, np.searchsorted(sorted_values, q + _TOP, side="left"))
+    return slice(lo, np.searchsorted(sorted_values, q, side="right"))
+
+
+def _codepoints(text):
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+
+def _trigram_codes(cps):
+    """One uint64 per position: three 21-bit code points packed together."""
+    if len(cps) < 3:
+        return np.empty(0, dtype=np.uint64)
+    return (cps[:-2] << np.uint64(42)) | (cps[1:-1] << np.uint64(21)) | cps[2:]
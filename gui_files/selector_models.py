@@ -0,0 +1,54 @@
+# selector_models.py
+
+import numpy as np
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+
+
+class NameListModel(QAbstractListModel):
+    """
+    List model showing a subset of a shared names array.
+    `rows` holds indexes into `names`; changing the subset swaps one array
+    instead of creating/destroying one item object per name.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._names = np.empty(0, dtype=object)
+        self._rows = np.empty(0, dtype=np.int64)
+        self._tooltip = None      # optional name -> str
+
+    def set_names(self, names, rows=None):
+        self.beginResetModel()
+        self._names = np.asarray(names, dtype=object)
+        self._rows = np.arange(len(self._names)) if rows is None else np.asarray(rows, dtype=np.int64)
+        self.endResetModel()
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = np.asarray(rows, dtype=np.int64)
+        self.endResetModel()
+
+    def rows(self):
+        return self._rows
+
+    def set_tooltip_provider(self, fn):
+        self._tooltip = fn
+        if len(self._rows):
+            self.dataChanged.emit(self.index(0), self.index(len(self._rows) - 1), [Qt.ToolTipRole])
+
+    def name_index(self, row):
+        """Index into the names array for a view row."""
+        return int(self._rows[row])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return str(self._names[self._rows[index.row()]])
+        if role == Qt.ToolTipRole and self._tooltip is not None:
+            return self._tooltip(str(self._names[self._rows[index.row()]]))
+        return None
+
@@ -0,0 +1,63 @@
+# stage_cache.py
+"""
+Content-addressed cache for pipeline stage outputs.
+
+Entries are pickled files under STAGE_CACHE_DIR, trimmed as an LRU (file
+mtime is the LRU timestamp, as in dataset_cache). Every run executes in a
+freshly spawned process (engine.PipelineJob), so there is no in-memory
+tier: it could never hit between runs. A hit unpickles a fresh copy that
+the caller may modify.
+"""
+
+import hashlib
+import os
+import pickle
+
+from config import STAGE_CACHE_DIR, STAGE_CACHE_MAX_BYTES
+from dataset_cache import evict, _remove
+
+_SUFFIX = ".stage.pkl"
+
+
+def stage_key(*parts):
+    """Stable key for the given inputs (str / numbers / bools / None and tuples or lists of them)."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(repr(parts).encode())
+    return h.hexdigest()
+
+
+class StageCache:
+    def __init__(self, directory=STAGE_CACHE_DIR, max_bytes=STAGE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def get(self, key):
+        """The value stored under `key`, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                blob = fh.read()
+            os.utime(path)
+        except OSError:
+            return None
+        try:
+            return pickle.loads(blob)
+        except Exception as e:
+            print(f"[WARN] Dropping unreadable stage cache entry {key}: {e}")
+            _remove(path)
+            return None
+
+    def put(self, key, value):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as fh:
+                pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            evict(self.max_bytes, keep=path, directory=self.directory, suffixes=(_SUFFIX,))
+        except OSError as e:
+            print(f"[WARN] Could not write stage cache entry {key}: {e}")
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + _SUFFIX)
@@ -0,0 +1,211 @@
+# sweep.py
+"""
+Parameter sweeps behind the "Sweep" button.
+
+Numeric Parameters-tab fields may hold a list ("0.01, 0.05, 0.1") or an
+inclusive range ("0.01:0.1:0.03"; "10:50:10"). The combinations form a
+grid, optionally randomly sampled. Every configuration is fitted on the
+same standardized matrix, with the missing fits spread over a process
+pool (engine.fit_parallel). Fits and scores go through the pipeline's
+stage cache, so extending a sweep only computes the new points. Results
+land in one comparison table.
+"""
+
+import itertools
+import os
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import PIPELINE_DEFAULTS, SWEEP_MAX_CONFIGS, SWEEP_RESULTS_PATH, TRAIT_SEED
+
+# fields that take lists / ranges (the toggles stay single-valued)
+SWEEPABLE = tuple(name for name, default in PIPELINE_DEFAULTS.items() if not isinstance(default, bool))
+
+
+def parse_values(text, kind):
+    """Values of one field: "a", "a, b, c", "start:stop:step" or "start:stop" (ints, step 1)."""
+    values = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if ":" not in part:
+            values.append(_convert(part, kind))
+            continue
+        bounds = [p.strip() for p in part.split(":")]
+        if len(bounds) == 2 and kind is int:
+            bounds.append("1")
+        if len(bounds) != 3:
+            raise ValueError(f"'{part}' is not a range (use start:stop:step)")
+        start, stop, step = (_convert(b, kind) for b in bounds)
+        if step <= 0 or stop < start:
+            raise ValueError(f"'{part}' is an empty range")
+        n = int(np.floor((stop - start) / step + 1e-9)) + 1
+        values.extend(kind(round(start + i * step, 12)) for i in range(n))
+    if not values:
+        raise ValueError("no value given")
+    return list(dict.fromkeys(values))     # drop duplicates, keep order
+
+
+def _convert(text, kind):
+    try:
+        return kind(text)
+    except ValueError:
+        raise ValueError(f"'{text}' is not {'a whole number' if kind is int else 'a number'}") from None
+
+
+def configurations(values, samples=0, seed=TRAIT_SEED):
+    """
+    Parameter dicts for every combination of `values` ({name: [values]}),
+    or a random sample of `samples` of them (0 = the whole grid).
+    """
+    names = list(values)
+    size = int(np.prod([len(values[name]) for name in names])) if names else 1
+    if samples and samples < size:
+        # sample grid positions without building the grid
+        picks = random.Random(seed).sample(range(size), samples)
+        combos = [_combo(values, names, i) for i in sorted(picks)]
+    elif size > SWEEP_MAX_CONFIGS:
+        raise ValueError(f"The sweep has {size:,} configurations; set Sweep samples "
+                         f"to at most {SWEEP_MAX_CONFIGS} to run a random subset.")
+    else:
+        combos = [dict(zip(names, combo)) for combo in itertools.product(*(values[n] for n in names))]
+    return combos
+
+
+def _combo(values, names, index):
+    combo = {}
+    for name in reversed(names):
+        index, i = divmod(index, len(values[name]))
+        combo[name] = values[name][i]
+    return {name: combo[name] for name in names}
+
+
+class SweepRun:
+    """
+    Inputs and results of one sweep. `configs` are full parameter dicts
+    (missing keys fall back to PIPELINE_DEFAULTS); output_dir defaults to a
+    new folder under OUTPUT_DIR. After run_sweep():
+
+    runs  -> one AnalysisRun per configuration (fitted and scored)
+    table -> DataFrame, one row per configuration, best explained variance first
+    """
+    def __init__(self, observables, columns=(), individuals=(), configs=(), reports=(), output_dir=None):
+        self.observables = observables
+        self.requested_columns = list(columns)
+        self.requested_individuals = list(individuals)
+        self.configs = [dict(c) for c in configs] or [{}]
+        self.reports = list(reports)
+        if output_dir is None:
+            from pipeline import new_output_dir
+            output_dir = new_output_dir("sweep")
+        self.output_dir = output_dir
+        self.notes = []
+        self.runs = []
+        self.table = None
+        self.outputs = {}
+
+    def inputs(self):
+        """Keyword arguments that rebuild this sweep around an ObservableMatrix."""
+        return {"columns": self.requested_columns, "individuals": self.requested_individuals,
+                "configs": self.configs, "reports": self.reports, "output_dir": self.output_dir}
+
+    def detach(self):
+        """Keep only the table and notes so the sweep can be pickled back to the GUI."""
+        self.observables = None
+        self.runs = []
+        return self
+
+
+def run_sweep(sweep, progress=None, is_cancelled=None, cache=None):
+    """
+    Fit and score every configuration of `sweep`; same callbacks as
+    pipeline.run_pipeline. Writes the table to SWEEP_RESULTS_PATH under output_dir.
+    """
+    from engine import fit_parallel
+    from pipeline import (
+        AnalysisRun, PipelineCancelled, prepare, standardize, fit_traits, score,
+        memo_key, restore_stage, store_stage, restart_seeds, keep_best_fit, stage_cache,
+    )
+
+    progress = progress or (lambda fraction, label: None)
+    cancelled = is_cancelled or (lambda: False)
+    cache = cache if cache is not None else stage_cache()
+
+    def check():
+        if cancelled():
+            raise PipelineCancelled()
+
+    def runs_for(config):
+        return AnalysisRun(sweep.observables, sweep.requested_columns, sweep.requested_individuals,
+                           config, sweep.reports, sweep.output_dir)
+
+    # shared inputs: selection and standardization are the same for every
+    # configuration unless the Z-score toggle differs (it cannot from the GUI)
+    t0 = time.perf_counter()
+    progress(0.0, "Preparing data")
+    base = runs_for(sweep.configs[0])
+    prepare(base, lambda f: None, check)
+    standardize(base, lambda f: progress(0.1 * f, "Standardizing"), check)
+
+    runs = []
+    for config in sweep.configs:
+        run = runs_for(config)
+        for name in ("columns", "individuals", "X", "X_path", "center", "scale"):
+            setattr(run, name, getattr(base, name))
+        run.notes = list(base.notes)
+        run.fit_key = memo_key(run, fit_traits)
+        run.reused = restore_stage(run, fit_traits, cache, run.fit_key)
+        runs.append(run)
+
+    # every missing fit (and each of its restarts) is one pool job
+    todo = [run for run in runs if not run.reused]
+    jobs = [(run.params, seed, None) for run in todo for seed in restart_seeds(run.params)]
+    if jobs:
+        fits = iter(fit_parallel(base.X, base.X_path, jobs,
+                                 lambda f: progress(0.1 + 0.8 * f, f"Fitting {len(todo)} configuration(s)"),
+                                 check))
+        for run in todo:
+            n_notes = len(run.notes)
+            keep_best_fit(run, [next(fits) for _ in restart_seeds(run.params)])
+            store_stage(run, fit_traits, cache, run.fit_key, run.notes[n_notes:])
+
+    rows = []
+    for i, run in enumerate(runs):
+        check()
+        progress(0.9 + 0.1 * i / len(runs), "Scoring configurations")
+        key = memo_key(run, score, run.fit_key)
+        if not restore_stage(run, score, cache, key):
+            n_notes = len(run.notes)
+            score(run, lambda f: None, check)
+            store_stage(run, score, cache, key, run.notes[n_notes:])
+        losses = np.asarray(run.restart_losses)
+        rows.append({
+            **{name: run.params[name] for name in SWEEPABLE},
+            "traits": len(run.traits),
+            "explained_variance": float(np.sum(run.explained)),
+            "reconstruction_error": float(losses.min()),
+            "restart_spread": float(losses.max() - losses.min()),
+            "epochs": len(run.loss_history),
+            "reused": run.reused,
+        })
+
+    sweep.runs = runs
+    sweep.table = (pd.DataFrame(rows)
+                   .sort_values("explained_variance", ascending=False, kind="stable")
+                   .reset_index(drop=True))
+    reused = sum(run.reused for run in runs)
+    sweep.notes.append(f"{len(runs)} configuration(s) in {time.perf_counter() - t0:.1f} s; "
+                       f"{reused} reused from earlier runs.")
+
+    os.makedirs(sweep.output_dir, exist_ok=True)
+    path = os.path.join(sweep.output_dir, SWEEP_RESULTS_PATH)
+    tmp = path + ".tmp"
+    sweep.table.to_csv(tmp, index=False, float_format="%.6g")
+    os.replace(tmp, path)
+    sweep.outputs["table"] = os.path.abspath(path)
+    progress(1.0, "Done")
+    return sweep
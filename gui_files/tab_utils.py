@@ -1,6 +1,6 @@
 import numpy as np
 from PyQt5.QtWidgets import (
-    QMenu, QAction, QDialog, QVBoxLayout, QMessageBox, QTableView
+    QMenu, QAction, QDialog, QVBoxLayout, QMessageBox, QTableView, QLabel
 )
 from PyQt5.QtCore import Qt, QPoint
 
@@ -12,8 +12,10 @@ class DistributionDialog(QDialog):
     """
     Dialog showing a histogram for a given column,
     with mean and std written inside the figure.
+    If `summary` (ColumnStats.summary) is given, its precomputed histogram
+    sketch and moments are drawn and `values` may be None.
     """
-    def __init__(self, column_name, values, parent=None):
+    def __init__(self, column_name, values, parent=None, summary=None):
         super().__init__(parent)
         self.setWindowTitle(f"Distribution – {column_name}")
         self.resize(500, 400)
@@ -27,9 +29,14 @@ class DistributionDialog(QDialog):
         ax = fig.add_subplot(111)
 
 # --- manual histogram, normalized so sum = 1 ---
-        counts, bin_edges = np.histogram(values, bins="auto")
-        probs = counts / len(values)                  # sum(probs) == 1
+        if summary is not None:
+            counts, bin_edges = summary["hist_counts"], summary["hist_edges"]
+        else:
+            counts, bin_edges = np.histogram(values, bins="auto")
+        probs = counts / max(1, counts.sum())         # sum(probs) == 1
         bin_widths = np.diff(bin_edges)
+        if not np.any(bin_widths > 0):                 # constant column
+            bin_widths = np.ones_like(bin_widths)
 
         ax.bar(
             bin_edges[:-1],
@@ -47,8 +54,11 @@ class DistributionDialog(QDialog):
         ax.spines['top'].set_visible(False)
         ax.spines['right'].set_visible(False)
 
-        mean = float(np.mean(values))
-        std = float(np.std(values))
+        if summary is not None:
+            mean, std = summary["mean"], summary["std"]
+        else:
+            mean = float(np.mean(values))
+            std = float(np.std(values))
 
  
 
@@ -65,9 +75,37 @@ class DistributionDialog(QDialog):
         canvas.draw()
         self.dataframe = None
 
+class SweepResultsDialog(QDialog):
+    """Comparison table of a finished sweep (sweep.SweepRun), sortable by any column."""
+    def __init__(self, sweep, parent=None):
+        super().__init__(parent)
+        from table_model import DataFrameModel
+
+        self.setWindowTitle(f"Sweep – {len(sweep.table)} configurations")
+        self.resize(900, 500)
+        layout = QVBoxLayout(self)
+
+        notes = list(sweep.notes)
+        if "table" in sweep.outputs:
+            notes.append(f"Saved to {sweep.outputs['table']}")
+        info = QLabel("\n".join(notes))
+        info.setWordWrap(True)
+        layout.addWidget(info)
+
+        self.model = DataFrameModel(self)
+        self.model.set_dataframe(sweep.table)
+        view = QTableView()
+        view.setModel(self.model)
+        view.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        view.setSortingEnabled(True)
+        layout.addWidget(view)
+
+
 def enable_column_distribution_menu(table_widget,
                                     get_dataframe_callable,
-                                    get_view_callable=None):
+                                    get_view_callable=None,
+                                    get_observables_callable=None,
+                                    get_stats_callable=None):
     """
     Attach a right-click 'Show distribution' option.
 
@@ -80,6 +118,12 @@ def enable_column_distribution_menu(table_widget,
     get_view_callable : () -> QTableView, optional
         Returns the inner QTableView/QTableWidget.
         If None, this function will try to find it automatically.
+    get_observables_callable : () -> ObservableMatrix, optional
+        Returns the shared float32 matrix; numeric columns are read
+        from it instead of being re-sliced from the dataframe.
+    get_stats_callable : () -> ColumnStats, optional
+        Returns the precomputed column statistics; when the column is in
+        it, the dialog opens without touching the data at all.
     """
 
     # --- Resolve the real QTableView/QTableWidget -------------------------
@@ -126,10 +170,27 @@ def enable_column_distribution_menu(table_widget,
         )
 
         def show_distribution():
-            series = df[column_name].dropna()
-            try:
-                numeric = series.astype(float)
-            except Exception:
+            stats = get_stats_callable() if get_stats_callable else None
+            summary = stats.summary(str(column_name)) if stats is not None else None
+            if summary is not None and summary["count"] > 0:
+                DistributionDialog(column_name, None, parent=view, summary=summary).exec_()
+                return
+
+            observables = (
+                get_observables_callable() if get_observables_callable else None
+            )
+            shared = (
+                observables.column(str(column_name)) if observables is not None else None
+            )
+            if shared is not None:
+                values = shared[~np.isnan(shared)]
+            else:
+                series = df[column_name].dropna()
+                try:
+                    values = series.astype(float).values
+                except Exception:
+                    values = None
+            if values is None or values.size == 0:
                 QMessageBox.information(
                     view,
                     "Non-numeric column",
@@ -139,7 +200,7 @@ def enable_column_distribution_menu(table_widget,
 
             dialog = DistributionDialog(
                 column_name,
-                numeric.values,
+                values,
                 parent=view,
             )
             dialog.exec_()
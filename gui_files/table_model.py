@@ -0,0 +1,285 @@
+# table_model.py
+
+from bisect import bisect_right
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from config import DATA_TABLE_FORMAT_BLOCK_ROWS, DATA_TABLE_FORMAT_CACHE_BLOCKS
+from formatting import column_format_rule, format_block
+
+
+class DataFrameModel(QAbstractTableModel):
+    """
+    Read-only Qt model over a DataFrame's column arrays.
+    Nothing is materialised per cell: data() formats a value only when
+    the view asks for it, i.e. for the rows currently on screen.
+
+    Rows live in one or more segments (one per streamed batch while a file
+    is loading, a single one afterwards). Display strings are rendered a
+    block of rows at a time per column and kept in a bounded LRU cache.
+
+    Sorting and filtering never copy data: view rows map to source rows
+    through `_order`, built from a cached per-column argsort and a NumPy
+    row mask. Only a loaded (non-streaming) frame can be sorted/filtered.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._segments = []   # list of per-column array lists
+        self._starts = []     # first row of each segment
+        self._headers = []
+        self._n_rows = 0
+        self._streaming = False
+        self._stats = None    # ColumnStats for header tooltips
+        self._rules = {}      # (segment, col) -> format rule
+        self._blocks = OrderedDict()   # (segment, col, block) -> display strings
+        self._argsorts = {}   # col -> (ascending permutation, number of non-missing)
+        self._sort = (-1, Qt.AscendingOrder)
+        self._mask = None     # bool per source row, None = no filter
+        self._order = None    # view row -> source row, None = identity
+
+    # ---- loading ----
+    def set_dataframe(self, df, observables=None):
+        """
+        Numeric observables are read from the shared ObservableMatrix when
+        given and its float32 copy holds exactly the frame's values, so the
+        preview holds no column data of its own for them. Other columns
+        (e.g. IDs above 2**24, many-digit floats) keep the frame's values
+        for display and filtering.
+        """
+        self.beginResetModel()
+        self._streaming = False
+        self._stats = None
+        self._invalidate_display()
+        self._reset_view_order()
+        if df is None:
+            self._segments, self._starts, self._headers, self._n_rows = [], [], [], 0
+        else:
+            self._headers = df.columns.astype(str).tolist()
+            columns = []
+            for j, name in enumerate(self._headers):
+                shared = observables.column(name) if observables is not None else None
+                if shared is None or not _same_values(shared, df.iloc[:, j]):
+                    shared = _column_array(df.iloc[:, j])
+                columns.append(shared)
+            self._segments, self._starts, self._n_rows = [columns], [0], len(df)
+        self.endResetModel()
+
+    def set_column_stats(self, stats):
+        self._stats = stats
+        if self._headers:
+            self.headerDataChanged.emit(Qt.Horizontal, 0, len(self._headers) - 1)
+
+    def begin_stream(self):
+        """Start a new streamed load: drop every segment and header of the previous frame."""
+        self.beginResetModel()
+        self._streaming = False     # the first batch of the new stream resets again
+        self._stats = None
+        self._invalidate_display()
+        self._reset_view_order()
+        self._segments, self._starts, self._headers, self._n_rows = [], [], [], 0
+        self.endResetModel()
+
+    def append_batch(self, batch):
+        """
+        Append rows while a file is still being read (after begin_stream()).
+        The first batch resets the model; later ones are inserted without
+        touching existing rows.
+        """
+        cols = [_column_array(batch.iloc[:, j]) for j in range(batch.shape[1])]
+        if not self._streaming:
+            self.beginResetModel()
+            self._streaming = True
+            self._invalidate_display()
+            self._reset_view_order()
+            self._headers = batch.columns.astype(str).tolist()
+            self._segments, self._starts, self._n_rows = [cols], [0], len(batch)
+            self.endResetModel()
+            return
+        if not len(batch):
+            return
+        self.beginInsertRows(QModelIndex(), self._n_rows, self._n_rows + len(batch) - 1)
+        self._segments.append(cols)
+        self._starts.append(self._n_rows)
+        self._n_rows += len(batch)
+        self.endInsertRows()
+
+    # ---- sorting / filtering ----
+    def _reset_view_order(self):
+        self._argsorts.clear()
+        self._sort = (-1, Qt.AscendingOrder)
+        self._mask = None
+        self._order = None
+
+    def column_arrays(self):
+        """{header: array} of the loaded frame (empty while streaming); read_dataset makes headers unique."""
+        if self._streaming or not self._segments:
+            return {}
+        return dict(zip(self._headers, self._segments[0]))
+
+    def source_row_count(self):
+        """Rows in the underlying data, ignoring any filter."""
+        return self._n_rows
+
+    def _argsort(self, col):
+        cached = self._argsorts.get(col)
+        if cached is None:
+            values = self._segments[0][col]
+            if isinstance(values, np.ndarray):
+                perm = np.argsort(values, kind="stable")   # NaN sorts last
+                n_valid = int(np.count_nonzero(~np.isnan(values))) if values.dtype.kind == "f" else len(values)
+            else:
+                perm = values.argsort(kind="stable", na_position="last")
+                n_valid = len(values) - int(np.asarray(pd.isna(values)).sum())
+            cached = self._argsorts[col] = (perm, n_valid)
+        return cached
+
+    def _compute_order(self):
+        col, order = self._sort
+        if col < 0:
+            perm = None
+        else:
+            perm, n_valid = self._argsort(col)
+            if order == Qt.DescendingOrder:
+                # reverse the valid part, keep missing values at the bottom
+                perm = np.concatenate([perm[:n_valid][::-1], perm[n_valid:]])
+        if self._mask is None:
+            return perm
+        if perm is None:
+            return np.flatnonzero(self._mask)
+        return perm[self._mask[perm]]
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if self._streaming or not self._segments or column >= len(self._headers):
+            return
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_sources = [self._source_row(ix.row()) for ix in old_indexes]
+
+        self._sort = (column, order)
+        self._order = self._compute_order()
+        self._drop_view_blocks()
+
+        if old_indexes:
+            inverse = self._inverse_order()
+            new_indexes = [
+                self.index(int(inverse[src]), ix.column()) if inverse[src] >= 0 else QModelIndex()
+                for ix, src in zip(old_indexes, old_sources)
+            ]
+            self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def set_row_mask(self, mask):
+        """Show only rows where `mask` is True (None clears the filter)."""
+        if self._streaming or not self._segments:
+            return
+        self.beginResetModel()
+        self._mask = mask
+        self._order = self._compute_order()
+        self._drop_view_blocks()
+        self.endResetModel()
+
+    def _source_row(self, row):
+        return row if self._order is None else int(self._order[row])
+
+    def _inverse_order(self):
+        inverse = np.full(self._n_rows, -1, dtype=np.int64)
+        if self._order is None:
+            inverse[:] = np.arange(self._n_rows)
+        else:
+            inverse[self._order] = np.arange(len(self._order))
+        return inverse
+
+    def _drop_view_blocks(self):
+        for key in [k for k in self._blocks if k[0] == "view"]:
+            del self._blocks[key]
+
+    # ---- display cache ----
+    def _invalidate_display(self):
+        self._rules.clear()
+        self._blocks.clear()
+
+    def _display(self, row, col):
+        if self._order is not None:
+            return self._display_ordered(row, col)
+        seg = bisect_right(self._starts, row) - 1 if len(self._starts) > 1 else 0
+        local = row - self._starts[seg]
+        block = local // DATA_TABLE_FORMAT_BLOCK_ROWS
+        key = (seg, col, block)
+        strings = self._blocks.get(key)
+        if strings is None:
+            values = self._segments[seg][col]
+            rule = self._rules.get((seg, col))
+            if rule is None:
+                rule = self._rules[(seg, col)] = column_format_rule(values)
+            lo = block * DATA_TABLE_FORMAT_BLOCK_ROWS
+            strings = format_block(values[lo:lo + DATA_TABLE_FORMAT_BLOCK_ROWS], rule)
+            self._blocks[key] = strings
+            if len(self._blocks) > DATA_TABLE_FORMAT_CACHE_BLOCKS:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(key)
+        return strings[local % DATA_TABLE_FORMAT_BLOCK_ROWS]
+
+    def _display_ordered(self, row, col):
+        """Sorted/filtered view: a block is a run of view rows, gathered by index."""
+        block = row // DATA_TABLE_FORMAT_BLOCK_ROWS
+        key = ("view", col, block)
+        strings = self._blocks.get(key)
+        if strings is None:
+            values = self._segments[0][col]
+            rule = self._rules.get((0, col))
+            if rule is None:
+                rule = self._rules[(0, col)] = column_format_rule(values)
+            lo = block * DATA_TABLE_FORMAT_BLOCK_ROWS
+            rows = self._order[lo:lo + DATA_TABLE_FORMAT_BLOCK_ROWS]
+            strings = format_block(values[rows], rule)
+            self._blocks[key] = strings
+            if len(self._blocks) > DATA_TABLE_FORMAT_CACHE_BLOCKS:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(key)
+        return strings[row % DATA_TABLE_FORMAT_BLOCK_ROWS]
+
+    # ---- Qt model API ----
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._n_rows if self._order is None else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return self._display(index.row(), index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.ToolTipRole and orientation == Qt.Horizontal:
+            if self._stats is None or section >= len(self._headers):
+                return None
+            return self._stats.tooltip(self._headers[section])
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self._headers[section] if section < len(self._headers) else None
+        return str(self._source_row(section) + 1)
+
+
+def _same_values(values, series):
+    """True when `values` (float32) equal the series' values exactly, NaN matching missing."""
+    try:
+        exact = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    except (TypeError, ValueError):
+        return False
+    return np.array_equal(values, exact, equal_nan=True)
+
+
+def _column_array(series):
+    """Zero-copy NumPy view for plain numeric columns, the pandas array otherwise."""
+    if series.dtype.kind in "biuf":
+        return series.to_numpy(copy=False)
+    return series.array
@@ -3,20 +3,26 @@
 
 import os
 import shutil
+import numpy as np
 from tab_utils import enable_column_distribution_menu
+from table_model import DataFrameModel
+from row_filter import row_mask
+from column_select import column_mask
+from selector_models import NameListModel
+from search_index import NameIndex
 from pages import trait_latent_page, bp_profile_page
 from pages import traits_ecosystem_analysis_page, group_analysis_page
 
-from PyQt5.QtCore import Qt, QStandardPaths
+from PyQt5.QtCore import Qt, QStandardPaths, QTimer
 from PyQt5.QtGui import QColor, QPalette
 from PyQt5.QtWidgets import (
     QTabWidget, QWidget,
     QHBoxLayout, QVBoxLayout, QGridLayout,   # <-- add QGridLayout here
     QFrame, QLabel, QSizePolicy, QSpacerItem, QPushButton,
-    QTableWidget, QTableWidgetItem,
+    QTableView, QHeaderView,
     QFormLayout, QLineEdit, QTextEdit,
     QDialog, QScrollArea, QMessageBox,
-    QListWidget, QListWidgetItem, QComboBox,
+    QListView, QComboBox,
     QRadioButton, QButtonGroup, QCheckBox,
 )
 
@@ -32,10 +38,10 @@ from config import (
     TAB_MIN_WIDTH, TABBAR_LEFT_OFFSET, TABBAR_TOP_OFFSET,
     PANE_MARGIN_TOP, TAB_INACTIVE, ORELHA_ACTIVE_TEXT_COLOR,
     DATA_BG, PARAM_BG, INFO_BG, RESULTS_BG,
-    DATA_TABLE_MAX_ROWS, DATA_TABLE_STRETCH, DATA_TITLE_STRETCH,
+    DATA_TABLE_STRETCH, FILTER_DEBOUNCE_MS, SELECTOR_SEARCH_DEBOUNCE_MS, DATA_TITLE_STRETCH,
     DATA_BOTTOM_SPACER_STR, DATA_PAGE_MARGINS, DATA_PAGE_SPACING,
     TEXT_COLOR,
-    RESULT_WIN_WIDTH, RESULT_WIN_HEIGHT,
+    RESULTS_DIR, RESULT_WIN_WIDTH, RESULT_WIN_HEIGHT,
     RESULT_HEADER_BG, RESULT_HEADER_FG, RESULT_HEADER_HEIGHT,
     RESULT_HEADER_FONT_FAM, RESULT_HEADER_SIZE_PT, RESULT_HEADER_WEIGHT,
     RESULT_SCROLL_BG, RESULT_SCROLL_MARGINS, RESULT_SCROLL_SPACING,
@@ -45,89 +51,181 @@ from config import (
 )
 
 # -------------------- Helper widgets (selectors) --------------------
-class ColumnSelector(QWidget):
-    """Left/Right selector with search and 'Select All'."""
-    def __init__(self, parent=None):
+class _ListSelector(QWidget):
+    """
+    Shared left/right layout: debounced search over an 'available' list,
+    add/remove buttons and a 'selected' list. Both lists are QListViews
+    over NameListModels indexing one names array, so a search swaps in the
+    ranked index array from NameIndex instead of rebuilding widget items.
+    """
+    def __init__(self, search_hint, selected_title, parent=None):
         super().__init__(parent)
         row = QHBoxLayout(self)
 
         # Left: search + available list
         left = QVBoxLayout()
         self.search = QLineEdit()
-        self.search.setPlaceholderText("Search observables...")
-        self.search.textChanged.connect(self._filter)
-        self.available = QListWidget()
-        self.available.setSelectionMode(QListWidget.SingleSelection)
-        btn_all = QPushButton("Select All")
-        btn_all.clicked.connect(self._select_all)
+        self.search.setPlaceholderText(search_hint)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SELECTOR_SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._filter)
+        self.search.textChanged.connect(self._search_timer.start)
+        self._available_model = NameListModel(self)
+        self.available = QListView()
+        self.available.setModel(self._available_model)
+        self.available.setUniformItemSizes(True)
+        self.available.setSelectionMode(QListView.SingleSelection)
+        self.btn_all = QPushButton("Select All")
+        self.btn_all.clicked.connect(self._select_all)
         left.addWidget(self.search)
         left.addWidget(self.available)
-        left.addWidget(btn_all)
+        left.addWidget(self.btn_all)
+        self._left = left
 
         # Middle: add/remove
         mid = QVBoxLayout()
         mid.setAlignment(Qt.AlignCenter)
-        btn_add = QPushButton("→"); btn_add.clicked.connect(self._move_to_selected)
-        btn_rem = QPushButton("←"); btn_rem.clicked.connect(self._remove_from_selected)
+        btn_add = QPushButton("→"); btn_add.clicked.connect(self._add_current)
+        btn_rem = QPushButton("←"); btn_rem.clicked.connect(self._remove_selected)
         mid.addWidget(QLabel("Add/Remove"))
         mid.addWidget(btn_add)
         mid.addWidget(btn_rem)
 
         # Right: selected
         right = QVBoxLayout()
-        self.selected = QListWidget()
-        self.selected.setSelectionMode(QListWidget.ExtendedSelection)
-        right.addWidget(QLabel("Selected Observables"))
+        self._selected_model = NameListModel(self)
+        self.selected = QListView()
+        self.selected.setModel(self._selected_model)
+        self.selected.setUniformItemSizes(True)
+        self.selected.setSelectionMode(QListView.ExtendedSelection)
+        self.selected_label = QLabel(selected_title)
+        right.addWidget(self.selected_label)
         right.addWidget(self.selected)
 
         row.addLayout(left)
         row.addLayout(mid)
         row.addLayout(right)
 
-        self._all_cols = []
-        self._filtered = []
-
-    def load_columns(self, cols):
-        self._all_cols = list(cols)
-        self._filtered = list(cols)
-        self._refresh_available()
-
-    def _refresh_available(self):
-        self.available.clear()
-        for c in self._filtered:
-            self.available.addItem(QListWidgetItem(c))
-
+        self._names = []
+        self._chosen = np.zeros(0, dtype=bool)
+        self._name_index = NameIndex()
+
+    # ---- loading ----
+    def _load(self, names):
+        self._search_timer.stop()
+        self._names = [str(n) for n in names]
+        self._chosen = np.zeros(len(self._names), dtype=bool)
+        self._name_index.set_names(self._names)
+        self._available_model.set_names(self._names)
+        self._selected_model.set_names(self._names, rows=[])
+        if self.search.text():
+            self._filter()
+
+    # ---- search ----
     def _filter(self):
-        t = self.search.text().lower()
-        self._filtered = [c for c in self._all_cols if t in c.lower()]
-        self._refresh_available()
+        self._search_timer.stop()
+        self._available_model.set_rows(self._name_index.search(self.search.text()))
+
+    # ---- selection ----
+    # Selection state is `_chosen` (bool per name) plus the selected model's
+    # rows (insertion order); the right-hand list is just a view of it.
+    def _can_add(self, n_new):
+        """How many of n_new names may still be added (subclasses cap this)."""
+        return n_new
+
+    def _append(self, idx):
+        idx = np.asarray(idx, dtype=np.int64)
+        new = idx[~self._chosen[idx]]
+        if len(new) > 1:
+            _, first = np.unique(new, return_index=True)
+            new = new[np.sort(first)]
+        new = new[:self._can_add(len(new))]
+        if len(new):
+            self._chosen[new] = True
+            self._selected_model.set_rows(np.concatenate([self._selected_model.rows(), new]))
+
+    def _add_current(self):
+        ix = self.available.currentIndex()
+        if ix.isValid():
+            self._append([self._available_model.name_index(ix.row())])
 
-    def _move_to_selected(self):
-        it = self.available.currentItem()
-        if it and not self.selected.findItems(it.text(), Qt.MatchExactly):
-            self.selected.addItem(QListWidgetItem(it.text()))
-
-    def _remove_from_selected(self):
-        for it in self.selected.selectedItems():
-            self.selected.takeItem(self.selected.row(it))
+    def _remove_selected(self):
+        ranges = self.selected.selectionModel().selection()
+        if ranges.isEmpty():
+            return
+        rows = self._selected_model.rows()
+        keep = np.ones(len(rows), dtype=bool)
+        for r in ranges:    # contiguous runs, not one index per row
+            keep[r.top():r.bottom() + 1] = False
+        self._chosen[rows[~keep]] = False
+        self._selected_model.set_rows(rows[keep])
 
     def _select_all(self):
-        for c in self._all_cols:
-            if not self.selected.findItems(c, Qt.MatchExactly):
-                self.selected.addItem(QListWidgetItem(c))
+        self._append(np.arange(len(self._names)))
 
     def get_selected(self):
-        return [self.selected.item(i).text() for i in range(self.selected.count())]
+        return [self._names[i] for i in self._selected_model.rows()]
 
     def reset(self):
         """Clear all state when a new dataset is loaded."""
+        self._search_timer.stop()
+        self.search.blockSignals(True)
         self.search.clear()
-        self.available.clear()
-        self.selected.clear()
-        self._all_cols = []
-        self._filtered = []
+        self.search.blockSignals(False)
+        self._load([])
+
+
+class ColumnSelector(_ListSelector):
+    """Left/Right selector with search, 'Select All' and bulk pattern selection."""
+    def __init__(self, parent=None):
+        super().__init__("Search observables...", "Selected Observables", parent)
+        self._stats = None
+
+        bulk = QHBoxLayout()
+        self.pattern = QLineEdit()
+        self.pattern.setPlaceholderText("Bulk select…  e.g.  ques_item_* & missing < 5%")
+        self.pattern.setClearButtonEnabled(True)
+        self.pattern.returnPressed.connect(self._add_matching)
+        btn_match = QPushButton("Add matching")
+        btn_match.clicked.connect(self._add_matching)
+        bulk.addWidget(self.pattern)
+        bulk.addWidget(btn_match)
+        self._left.insertLayout(1, bulk)
+
+    def load_columns(self, cols):
+        self._load(cols)
+
+    def set_column_stats(self, stats):
+        self._stats = stats
+        self._available_model.set_tooltip_provider(stats.tooltip if stats is not None else None)
+        self._selected_model.set_tooltip_provider(stats.tooltip if stats is not None else None)
+
+    def _add_matching(self):
+        """Select every column matching the bulk expression (see column_select)."""
+        try:
+            mask = column_mask(self.pattern.text(), self._names, self._stats)
+        except ValueError as e:
+            self._show_pattern_error(str(e))
+            return
+        self._show_pattern_error(None)
+        before = len(self._selected_model.rows())
+        self._append(np.flatnonzero(mask))
+        added = len(self._selected_model.rows()) - before
+        self.pattern.setToolTip(f"{int(mask.sum()):,} matched · {added:,} added")
+
+    def _show_pattern_error(self, message):
+        self.pattern.setToolTip(message or "")
+        self.pattern.setStyleSheet("QLineEdit { border: 1px solid #D93025; }" if message else "")
+
+    def reset(self):
+        super().reset()
+        self.pattern.clear()
+        self._show_pattern_error(None)
+        self.set_column_stats(None)
+
 
-class IndividualSelector(QWidget):
+class IndividualSelector(_ListSelector):
     """
     Same layout pattern as ColumnSelector, but:
     - Filters Individuals (rows) with search
@@ -135,98 +233,18 @@ class IndividualSelector(QWidget):
     - Selected list is the vertical box on the RIGHT
     """
     def __init__(self, max_select=3, parent=None):
-        super().__init__(parent)
         self.max_select = max_select
-
-        row = QHBoxLayout(self)
-
-        # Left: search + available individuals
-        left = QVBoxLayout()
-        self.search = QLineEdit()
-        self.search.setPlaceholderText("Search individuals...")
-        self.search.textChanged.connect(self._filter)
-
-        self.available = QListWidget()
-        self.available.setSelectionMode(QListWidget.SingleSelection)
-        btn_all = QPushButton("Select All")
-        btn_all.clicked.connect(self._select_all_capped)
-        left.addWidget(self.search)
-        left.addWidget(self.available)
-        # left.addWidget(btn_all)  # still optional
-
-        # Middle: add/remove
-        mid = QVBoxLayout()
-        mid.setAlignment(Qt.AlignCenter)
-        btn_add = QPushButton("→"); btn_add.clicked.connect(self._add_one)
-        btn_rem = QPushButton("←"); btn_rem.clicked.connect(self._remove_selected)
-        mid.addWidget(QLabel("Add/Remove"))
-        mid.addWidget(btn_add)
-        mid.addWidget(btn_rem)
-
-        # Right: selected (vertical list)
-        right = QVBoxLayout()
-        self.selected = QListWidget()
-        self.selected.setSelectionMode(QListWidget.ExtendedSelection)
-        right.addWidget(QLabel(f"Selected (max {self.max_select})"))
-        right.addWidget(self.selected)
-
-        row.addLayout(left)
-        row.addLayout(mid)
-        row.addLayout(right)
-
-        self._all_people = []
-        self._filtered = []
+        super().__init__("Search individuals...", f"Selected (max {max_select})", parent)
+        self.btn_all.setVisible(False)  # still optional
 
     def load_items(self, people_list):
-        self._all_people = list(people_list)
-        self._filtered = list(people_list)
-        self._refresh_available()
+        self._load(people_list)
 
-    def _refresh_available(self):
-        self.available.clear()
-        for p in self._filtered:
-            self.available.addItem(QListWidgetItem(str(p)))
-
-    def _filter(self):
-        # fixed to use QLineEdit API
-        t = self.search.text().lower()
-        self._filtered = [p for p in self._all_people if t in str(p).lower()]
-        self._refresh_available()
-
-    def _add_one(self):
-        it = self.available.currentItem()
-        if not it:
-            return
-        if self.selected.count() >= self.max_select:
-            return  # hard cap
-        if not self.selected.findItems(it.text(), Qt.MatchExactly):
-            self.selected.addItem(QListWidgetItem(it.text()))
-
-    def _remove_selected(self):
-        for it in self.selected.selectedItems():
-            self.selected.takeItem(self.selected.row(it))
+    def _can_add(self, n_new):
+        return max(0, min(n_new, self.max_select - len(self._selected_model.rows())))
 
     def _select_all_capped(self):
-        already = set(self.get_selected())
-        for p in self._all_people:
-            if len(self.get_selected()) >= self.max_select:
-                break
-            if p not in already:
-                self.selected.addItem(QListWidgetItem(str(p)))
-                already.add(p)
-
-    def get_selected(self):
-        return [self.selected.item(i).text() for i in range(self.selected.count())]
-
-
-    def reset(self):
-        """Clear all state when a new dataset is loaded."""
-        self.search.clear()
-        self.available.clear()
-        self.selected.clear()
-        self._all_people = []
-        self._filtered = []
-
+        self._select_all()
 
 
 # ------------------------------------------------------------------------------
@@ -241,8 +259,31 @@ class DataTable(QWidget):
         super().__init__()
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(0)
-        self.table = QTableWidget()
+        layout.setSpacing(6)
+        self.dataframe = None
+        self.observables = None
+        self.column_stats = None
+
+        # Row filter bar (evaluated as NumPy masks by row_filter.row_mask)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter rows…  e.g.  age >= 30 & sex == F")
+        self.filter_edit.setClearButtonEnabled(True)
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self._apply_filter)
+        self.filter_edit.textChanged.connect(self._filter_timer.start)
+        self.filter_edit.returnPressed.connect(self._apply_filter)
+        layout.addWidget(self.filter_edit)
+
+        self.model = DataFrameModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        # Uniform row heights keep scrolling constant-time on huge frames
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        # Click-to-sort; start unsorted (file order)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
         sp = self.table.sizePolicy()
         sp.setHorizontalPolicy(QSizePolicy.Expanding)
         sp.setVerticalPolicy(QSizePolicy.Preferred)
@@ -251,7 +292,7 @@ class DataTable(QWidget):
 
         # Jamovi-like table styling
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 font-family: 'Segoe UI Variable', 'Segoe UI', Arial, sans-serif;
                 font-size: 11pt;
                 color: #202124;
@@ -268,17 +309,48 @@ class DataTable(QWidget):
             }
         """)
 
-    def display_dataframe(self, df):
-
+    def display_dataframe(self, df, observables=None):
         self.dataframe = df
-        self.table.clear()
-        rows = min(DATA_TABLE_MAX_ROWS, len(df))
-        self.table.setRowCount(rows)
-        self.table.setColumnCount(len(df.columns))
-        self.table.setHorizontalHeaderLabels(df.columns.astype(str).tolist())
-        for i in range(rows):
-            for j, val in enumerate(df.iloc[i]):
-                self.table.setItem(i, j, QTableWidgetItem(str(val)))
+        self.observables = observables
+        self.column_stats = None
+        self.model.set_dataframe(df, observables)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.filter_edit.blockSignals(True)
+        self.filter_edit.clear()
+        self.filter_edit.blockSignals(False)
+        self._show_filter_error(None)
+
+    def _apply_filter(self):
+        self._filter_timer.stop()
+        columns = self.model.column_arrays()
+        if not columns:
+            return
+        headers = list(columns)
+        try:
+            mask = row_mask(self.filter_edit.text(), columns,
+                            self.model.source_row_count(), default_column=headers[0])
+        except ValueError as e:
+            self._show_filter_error(str(e))
+            return
+        self._show_filter_error(None)
+        self.model.set_row_mask(mask)
+
+    def _show_filter_error(self, message):
+        self.filter_edit.setToolTip(message or "")
+        self.filter_edit.setStyleSheet("QLineEdit { border: 1px solid #D93025; }" if message else "")
+
+    def set_column_stats(self, stats):
+        self.column_stats = stats
+        self.model.set_column_stats(stats)
+
+    def begin_stream(self):
+        """Clear the preview for a file that starts loading."""
+        self.model.begin_stream()
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+
+    def append_batch(self, batch):
+        """Show rows of a file that is still loading (replaced on completion)."""
+        self.model.append_batch(batch)
 
 
 class ContentPage(QWidget):
@@ -327,16 +399,28 @@ class ContentPage(QWidget):
         self.dataframe = None
 
         self.dataframe = None      # will store the current preview DataFrame
+        self.observables = None    # shared ObservableMatrix for the same data
+        self.column_stats = None   # ColumnStats over self.observables
 
         # optional but useful:
         self.data_table = None 
 
-    def set_dataframe(self, df):
+    def set_dataframe(self, df, observables=None):
         """Update the page's dataframe and push it to the table if available."""
         self.dataframe = df
+        self.observables = observables
+        self.column_stats = None
         if self.data_table is not None:
             # DataTable uses display_dataframe
-            self.data_table.display_dataframe(df)
+            self.data_table.display_dataframe(df, observables)
+
+    def set_column_stats(self, stats):
+        """Attach the per-column statistics index once the worker delivers it."""
+        self.column_stats = stats
+        if self.data_table is not None:
+            self.data_table.set_column_stats(stats)
+        if hasattr(self, "data_selector"):
+            self.data_selector.set_column_stats(stats)
 
 
 # -------- Results sub-window --------
@@ -405,14 +489,16 @@ class ResultWindow(QDialog):
        # for h in RESULT_BOX_HEIGHTS:
        #     cv.addWidget(make_box(h))
 
+        last_run = getattr(parent, "last_run", None)
+        results_dir = os.path.join(last_run.output_dir, RESULTS_DIR) if last_run is not None else RESULTS_DIR
         if title == "Latent Traits":
-           cv.addWidget(trait_latent_page())
+           cv.addWidget(trait_latent_page(results_dir))
         elif title == "B-P profiles":
-           cv.addWidget(bp_profile_page())
+           cv.addWidget(bp_profile_page(getattr(last_run, "profiles", None)))
         elif title == "Traits Ecosystem Analysis (TEA)":
-           cv.addWidget(traits_ecosystem_analysis_page())
+           cv.addWidget(traits_ecosystem_analysis_page(results_dir))
         elif title == "Group Analysis":
-           cv.addWidget(group_analysis_page())
+           cv.addWidget(group_analysis_page(results_dir))
 
         else:
             for h in RESULT_BOX_HEIGHTS:
@@ -489,8 +575,10 @@ def build_data_tab(page: ContentPage) -> DataTable:
     page.body.insertLayout(1 if page.title else 0, row, DATA_TABLE_STRETCH)
 
     enable_column_distribution_menu(
-        data_table.table,  # QTableWidget
-        get_dataframe_callable=lambda: getattr(page.data_table, "dataframe", None)
+        data_table.table,  # QTableView
+        get_dataframe_callable=lambda: getattr(page.data_table, "dataframe", None),
+        get_observables_callable=lambda: getattr(page.data_table, "observables", None),
+        get_stats_callable=lambda: getattr(page.data_table, "column_stats", None),
     )
 
 
@@ -634,6 +722,26 @@ def build_parameters_tab(page: ContentPage):
     noise_ratio.setPlaceholderText("0.4")           # suggestion only
     right_form.addRow(lbl_noise, noise_ratio)
 
+    # Restarts (independent seeded fits; the best one is kept)
+    lbl_restarts = QLabel("Restarts:")
+    lbl_restarts.setStyleSheet(label_css)
+    restarts = QLineEdit()
+    restarts.setFixedWidth(80)
+    restarts.setStyleSheet(input_css)
+    restarts.setPlaceholderText("1")
+    right_form.addRow(lbl_restarts, restarts)
+
+    # Sweep: random subset of the grid of list / range fields (empty = whole grid)
+    lbl_samples = QLabel("Sweep samples:")
+    lbl_samples.setStyleSheet(label_css)
+    sweep_samples = QLineEdit()
+    sweep_samples.setFixedWidth(80)
+    sweep_samples.setStyleSheet(input_css)
+    sweep_samples.setPlaceholderText("all")
+    sweep_samples.setToolTip("With Sweep, fields may hold lists (0.01, 0.05) or ranges "
+                             "(0.01:0.1:0.03).\nRun this many random combinations instead of all of them.")
+    right_form.addRow(lbl_samples, sweep_samples)
+
     # Assemble columns
     row.addLayout(left_form)
     right_col.addLayout(right_form)
@@ -682,6 +790,8 @@ def build_parameters_tab(page: ContentPage):
         "regularization": regularization_toggle,
         "optimizer_lr": optimizer_lr,
         "noise_ratio": noise_ratio,
+        "restarts": restarts,
+        "sweep_samples": sweep_samples,
         "report_checkboxes": {
             "clinician": cb_clin,
             "researcher": cb_res,
@@ -886,6 +996,10 @@ def build_results_tab(page: ContentPage):
                 return cand
             i += 1
 
+    def _last_output(kind):
+        """Path of a file written by the last run (AnalysisRun.outputs), or None."""
+        return getattr(getattr(page, "last_run", None), "outputs", {}).get(kind)
+
     def download_report():
         downloads_dir = (
             QStandardPaths.writableLocation(QStandardPaths.DownloadLocation)
@@ -893,9 +1007,9 @@ def build_results_tab(page: ContentPage):
         )
         os.makedirs(downloads_dir, exist_ok=True)
         dest = _unique_path(os.path.join(downloads_dir, "report.pdf"))
-        src = os.path.join(os.getcwd(), "report.pdf")
+        src = _last_output("report")
         try:
-            if os.path.exists(src):
+            if src and os.path.exists(src):
                 shutil.copyfile(src, dest)
             else:
                 with open(dest, "wb") as f:
@@ -913,12 +1027,12 @@ def build_results_tab(page: ContentPage):
         )
         os.makedirs(downloads_dir, exist_ok=True)
         dest = _unique_path(os.path.join(downloads_dir, "output_data.zip"))
-        src = os.path.join(os.getcwd(), "output_data.zip")
+        src = _last_output("data")
         try:
-            if os.path.exists(src):
+            if src and os.path.exists(src):
                 shutil.copyfile(src, dest)
             else:
-                QMessageBox.warning(page, "Missing file", "No output_data.zip found in the working directory.")
+                QMessageBox.warning(page, "Missing file", "The last run wrote no output_data.zip.")
                 return
             QMessageBox.information(page, "Data downloaded", f"Output data saved to:\n{dest}")
         except Exception as e:
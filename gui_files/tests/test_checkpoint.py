@@ -0,0 +1,88 @@
+# test_checkpoint.py
+
+import os
+
+import numpy as np
+import pytest
+
+from checkpoint import Checkpoint
+from config import PIPELINE_DEFAULTS, TRAIT_BATCH_SIZE
+from pipeline import PipelineCancelled
+from trait_model import fit_model
+
+ROWS = 4 * TRAIT_BATCH_SIZE      # four optimizer steps per epoch
+
+
+def _data(seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(ROWS, 3)) @ rng.normal(size=(3, 10)) + rng.normal(scale=0.5, size=(ROWS, 10))
+    return X.astype(np.float32)
+
+
+def _cancel_after(batches):
+    calls = [0]
+
+    def check():
+        calls[0] += 1
+        if calls[0] > batches:
+            raise PipelineCancelled()
+    return check
+
+
+def _interrupted_then_resumed(X, params, path, before_resume=None):
+    with pytest.raises(PipelineCancelled):     # stopped halfway through the third epoch
+        fit_model(X, params, seed=3, check=_cancel_after(2 * 4 + 2),
+                  checkpoint=Checkpoint(path, "run", resume=True, interval_s=0))
+    assert os.path.exists(path)
+    if before_resume is not None:
+        before_resume()
+    return fit_model(X, params, seed=3, checkpoint=Checkpoint(path, "run", resume=True, interval_s=0))
+
+
+def _assert_identical(resumed, full):
+    assert resumed.loss_history == full.loss_history
+    assert resumed.trait_history == full.trait_history
+    assert resumed.loss == full.loss
+    for name in ("We", "be", "Wd", "bd"):
+        np.testing.assert_array_equal(getattr(resumed.model, name), getattr(full.model, name))
+
+
+@pytest.mark.parametrize("prune", [False, True])
+def test_resumed_fit_is_bit_identical(tmp_path, prune):
+    X = _data()
+    params = {**PIPELINE_DEFAULTS, "prune": prune}
+    path = str(tmp_path / "fit.ckpt.npz")
+
+    resumed = _interrupted_then_resumed(X, params, path)
+    full = fit_model(X, params, seed=3)
+
+    _assert_identical(resumed, full)
+    assert "Resumed from a checkpoint after 2 of" in " ".join(resumed.notes)
+    assert not os.path.exists(path)      # discarded once the fit finished
+
+
+def test_torn_write_leftover_is_ignored(tmp_path):
+    X = _data()
+    path = str(tmp_path / "fit.ckpt.npz")
+
+    def torn_write():
+        with open(path + ".tmp", "wb") as fh:    # a write killed before os.replace
+            fh.write(b"PK\x03\x04 truncated")
+
+    resumed = _interrupted_then_resumed(X, PIPELINE_DEFAULTS, path, before_resume=torn_write)
+    _assert_identical(resumed, fit_model(X, PIPELINE_DEFAULTS, seed=3))
+
+    only_tmp = str(tmp_path / "other.ckpt.npz")
+    with open(only_tmp + ".tmp", "wb") as fh:
+        fh.write(b"PK\x03\x04 truncated")
+    assert Checkpoint(only_tmp, "run", resume=True).load() is None
+
+
+def test_checkpoint_of_another_run_is_ignored(tmp_path):
+    path = str(tmp_path / "fit.ckpt.npz")
+    ckpt = Checkpoint(path, "run-a", interval_s=0)
+    ckpt.save({"epoch": 1, "W": np.zeros(3, np.float32)})
+    ckpt.flush()
+    assert Checkpoint(path, "run-a", resume=True).load()["epoch"] == 1
+    assert Checkpoint(path, "run-b", resume=True).load() is None
+    assert Checkpoint(path, "run-a", resume=False).load() is None
@@ -0,0 +1,18 @@
+# test_cli.py
+
+import pandas as pd
+import pytest
+
+import cli
+
+
+@pytest.mark.parametrize("flags", [["--no-cache"], ["--sweep"]])
+def test_resume_rejects_options_it_cannot_honour(tmp_path, capsys, flags):
+    path = tmp_path / "cohort.csv"
+    pd.DataFrame({"id": ["a", "b"], "x": [1.0, 2.0]}).to_csv(path, index=False)
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main([str(path), "--resume", *flags])
+
+    assert exit_info.value.code == 2
+    assert "--resume" in capsys.readouterr().err
@@ -0,0 +1,37 @@
+# test_column_select.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from column_select import column_mask
+from column_stats import ColumnStats
+from observables import ObservableMatrix
+
+NAMES = ["ques_item_1", "ques_item_2", "site"]
+
+
+@pytest.mark.parametrize("expression", ["numeric", "text", "!text", "binary", "missing < 5%", "var > 0.5"])
+def test_stat_clauses_need_stats(expression):
+    with pytest.raises(ValueError, match="column statistics are still being computed"):
+        column_mask(expression, NAMES)
+
+
+def test_name_clauses_work_without_stats():
+    assert column_mask("ques_item_* | re:^si", NAMES).tolist() == [True, True, True]
+
+
+def test_stat_clauses_with_stats():
+    df = pd.DataFrame({
+        "id": ["a", "b", "c", "d"],
+        "ques_item_1": [1.0, 2.0, np.nan, 4.0],
+        "ques_item_2": [0.0, 1.0, 0.0, 1.0],
+    })
+    obs = ObservableMatrix.from_dataframe(df)
+    stats = ColumnStats.from_observables(obs)
+    names = [*obs.columns, "site"]
+
+    assert column_mask("numeric", names, stats).tolist() == [True, True, False]
+    assert column_mask("text", names, stats).tolist() == [False, False, True]
+    assert column_mask("binary", names, stats).tolist() == [False, True, False]
+    assert column_mask("missing < 10%", names, stats).tolist() == [False, True, False]
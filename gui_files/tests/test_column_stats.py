@@ -0,0 +1,39 @@
+# test_column_stats.py
+
+import numpy as np
+import pandas as pd
+
+import column_stats
+from column_stats import ColumnStats
+from config import COLUMN_STATS_BINS
+from observables import ObservableMatrix
+
+
+def test_stats_match_numpy_on_data_with_gaps(monkeypatch):
+    monkeypatch.setattr(column_stats, "COLUMN_STATS_BLOCK_CELLS", 500)    # many blocks to merge
+    rng = np.random.default_rng(0)
+    n = 3000
+    cont = rng.normal(10.0, 3.0, n)
+    cont[rng.random(n) < 0.2] = np.nan
+    likert = rng.integers(1, 6, n).astype(float)
+    likert[:50] = np.nan
+    df = pd.DataFrame({"id": np.arange(n), "cont": cont, "likert": likert,
+                       "flag": rng.integers(0, 2, n), "none": np.full(n, np.nan)})
+    obs = ObservableMatrix.from_dataframe(df)
+    stats = ColumnStats.from_observables(obs)
+
+    X = obs.values.astype(np.float64)
+    for j, name in enumerate(obs.columns[:3]):
+        x = X[:, j]
+        s = stats.summary(name)
+        assert s["count"] == np.count_nonzero(~np.isnan(x))
+        assert np.isclose(s["missing_frac"], np.isnan(x).mean())
+        assert np.isclose(s["mean"], np.nanmean(x), rtol=1e-9)
+        assert np.isclose(s["std"], np.nanstd(x), rtol=1e-9)
+        assert (s["min"], s["max"]) == (np.nanmin(x), np.nanmax(x))
+        bin_width = (np.nanmax(x) - np.nanmin(x)) / COLUMN_STATS_BINS
+        for level, value in s["quantiles"].items():      # histogram sketch: within a bin
+            assert abs(value - np.nanquantile(x, level)) <= bin_width + 1e-9
+
+    assert [stats.summary(c)["dtype_class"] for c in obs.columns] == ["continuous", "integer", "binary", "empty"]
+    assert np.isnan(stats.summary("none")["mean"])
@@ -0,0 +1,81 @@
+# test_data_io.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_io import read_dataset, downcast_frame
+
+
+def test_downcast_keeps_ids_and_inexact_floats(tmp_path):
+    ids = [20000001, 20000002, None, 20000003, 20000005]
+    df = pd.DataFrame({
+        "id": ids,
+        "weight": [123456789.12, 1.1, 2.2, np.nan, 3.3],
+        "score": [0.5, 1.25, np.nan, 2.0, -4.0],
+    })
+    path = tmp_path / "cohort.csv"
+    df.to_csv(path, index=False)
+
+    out = read_dataset(str(path), lean=True, use_cache=False)
+
+    assert out["id"].dtype == np.float64
+    assert out["id"].dropna().nunique() == 4
+    assert out["weight"].dtype == np.float64
+    assert out["weight"][0] == 123456789.12
+    assert out["score"].dtype == np.float32     # exact, so it still shrinks
+    np.testing.assert_array_equal(out["score"].to_numpy(np.float64), df["score"].to_numpy())
+
+
+def test_downcast_never_touches_first_column():
+    df = pd.DataFrame({"id": np.array([1.0, 2.0], dtype=np.float64), "n": np.array([1, 2], dtype=np.int64)})
+    downcast_frame(df)
+    assert df["id"].dtype == np.float64
+    assert df["n"].dtype == np.int8
+
+
+def test_excel_batches_match_final_frame(tmp_path, monkeypatch):
+    import data_io
+
+    monkeypatch.setattr(data_io, "EXCEL_FIRST_BATCH_ROWS", 3)
+    monkeypatch.setattr(data_io, "EXCEL_BATCH_ROWS", 3)
+    df = pd.DataFrame({"id": ["a", None, "c", None, "e", "f", "g"],
+                       "x": [1, None, 3, None, 5, 6, 7]})
+    path = tmp_path / "cohort.xlsx"
+    df.to_excel(path, index=False)
+
+    batches, messages = [], []
+    out = read_dataset(str(path), use_cache=False, on_batch=batches.append, progress=messages.append)
+
+    assert len(out) == 5
+    assert sum(len(b) for b in batches) == len(out)
+    assert not any(b.isna().all(axis=1).any() for b in batches)
+    assert messages[-1].endswith(f"{len(out):,} rows")
+
+
+def test_cache_dir_holds_the_cached_frame(tmp_path):
+    path = tmp_path / "cohort.csv"
+    pd.DataFrame({"id": ["a", "b"], "x": [1.5, 2.5]}).to_csv(path, index=False)
+    cache = tmp_path / "cache"
+
+    first = read_dataset(str(path), cache_dir=str(cache))
+    again = read_dataset(str(path), cache_dir=str(cache))
+
+    assert os.listdir(cache)
+    assert again.attrs["load_report"] == "from cache"
+    assert again.attrs["dataset_key"] == first.attrs["dataset_key"]
+
+
+def test_repeated_headers_are_made_unique_and_reported(tmp_path):
+    csv_path = tmp_path / "cohort.csv"
+    csv_path.write_text("id,a,a.1,a\np1,1,2,3\np2,4,5,6\n")
+    xlsx_path = tmp_path / "cohort.xlsx"
+    pd.DataFrame([["p1", 1, 2, 3], ["p2", 4, 5, 6]]).to_excel(xlsx_path, index=False,
+                                                              header=["id", "a", "a.1", "a"])
+
+    for path in (csv_path, xlsx_path):
+        df = read_dataset(str(path), use_cache=False)
+        assert df.columns.tolist() == ["id", "a", "a.1", "a.2"]
+        assert df["a.2"].tolist() == [3, 6]
+        assert "1 repeated column name(s) renamed" in df.attrs["load_report"]
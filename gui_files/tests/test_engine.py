@@ -0,0 +1,40 @@
+# test_engine.py
+
+import time
+
+import numpy as np
+
+import engine
+from config import PIPELINE_DEFAULTS
+
+
+def _sleeper():
+    p = engine._CTX.Process(target=time.sleep, args=(60,))
+    p.start()
+    return p
+
+
+def test_pool_workers_are_reported_to_the_parent(monkeypatch):
+    monkeypatch.setattr(engine.os, "cpu_count", lambda: 2)
+    events = engine._CTX.Queue()
+    monkeypatch.setitem(engine._child, "events", events)
+    X = np.random.default_rng(0).normal(size=(500, 6)).astype(np.float32)
+    jobs = [(PIPELINE_DEFAULTS, 0, None), (PIPELINE_DEFAULTS, 1, None)]
+
+    engine.fit_parallel(X, None, jobs, lambda fraction: None, lambda: None)
+
+    reported = [events.get(timeout=5) for _ in range(3)]
+    assert sorted(e[0] for e in reported[:2]) == ["pool_worker", "pool_worker"]
+    assert reported[2] == ("pool_closed",)
+
+
+def test_hard_cancel_kills_reported_pool_workers(monkeypatch):
+    monkeypatch.setattr(engine, "ENGINE_CANCEL_GRACE_S", 0.2)
+    job = engine.PipelineJob(None)
+    job._process, orphan = _sleeper(), _sleeper()     # a child ignoring Cancel, and its pool worker
+    job._events.put(("pool_worker", orphan.pid))
+    job.cancel()
+
+    assert list(job.events()) == [("cancelled",)]
+    orphan.join(timeout=5)
+    assert not orphan.is_alive()
@@ -0,0 +1,26 @@
+# test_formatting.py
+
+import numpy as np
+import pandas as pd
+
+from formatting import column_format_rule, format_block
+
+
+def test_whole_number_floats_render_as_ints():
+    values = np.array([1.0, 5.0, np.nan], dtype=np.float32)
+    assert column_format_rule(values) == "int"
+    assert format_block(values, "int").tolist() == ["1", "5", ""]
+
+
+def test_floats_are_rounded_without_float_noise():
+    values = np.array([0.1 + 0.2, 1.23456789, np.nan])
+    assert column_format_rule(values) == "float"
+    assert format_block(values, "float").tolist() == ["0.3", "1.2346", ""]
+
+
+def test_other_columns_render_plain_with_blank_missing():
+    assert column_format_rule(np.array([1, 2])) == "plain"
+    assert format_block(np.array([7, 8]), "plain").tolist() == ["7", "8"]
+    cats = pd.Categorical(["a", None, "b"])
+    assert column_format_rule(cats) == "plain"
+    assert format_block(cats, "plain").tolist() == ["a", "", "b"]
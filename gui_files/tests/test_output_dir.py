@@ -0,0 +1,48 @@
+# test_output_dir.py
+
+import os
+
+import numpy as np
+import pandas as pd
+
+import pipeline
+from observables import ObservableMatrix
+from pipeline import AnalysisRun
+from sweep import SweepRun
+
+
+def _observables():
+    return ObservableMatrix.from_dataframe(pd.DataFrame({"id": ["a", "b"], "x": [1.0, 2.0]}))
+
+
+def test_runs_get_their_own_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "OUTPUT_DIR", str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    obs = _observables()
+
+    first, second = AnalysisRun(obs), AnalysisRun(obs)
+    sweep = SweepRun(obs)
+
+    dirs = {first.output_dir, second.output_dir, sweep.output_dir}
+    assert len(dirs) == 3
+    for d in dirs:
+        assert os.path.dirname(d) == str(tmp_path)
+    assert os.path.basename(sweep.output_dir).startswith("sweep-")
+    assert not os.listdir(tmp_path)      # nothing is created before a run writes
+
+
+def test_folder_is_created_by_the_first_write(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "OUTPUT_DIR", str(tmp_path))
+    X = np.random.default_rng(0).normal(size=(40, 3))
+    df = pd.DataFrame({"id": [f"p{i % 8}" for i in range(40)], **{f"x{j}": X[:, j] for j in range(3)}})
+    run = AnalysisRun(ObservableMatrix.from_dataframe(df), params={"cutoff_traits": 2})
+
+    pipeline.run_pipeline(run, cache=None)
+
+    assert os.path.isfile(os.path.join(run.output_dir, "output_data.zip"))
+
+
+def test_explicit_output_dir_is_kept(tmp_path):
+    run = AnalysisRun(_observables(), output_dir=str(tmp_path / "out"))
+    assert run.output_dir == str(tmp_path / "out")
+    assert run.inputs()["output_dir"] == run.output_dir
@@ -0,0 +1,35 @@
+# test_preview_stream.py
+
+import pandas as pd
+from PyQt5.QtCore import Qt
+
+
+def _headers(model):
+    return [model.headerData(j, Qt.Horizontal, Qt.DisplayRole) for j in range(model.columnCount())]
+
+
+def test_cancelled_stream_restores_frame_and_reload_starts_clean(qapp):
+    from tabs import create_tabs
+    from functions import restore_preview
+
+    tabs = create_tabs()
+    model = tabs.data_table.model
+    old = pd.DataFrame({"id": ["a", "b"], "x": [1.0, 2.0]})
+    tabs.data_page.set_dataframe(old)
+
+    # a wider file starts streaming, then the load is cancelled
+    tabs.data_table.begin_stream()
+    tabs.data_table.append_batch(pd.DataFrame({"pid": ["p1"], "u": [1], "v": [2]}))
+    restore_preview(tabs)
+    assert _headers(model) == ["id", "x"]
+    assert model.rowCount() == 2
+    assert model.column_arrays()        # sorting / filtering available again
+
+    # the next upload streams into a clean model
+    tabs.data_table.begin_stream()
+    assert model.rowCount() == 0 and model.columnCount() == 0
+    tabs.data_table.append_batch(pd.DataFrame({"k": ["r1", "r2"], "w": [5, 6], "z": [7, 8]}))
+    tabs.data_table.append_batch(pd.DataFrame({"k": ["r3"], "w": [9], "z": [10]}))
+    assert _headers(model) == ["k", "w", "z"]
+    assert model.rowCount() == 3
+    assert model.data(model.index(2, 2), Qt.DisplayRole) == "10"
@@ -0,0 +1,30 @@
+# test_restarts.py
+
+import numpy as np
+import pytest
+
+import engine
+from config import PIPELINE_DEFAULTS
+from trait_model import fit_model, reconstruction_error
+
+
+def _data(n=4000, k=12, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 3)) @ rng.normal(size=(3, k)) + rng.normal(scale=0.5, size=(n, k))
+    return X.astype(np.float32)
+
+
+def test_restarts_are_ranked_on_full_data_error():
+    X = _data()
+    fit = fit_model(X, PIPELINE_DEFAULTS, seed=1)
+    assert fit.loss == reconstruction_error(fit.model, X)
+    assert fit.loss != fit.loss_history[-1]      # not the noisy training loss
+
+
+def test_failed_restart_raises_its_own_error(monkeypatch):
+    monkeypatch.setattr(engine.os, "cpu_count", lambda: 2)
+    X = _data(n=200_000)
+    broken = {k: v for k, v in PIPELINE_DEFAULTS.items() if k != "noise_ratio"}
+    jobs = [(PIPELINE_DEFAULTS, 0, None), (broken, 1, None)]
+    with pytest.raises(KeyError, match="noise_ratio"):
+        engine.fit_parallel(X, None, jobs, lambda fraction: None, lambda: None)
@@ -0,0 +1,43 @@
+# test_row_filter.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from row_filter import row_mask
+
+COLUMNS = {
+    "id": np.array(["p1", "p2", "p3", "p4"], dtype=object),
+    "age": np.array([25.0, 35.0, 45.0, np.nan]),
+    "sex": pd.Categorical(["F", "M", "F", None]),
+    "site": pd.array(["Lisbon", "Porto", "lisbon-2", None], dtype=object),
+}
+
+
+def _mask(expression):
+    return row_mask(expression, COLUMNS, 4, default_column="id").tolist()
+
+
+def test_and_binds_tighter_than_or():
+    assert _mask("age >= 30 & sex == F | site ~ porto") == [False, True, True, False]
+    assert _mask("site ~ porto | age >= 30 & sex == F") == [False, True, True, False]
+    assert _mask("age < 30 | age > 40 & sex == M") == [True, False, False, False]
+
+
+def test_categoricals_compare_on_their_categories():
+    assert _mask("sex == F") == [True, False, True, False]
+    assert _mask("sex ~ m") == [False, True, False, False]      # missing never matches
+    assert _mask("site ~ LISBON") == [True, False, True, False]
+
+
+def test_missing_numbers_never_match_and_text_falls_back_to_the_id():
+    assert _mask("age != 25") == [False, True, True, True]       # NaN != 25
+    assert _mask("age > 0") == [True, True, True, False]
+    assert _mask("p3") == [False, False, True, False]
+    assert row_mask("   ", COLUMNS, 4) is None
+
+
+@pytest.mark.parametrize("expression", ["age > old", "age ~ 3", "nosuch == 1 &"])
+def test_bad_clauses_raise_user_facing_errors(expression):
+    with pytest.raises(ValueError):
+        row_mask(expression, COLUMNS, 4)
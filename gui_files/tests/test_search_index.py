@@ -0,0 +1,38 @@
+# test_search_index.py
+
+from search_index import NameIndex
+
+
+def _search(names, query):
+    return [names[i] for i in NameIndex(names).search(query)]
+
+
+def test_tiers_rank_exact_prefix_token_token_prefix_substring():
+    names = ["stage", "weight", "QuesAgeing", "ques_age_rev", "age_group", "mage", "age"]
+    assert _search(names, "age") == [
+        "age",              # exact
+        "age_group",        # prefix of the name
+        "ques_age_rev",     # whole token
+        "QuesAgeing",       # token prefix (camelCase split)
+        "mage", "stage",    # substring, shorter first
+    ]
+    assert _search(names, "AGE") == _search(names, "age")
+
+
+def test_every_term_must_match():
+    names = ["bp_sys_morning", "bp_dia_morning", "bp_sys_evening", "cortisol_morning"]
+    assert _search(names, "sys morning") == ["bp_sys_morning"]
+    assert _search(names, "bp morning") == ["bp_sys_morning", "bp_dia_morning"]
+    assert _search(names, "sys nothing") == []
+
+
+def test_typos_fall_back_to_fuzzy_matches_only_without_real_ones():
+    names = ["cortisol", "cholesterol", "weight"]
+    assert _search(names, "cortisl") == ["cortisol"]
+    assert _search(names, "ol") == ["cortisol", "cholesterol"]
+
+
+def test_empty_query_lists_everything_in_order():
+    names = ["b", "a", "c"]
+    assert _search(names, "  ") == names
+    assert len(NameIndex([])) == 0 and _search([], "x") == []
@@ -0,0 +1,16 @@
+# test_stage_cache.py
+
+import numpy as np
+
+from stage_cache import StageCache, stage_key
+
+
+def test_hit_survives_a_new_process_and_is_a_copy(tmp_path):
+    key = stage_key("fit", 1, ("a", "b"))
+    StageCache(str(tmp_path)).put(key, {"w": np.arange(3)})
+
+    fresh = StageCache(str(tmp_path))      # what the next spawned run sees
+    first = fresh.get(key)
+    first["w"][0] = 99
+    assert fresh.get(key)["w"].tolist() == [0, 1, 2]
+    assert fresh.get(stage_key("other")) is None
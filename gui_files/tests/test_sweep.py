@@ -0,0 +1,36 @@
+# test_sweep.py
+
+import pytest
+
+from config import SWEEP_MAX_CONFIGS
+from sweep import configurations, parse_values
+
+
+def test_parse_values_lists_and_ranges():
+    assert parse_values("0.01, 0.05", float) == [0.01, 0.05]
+    assert parse_values("0:0.4:0.2", float) == [0.0, 0.2, 0.4]
+    assert parse_values("2:4", int) == [2, 3, 4]
+    assert parse_values("3, 1:3", int) == [3, 1, 2]        # duplicates dropped, order kept
+
+
+@pytest.mark.parametrize("text, kind", [("", float), ("a", float), ("1.5", int), ("3:1:1", int), ("0:1", float)])
+def test_parse_values_rejects_bad_input(text, kind):
+    with pytest.raises(ValueError):
+        parse_values(text, kind)
+
+
+def test_configurations_grid_and_samples():
+    values = {"a": [1, 2, 3], "b": [0.1, 0.2]}
+    grid = configurations(values)
+    assert len(grid) == 6 and grid[0] == {"a": 1, "b": 0.1} and grid[-1] == {"a": 3, "b": 0.2}
+
+    sample = configurations(values, samples=4, seed=7)
+    assert len(sample) == 4 and all(c in grid for c in sample)
+    assert sample == configurations(values, samples=4, seed=7)
+
+
+def test_large_grids_need_sampling():
+    values = {"a": list(range(SWEEP_MAX_CONFIGS + 1))}
+    with pytest.raises(ValueError, match="Sweep samples"):
+        configurations(values)
+    assert len(configurations(values, samples=10)) == 10
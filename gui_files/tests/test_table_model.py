@@ -0,0 +1,45 @@
+# test_table_model.py
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import Qt
+
+from observables import ObservableMatrix
+from row_filter import row_mask
+
+
+def test_preview_keeps_values_float32_cannot_hold(qapp):
+    from table_model import DataFrameModel
+
+    df = pd.DataFrame({
+        "id": ["a", "b", "c"],
+        "big": np.array([123456789, 16777216, 16777217], dtype=np.int64),
+        "precise": [0.123456789012, 2.5, np.nan],
+        "likert": np.array([1.0, 2.0, 5.0], dtype=np.float32),
+    })
+    obs = ObservableMatrix.from_dataframe(df)
+    model = DataFrameModel()
+    model.set_dataframe(df, obs)
+    columns = model.column_arrays()
+
+    assert model.data(model.index(0, 1), Qt.DisplayRole) == "123456789"
+    assert row_mask("big == 16777217", columns, 3).tolist() == [False, False, True]
+    assert row_mask("big == 16777216", columns, 3).tolist() == [False, True, False]
+    assert columns["precise"][0] == 0.123456789012
+    assert np.shares_memory(columns["likert"], obs.values)     # exact in float32: still shared
+    assert not np.shares_memory(columns["big"], obs.values)
+
+
+def test_filter_reads_the_renamed_repeat_of_a_header(qapp, tmp_path):
+    from data_io import read_dataset
+    from table_model import DataFrameModel
+
+    path = tmp_path / "cohort.csv"
+    path.write_text("id,score,score\np1,1,10\np2,2,20\n")
+    df = read_dataset(str(path), use_cache=False)
+    model = DataFrameModel()
+    model.set_dataframe(df, ObservableMatrix.from_dataframe(df))
+
+    columns = model.column_arrays()
+    assert list(columns) == ["id", "score", "score.1"]
+    assert row_mask("score.1 > 15", columns, 2).tolist() == [False, True]
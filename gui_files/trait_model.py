@@ -0,0 +1,340 @@
+# trait_model.py
+"""
+Latent trait model: a denoising, k-sparse autoencoder trained with
+mini-batch Adam, in plain NumPy (float32).
+
+    h = topk(relu(x~ We + be))      x~ = x with noise_ratio of entries masked
+    x^ = h Wd + bd                  loss = mean (x^ - x)^2 + l2 (|We|^2 + |Wd|^2)
+
+Trait t's loadings are row t of Wd. traits_activation is the fraction of
+traits allowed to be non-zero per record (1.0 = plain ReLU code).
+Every batch runs through buffers allocated once in TraitTrainer, so an
+epoch costs O(records x observables x traits) and allocates almost nothing.
+fit_model() can checkpoint between epochs and resume bit-identically.
+"""
+
+import math
+
+import numpy as np
+
+from config import (
+    TRAIT_EPOCHS, TRAIT_BATCH_SIZE, TRAIT_L2, TRAIT_CANDIDATES_PER_OBSERVABLE,
+    TRAIT_PRUNE_WARMUP, TRAIT_PRUNE_MIN_ACTIVITY, TRAIT_PRUNE_MIN_ENERGY,
+    TRAIT_PRUNE_MAX_SIMILARITY, TRAIT_PATIENCE, TRAIT_TOLERANCE,
+)
+
+_BETA1, _BETA2, _EPS = 0.9, 0.999, 1e-8
+_PARAMETERS = ("We", "be", "Wd", "bd")
+_EVAL_ROWS = 16384      # rows per block when scoring a fitted model on the full data
+
+
+class TraitModel:
+    """Encoder/decoder weights; n_traits can be larger than the observables (overcomplete)."""
+    def __init__(self, n_observables, n_traits, activation=1.0, seed=0):
+        rng = np.random.default_rng(seed)
+        limit = math.sqrt(6.0 / (n_observables + n_traits))
+        self.We = rng.uniform(-limit, limit, (n_observables, n_traits)).astype(np.float32)
+        self.be = np.zeros(n_traits, dtype=np.float32)
+        self.Wd = np.ascontiguousarray(self.We.T)
+        self.bd = np.zeros(n_observables, dtype=np.float32)
+        self.activation = float(activation)
+
+    @property
+    def n_traits(self):
+        return self.We.shape[1]
+
+    @property
+    def n_active(self):
+        """Traits kept per record by the top-k step."""
+        return max(1, min(self.n_traits, math.ceil(self.activation * self.n_traits)))
+
+    def parameters(self):
+        return [self.We, self.be, self.Wd, self.bd]
+
+    def encode(self, X):
+        """Trait codes of the (clean) rows of X."""
+        pre = np.matmul(X, self.We)
+        pre += self.be
+        active = _active(pre, self.n_active)
+        return np.multiply(pre, active, out=pre)
+
+    def decode(self, H):
+        out = np.matmul(H, self.Wd)
+        out += self.bd
+        return out
+
+    def reorder(self, order):
+        """Keep / permute traits (`order` indexes the trait axis)."""
+        self.We = np.ascontiguousarray(self.We[:, order])
+        self.be = self.be[order]
+        self.Wd = np.ascontiguousarray(self.Wd[order])
+
+
+class TraitTrainer:
+    """
+    Mini-batch Adam on a TraitModel. Buffers for a full batch and the Adam
+    moments are allocated here; epoch() then only slices them.
+    """
+    def __init__(self, model, lr, noise_ratio=0.0, l2=0.0, batch_size=512, seed=0):
+        self.model = model
+        self.lr = float(lr)
+        self.noise_ratio = float(noise_ratio)
+        self.l2 = float(l2)
+        self.batch_size = int(batch_size)
+        self.rng = np.random.default_rng(seed)
+        self.step = 0
+        self._moments = [(np.zeros_like(p), np.zeros_like(p)) for p in model.parameters()]
+        self._allocate()
+
+    def _allocate(self):
+        b, (k, m) = self.batch_size, self.model.We.shape
+        f32 = np.float32
+        self._x = np.empty((b, k), f32)         # clean batch (target)
+        self._noisy = np.empty((b, k), f32)
+        self._noise = np.empty((b, k), f32)
+        self._keep = np.empty((b, k), bool)
+        self._pre = np.empty((b, m), f32)
+        self._part = np.empty((b, m), f32)      # partition scratch for top-k
+        self._act = np.empty((b, m), bool)
+        self._top = np.empty((b, m), bool)
+        self._h = np.empty((b, m), f32)
+        self._r = np.empty((b, k), f32)         # residual, then its gradient
+        self._dh = np.empty((b, m), f32)
+        self._grads = [np.empty_like(p) for p in self.model.parameters()]
+        self._scratch = [np.empty_like(p) for p in self.model.parameters()]
+        self._batch_count = np.empty(m, np.int64)
+        self._batch_energy = np.empty(m, f32)
+        self.activity = np.zeros(m, np.int64)    # records each trait was active for, last epoch
+        self.energy = np.zeros(m)                # sum of h^2 per trait, last epoch
+        self.records = 0                         # records seen, last epoch
+
+    def epoch(self, X, check=None):
+        """One shuffled pass over the rows of X; returns the mean reconstruction error."""
+        n = len(X)
+        order = self.rng.permutation(n)
+        self.activity[:] = 0
+        self.energy[:] = 0
+        self.records = n
+        total = 0.0
+        for lo in range(0, n, self.batch_size):
+            if check is not None:
+                check()
+            rows = order[lo:lo + self.batch_size]
+            np.take(X, rows, axis=0, out=self._x[:len(rows)])
+            total += self._batch(len(rows))
+        return total / max(1, n * X.shape[1])
+
+    def _batch(self, b):
+        """Forward + backward + Adam step on the first b rows of the buffers; returns the squared error."""
+        model = self.model
+        x, noisy, pre, act, h, r, dh = (buf[:b] for buf in (
+            self._x, self._noisy, self._pre, self._act, self._h, self._r, self._dh))
+        gWe, gbe, gWd, gbd = self._grads
+
+        # masking noise, rescaled so clean inputs match in expectation
+        if self.noise_ratio > 0:
+            noise, keep = self._noise[:b], self._keep[:b]
+            self.rng.random(out=noise, dtype=np.float32)
+            np.greater_equal(noise, self.noise_ratio, out=keep)
+            np.multiply(x, keep, out=noisy)
+            noisy *= 1.0 / (1.0 - self.noise_ratio)
+        else:
+            np.copyto(noisy, x)
+
+        # forward
+        np.matmul(noisy, model.We, out=pre)
+        pre += model.be
+        _active(pre, model.n_active, act, self._part[:b], self._top[:b])
+        np.multiply(pre, act, out=h)
+        np.matmul(h, model.Wd, out=r)
+        r += model.bd
+        r -= x
+        sq_error = float(np.vdot(r, r))
+
+        # backward (r becomes dLoss/dx^)
+        r *= 2.0 / r.size
+        np.matmul(h.T, r, out=gWd)
+        np.sum(r, axis=0, out=gbd)
+        np.matmul(r, model.Wd.T, out=dh)
+        dh *= act
+        np.matmul(noisy.T, dh, out=gWe)
+        np.sum(dh, axis=0, out=gbe)
+        if self.l2 > 0:
+            for g, p, tmp in ((gWe, model.We, self._scratch[0]), (gWd, model.Wd, self._scratch[2])):
+                np.multiply(p, 2.0 * self.l2, out=tmp)
+                g += tmp
+
+        # usage statistics for prune() (dh is free again)
+        self.activity += np.sum(act, axis=0, out=self._batch_count)
+        self.energy += np.sum(np.square(h, out=dh), axis=0, out=self._batch_energy)
+
+        self._adam()
+        return sq_error
+
+    def prune(self, min_activity, min_energy, max_similarity):
+        """
+        Drop traits, based on the last epoch, that were
+          - active for fewer than min_activity of the records,
+          - reconstructing less than min_energy of the total reconstructed variance,
+          - or decoding to (cosine > max_similarity) the same pattern as a stronger trait,
+        and shrink the weights, optimizer state and buffers to match.
+        Returns the number of traits removed (at least one trait is kept).
+        """
+        model = self.model
+        energy = self.energy * np.square(model.Wd.astype(np.float64)).sum(axis=1)
+        keep = (self.activity >= min_activity * self.records) & (energy >= min_energy * max(energy.sum(), 1e-12))
+
+        norms = np.linalg.norm(model.Wd, axis=1)
+        unit = model.Wd / np.where(norms > 0, norms, 1.0)[:, None]
+        similar = (unit @ unit.T) > max_similarity
+        for t in np.argsort(-energy, kind="stable"):
+            if keep[t]:
+                similar[t, t] = False
+                keep[similar[t] & keep & (energy <= energy[t])] = False
+        if not keep.any():
+            keep[np.argmax(energy)] = True
+
+        removed = int(len(keep) - keep.sum())
+        if removed:
+            idx = np.flatnonzero(keep)
+            model.reorder(idx)
+            (mWe, vWe), (mbe, vbe), (mWd, vWd), bd_state = self._moments
+            self._moments = [(mWe[:, idx].copy(), vWe[:, idx].copy()), (mbe[idx], vbe[idx]),
+                             (mWd[idx], vWd[idx]), bd_state]
+            self._allocate()
+        return removed
+
+    def state(self):
+        """Copy of everything later epochs depend on: weights, Adam moments, step and RNG."""
+        state = {"step": self.step, "rng": self.rng.bit_generator.state}
+        for name, p, (m, v) in zip(_PARAMETERS, self.model.parameters(), self._moments):
+            state[name], state[f"m_{name}"], state[f"v_{name}"] = p.copy(), m.copy(), v.copy()
+        return state
+
+    def restore(self, state):
+        """Continue from state() (trait count may differ from the fresh model's after pruning)."""
+        for name in _PARAMETERS:
+            setattr(self.model, name, np.ascontiguousarray(state[name], dtype=np.float32))
+        self._moments = [(np.array(state[f"m_{name}"], np.float32), np.array(state[f"v_{name}"], np.float32))
+                         for name in _PARAMETERS]
+        self.step = int(state["step"])
+        self.rng.bit_generator.state = state["rng"]
+        self._allocate()
+
+    def _adam(self):
+        self.step += 1
+        lr = self.lr * math.sqrt(1.0 - _BETA2 ** self.step) / (1.0 - _BETA1 ** self.step)
+        for p, g, (m, v), tmp in zip(self.model.parameters(), self._grads, self._moments, self._scratch):
+            np.subtract(g, m, out=tmp)
+            tmp *= 1.0 - _BETA1
+            m += tmp
+            np.square(g, out=tmp)
+            tmp -= v
+            tmp *= 1.0 - _BETA2
+            v += tmp
+            np.sqrt(v, out=tmp)
+            tmp += _EPS
+            np.divide(m, tmp, out=tmp)
+            tmp *= lr
+            p -= tmp
+
+
+class TraitFit:
+    """
+    Result of fit_model(): the model, its per-epoch (noisy, training) loss
+    and trait count, notes, and `loss`: the clean reconstruction error on
+    all of X, which is comparable between fits that stopped at different epochs.
+    """
+    def __init__(self, model, seed, loss_history, trait_history, notes, loss):
+        self.model = model
+        self.seed = seed
+        self.loss_history = loss_history
+        self.trait_history = trait_history
+        self.notes = notes
+        self.loss = loss
+
+
+def reconstruction_error(model, X):
+    """Mean squared error of reconstructing the clean rows of X, in row blocks."""
+    total = 0.0
+    for lo in range(0, len(X), _EVAL_ROWS):
+        x = np.asarray(X[lo:lo + _EVAL_ROWS], dtype=np.float32)
+        r = model.decode(model.encode(x))
+        r -= x
+        total += float(np.vdot(r, r))
+    return total / max(1, X.size)
+
+
+def fit_model(X, params, seed=0, report=None, check=None, checkpoint=None):
+    """
+    Train a TraitModel on the standardized matrix X with the pipeline
+    parameters, traits_activation of the traits active per record.
+    Without pruning it fits min(cutoff_traits, observables) traits. With
+    pruning it starts from a larger candidate set and drops traits
+    between epochs, so later epochs get cheaper, and stops once the set
+    and the loss settle. report(fraction) is called after every epoch.
+    With a checkpoint.Checkpoint, training continues from its saved
+    state (if any) and snapshots are handed to it after every epoch.
+    """
+    k = X.shape[1]
+    prune = bool(params["prune"])
+    n_traits = max(1, min(int(params["cutoff_traits"]), TRAIT_CANDIDATES_PER_OBSERVABLE * k if prune else k))
+    model = TraitModel(k, n_traits, params["traits_activation"], seed=seed)
+    trainer = TraitTrainer(model, params["optimizer_lr"], params["noise_ratio"],
+                           TRAIT_L2 if params["regularization"] else 0.0,
+                           TRAIT_BATCH_SIZE, seed=seed)
+    losses, counts, notes = [], [], []
+    settled = start = 0
+    saved = checkpoint.load() if checkpoint is not None else None
+    if saved is not None:
+        trainer.restore(saved)
+        losses, counts, notes = list(saved["losses"]), list(saved["counts"]), list(saved["notes"])
+        settled, start = saved["settled"], saved["epoch"]
+        if report is not None:
+            report(start / TRAIT_EPOCHS)
+    try:
+        for epoch in range(start, TRAIT_EPOCHS):
+            loss = trainer.epoch(X, check)
+            removed = 0
+            if prune and epoch + 1 >= TRAIT_PRUNE_WARMUP:
+                removed = trainer.prune(TRAIT_PRUNE_MIN_ACTIVITY, TRAIT_PRUNE_MIN_ENERGY,
+                                        TRAIT_PRUNE_MAX_SIMILARITY)
+            improved = bool(losses) and losses[-1] - loss > TRAIT_TOLERANCE * losses[-1]
+            losses.append(loss)
+            counts.append(model.n_traits)
+            if report is not None:
+                report((epoch + 1) / TRAIT_EPOCHS)
+            if prune:
+                settled = 0 if removed or improved or epoch + 1 <= TRAIT_PRUNE_WARMUP else settled + 1
+                if settled >= TRAIT_PATIENCE:
+                    notes.append(f"Trait set stable after {epoch + 1} of {TRAIT_EPOCHS} epochs; stopped early.")
+                    break
+            if checkpoint is not None:
+                checkpoint.save({**trainer.state(), "epoch": epoch + 1, "settled": settled,
+                                 "losses": list(losses), "counts": list(counts), "notes": list(notes)})
+    except BaseException:
+        if checkpoint is not None:
+            checkpoint.flush()      # keep the last finished epoch
+        raise
+    if checkpoint is not None:
+        checkpoint.discard()
+    if saved is not None:
+        notes.append(f"Resumed from a checkpoint after {start} of {TRAIT_EPOCHS} epochs.")
+    if model.n_traits < n_traits:
+        notes.append(f"Pruned {n_traits} candidate traits to {model.n_traits}.")
+    return TraitFit(model, seed, losses, counts, notes, reconstruction_error(model, X))
+
+
+def _active(pre, n_active, out=None, part=None, top=None):
+    """Mask of positive pre-activations that are also among the row's n_active largest."""
+    out = np.greater(pre, 0.0, out=out)
+    n_traits = pre.shape[1]
+    if n_active < n_traits:
+        if part is None:
+            part = pre.copy()
+        else:
+            np.copyto(part, pre)
+        kth = n_traits - n_active
+        part.partition(kth, axis=1)
+        out &= np.greater_equal(pre, part[:, kth:kth + 1], out=top)
+    return out
@@ -0,0 +1,115 @@
+# workers.py
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from data_io import read_dataset, LoadCancelled
+from observables import ObservableMatrix
+from column_stats import ColumnStats
+from engine import PipelineJob
+
+
+class LoadWorker(QThread):
+    """
+    Parses a data file off the GUI thread.
+    Only signals cross back to the GUI; widgets are never touched here.
+    """
+    progress = pyqtSignal(str)
+    batch = pyqtSignal(object)            # partial DataFrame while streaming
+    loaded = pyqtSignal(object, object)   # DataFrame, ObservableMatrix
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, file_path, sheet=None, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.sheet = sheet
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def run(self):
+        try:
+            df = read_dataset(
+                self.file_path,
+                progress=self.progress.emit,
+                is_cancelled=self.isInterruptionRequested,
+                sheet=self.sheet,
+                on_batch=self.batch.emit,
+            )
+            if self.isInterruptionRequested():
+                raise LoadCancelled()
+            self.progress.emit("Indexing observables…")
+            observables = ObservableMatrix.from_dataframe(
+                df, key=df.attrs.get("dataset_key"),
+                is_cancelled=self.isInterruptionRequested,
+            )
+            if observables is None:
+                raise LoadCancelled()
+        except LoadCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.loaded.emit(df, observables)
+
+
+class StatsWorker(QThread):
+    """Builds the ColumnStats index for a freshly loaded ObservableMatrix."""
+    ready = pyqtSignal(object)       # ColumnStats
+    failed = pyqtSignal(str)
+
+    def __init__(self, observables, parent=None):
+        super().__init__(parent)
+        self.observables = observables
+
+    def cancel(self):
+        self.requestInterruption()
+
+    def run(self):
+        try:
+            stats = ColumnStats.from_observables(
+                self.observables, is_cancelled=self.isInterruptionRequested
+            )
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if stats is not None:
+            self.ready.emit(stats)
+
+
+class PipelineWorker(QThread):
+    """
+    Runs the analysis pipeline for one AnalysisRun (or a sweep.SweepRun)
+    in a worker process (engine.PipelineJob) and relays its events as signals.
+    """
+    progress = pyqtSignal(str)
+    completed = pyqtSignal(object)   # the finished AnalysisRun / SweepRun
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, run, parent=None):
+        super().__init__(parent)
+        self.analysis = run
+        self.job = PipelineJob(run.observables, **run.inputs())
+
+    def cancel(self):
+        self.requestInterruption()
+        self.job.cancel()
+
+    def run(self):
+        try:
+            self.job.start()
+            for event in self.job.events():
+                kind = event[0]
+                if kind == "progress":
+                    _, fraction, label = event
+                    self.progress.emit(f"{label}…\n{int(fraction * 100)}%")
+                elif kind == "done":
+                    self.completed.emit(event[1])
+                elif kind == "cancelled":
+                    self.cancelled.emit()
+                else:
+                    self.failed.emit(event[1])
+        except Exception as e:
+            self.job.close()
+            self.failed.emit(str(e) or type(e).__name__)